@@ -20,6 +20,10 @@ export interface BatchRequest {
   context?: string
   output_columns: OutputColumn[]
   webhook_url?: string
+  /** Skip rows already stored as success for this batch_id (default: only on batch_queue retries) */
+  resume?: boolean
+  /** Send several rows per Gemini call (tool-less prompts with output_columns only) */
+  pack_rows?: boolean
 }
 
 export interface BatchResponse {
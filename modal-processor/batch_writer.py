@@ -0,0 +1,271 @@
+"""
+Write-behind buffer for batch results
+=====================================
+
+Rows are handed to a BatchResultWriter as soon as they finish; a background thread
+upserts them to `batch_results` in chunks (by size or after a max delay) and bumps
+`batches.processed_rows` / token totals, so Supabase latency stays off the
+row-processing path and progress is visible while the batch runs.
+
+`processed_rows` counts rows stored with status `success` - the same definition the
+final batch update uses - so the counter never moves backwards when a batch ends.
+
+The buffer is bounded: if Supabase falls behind by more than `max_pending` rows,
+add() blocks until the flusher catches up instead of growing memory without limit.
+
+Also holds the resume helpers: a retried batch only re-dispatches rows that are not
+already stored with status `success`.
+
+Shared by main.py (Modal) and main_railway.py (Railway).
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Flush when this many rows are buffered...
+BATCH_RESULTS_FLUSH_ROWS = int(os.getenv("BATCH_RESULTS_FLUSH_ROWS", "100"))
+# ...or when the oldest buffered row has waited this long (seconds)
+BATCH_RESULTS_FLUSH_INTERVAL = float(os.getenv("BATCH_RESULTS_FLUSH_INTERVAL", "2.0"))
+# Max rows waiting to be written before add() applies backpressure
+BATCH_RESULTS_MAX_PENDING = int(os.getenv("BATCH_RESULTS_MAX_PENDING", "2000"))
+# Attempts per chunk upsert before the chunk is given up on
+BATCH_RESULTS_WRITE_ATTEMPTS = 3
+# Page size when reading back stored results (PostgREST caps responses at 1000 rows)
+BATCH_RESULTS_PAGE_SIZE = 1000
+
+_STOP = object()
+
+
+def result_to_record(batch_id: str, r: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a _process_single_row result to a batch_results row."""
+    return {
+        "id": r.get("id"),
+        "batch_id": batch_id,
+        "input_data": json.dumps(r.get("input_data", {})),
+        "output_data": r.get("output", ""),
+        "row_index": r.get("row_index", 0),
+        "status": r.get("status", "error"),
+        "error_message": r.get("error"),
+        "input_tokens": r.get("input_tokens", 0),
+        "output_tokens": r.get("output_tokens", 0),
+        "model": r.get("model", ""),
+        "tools_used": r.get("tools_used", []),
+    }
+
+
+def load_succeeded_rows(supabase, batch_id: str) -> Dict[int, Dict[str, int]]:
+    """row_index -> {"input_tokens", "output_tokens"} for rows already stored as success."""
+    succeeded: Dict[int, Dict[str, int]] = {}
+    start = 0
+    while True:
+        page = (
+            supabase.table("batch_results")
+            .select("row_index,input_tokens,output_tokens")
+            .eq("batch_id", batch_id)
+            .eq("status", "success")
+            .order("row_index")
+            .range(start, start + BATCH_RESULTS_PAGE_SIZE - 1)
+            .execute()
+        ).data or []
+        for r in page:
+            succeeded[r["row_index"]] = {
+                "input_tokens": r.get("input_tokens") or 0,
+                "output_tokens": r.get("output_tokens") or 0,
+            }
+        if len(page) < BATCH_RESULTS_PAGE_SIZE:
+            return succeeded
+        start += BATCH_RESULTS_PAGE_SIZE
+
+
+def batch_retry_count(supabase, batch_id: str) -> int:
+    """retry_count of the batch's batch_queue entry (0 if it has none)."""
+    rows = supabase.table("batch_queue").select("retry_count").eq("batch_id", batch_id).execute().data
+    return (rows[0].get("retry_count") or 0) if rows else 0
+
+
+class BatchResultWriter:
+    """
+    Bounded write-behind buffer for one batch.
+
+    Usage:
+        writer = BatchResultWriter(supabase, batch_id, log=print)
+        for result in results_as_they_complete:
+            writer.add(result)
+        stats = writer.close()   # flushes the tail, returns counters
+
+    Args:
+        supabase: Supabase client (used only from the flusher thread)
+        batch_id: Batch being written
+        track_progress: Update batches.processed_rows/token totals after each flush
+            (off for direct API calls where the batch row does not exist)
+        log: print-like callable for progress/warnings
+    """
+
+    def __init__(
+        self,
+        supabase,
+        batch_id: str,
+        track_progress: bool = True,
+        flush_rows: int = BATCH_RESULTS_FLUSH_ROWS,
+        flush_interval: float = BATCH_RESULTS_FLUSH_INTERVAL,
+        max_pending: int = BATCH_RESULTS_MAX_PENDING,
+        log=print,
+    ):
+        self.supabase = supabase
+        self.batch_id = batch_id
+        self.track_progress = track_progress
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = flush_interval
+        self.log = log
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(self.flush_rows, max_pending))
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Counters over rows handed to add()
+        self.successful = 0
+        self.failed = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        # Counters over rows actually persisted
+        self.written = 0
+        self.written_successful = 0
+        self.written_input_tokens = 0
+        self.written_output_tokens = 0
+        self.write_errors = 0
+        self.flushes = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"batch-writer-{batch_id}", daemon=True)
+        self._thread.start()
+
+    def add_existing(self, succeeded: Dict[int, Dict[str, int]]) -> None:
+        """Count rows already persisted by an earlier attempt (see load_succeeded_rows)."""
+        input_tokens = sum(r["input_tokens"] for r in succeeded.values())
+        output_tokens = sum(r["output_tokens"] for r in succeeded.values())
+        with self._lock:
+            self.successful += len(succeeded)
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.written += len(succeeded)
+            self.written_successful += len(succeeded)
+            self.written_input_tokens += input_tokens
+            self.written_output_tokens += output_tokens
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Queue one row result; blocks only when max_pending rows are already waiting."""
+        if self._closed:
+            raise RuntimeError("BatchResultWriter is closed")
+        with self._lock:
+            if result.get("status") == "success":
+                self.successful += 1
+            else:
+                self.failed += 1
+            self.input_tokens += result.get("input_tokens", 0) or 0
+            self.output_tokens += result.get("output_tokens", 0) or 0
+        self._queue.put(result_to_record(self.batch_id, result))
+
+    def close(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        """Flush everything still buffered and stop the flusher thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+        return self.stats()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "successful": self.successful,
+                "failed": self.failed,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "written": self.written,
+                "written_successful": self.written_successful,
+                "write_errors": self.write_errors,
+                "flushes": self.flushes,
+            }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Flusher thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        buffer: List[Dict[str, Any]] = []
+        deadline = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+                if item is _STOP:
+                    stopping = True
+                else:
+                    buffer.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+            except queue.Empty:
+                pass
+
+            # Drain whatever else is already queued without waiting
+            while not stopping and len(buffer) < self.flush_rows:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    buffer.append(item)
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if buffer and (stopping or due or len(buffer) >= self.flush_rows):
+                while buffer:
+                    chunk, buffer = buffer[:self.flush_rows], buffer[self.flush_rows:]
+                    self._flush(chunk)
+                deadline = None
+
+    def _flush(self, records: List[Dict[str, Any]]) -> None:
+        for attempt in range(1, BATCH_RESULTS_WRITE_ATTEMPTS + 1):
+            try:
+                self.supabase.table("batch_results").upsert(
+                    records,
+                    on_conflict="batch_id,row_index"
+                ).execute()
+                break
+            except Exception as e:
+                if attempt == BATCH_RESULTS_WRITE_ATTEMPTS:
+                    self.log(f"[{self.batch_id}] Warning: Failed to write {len(records)} results: {e}")
+                    with self._lock:
+                        self.write_errors += len(records)
+                    return
+                time.sleep(0.5 * 2 ** (attempt - 1))
+
+        with self._lock:
+            self.written += len(records)
+            self.written_successful += sum(1 for r in records if r["status"] == "success")
+            self.written_input_tokens += sum(r["input_tokens"] or 0 for r in records)
+            self.written_output_tokens += sum(r["output_tokens"] or 0 for r in records)
+            self.flushes += 1
+            progress = {
+                "processed_rows": self.written_successful,
+                "total_input_tokens": self.written_input_tokens,
+                "total_output_tokens": self.written_output_tokens,
+                "updated_at": "now()",
+            }
+        self.log(f"[{self.batch_id}] Wrote {len(records)} results ({progress['processed_rows']} so far)")
+
+        if self.track_progress:
+            try:
+                self.supabase.table("batches").update(progress).eq("id", self.batch_id).execute()
+            except Exception as e:
+                self.log(f"[{self.batch_id}] Warning: Could not update batch progress: {e}")
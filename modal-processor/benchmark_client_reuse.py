@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-row genai.Client vs. per-container shared client
+================================================================
+
+Runs _process_single_row against a local stub Gemini endpoint (GEMINI_BASE_URL) with
+a fixed server latency, once with GENAI_CLIENT_CACHE off (new client + connection
+pool per row, the old behaviour) and once with the shared per-container client.
+Per-row overhead = row time - stub server time.
+
+--tls serves the stub over HTTPS with a throwaway self-signed certificate (needs the
+openssl CLI), so TLS handshakes are part of the measurement like in production.
+
+Usage:
+    python benchmark_client_reuse.py [--rows 300] [--workers 50] [--latency-ms 20] [--tls]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+PROMPT = "What does {{company}} do and which industry is it in?"
+OUTPUT_SCHEMA = [{"name": "industry"}, {"name": "summary"}]
+
+
+def start_stub_server(latency_ms: float, tls: bool):
+    """Minimal generateContent endpoint; returns (server, base_url, cert_file)."""
+    body = json.dumps({
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": json.dumps({"industry": "Logistics", "summary": "Stub"})}]},
+            "finishReason": "STOP",
+        }],
+        "usageMetadata": {"promptTokenCount": 120, "candidatesTokenCount": 20, "totalTokenCount": 140},
+    }).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True  # no delayed-ACK stalls between header and body writes
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency_ms / 1000)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    cert_file = None
+    if tls:
+        cert_dir = tempfile.mkdtemp()
+        cert_file = os.path.join(cert_dir, "cert.pem")
+        key_file = os.path.join(cert_dir, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+             "-addext", "subjectAltName=IP:127.0.0.1", "-keyout", key_file, "-out", cert_file],
+            check=True, capture_output=True,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file, key_file)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    scheme = "https" if tls else "http"
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}", cert_file
+
+
+def run_rows(processor, rows: int, workers: int):
+    """Per-row wall time (ms) for `rows` rows on a thread pool."""
+    def one(i: int):
+        start = time.perf_counter()
+        result = processor._process_single_row(
+            "bench", {"id": str(i), "company": f"Company {i}"}, i, PROMPT, "", OUTPUT_SCHEMA, [], "stub-key",
+        )
+        assert result["status"] == "success", result.get("error")
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            latencies = list(pool.map(one, range(rows)))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row Gemini client overhead, before/after client reuse")
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub server time per request")
+    parser.add_argument("--tls", action="store_true", help="Serve the stub over HTTPS (self-signed)")
+    args = parser.parse_args()
+
+    server, base_url, cert_file = start_stub_server(args.latency_ms, args.tls)
+    os.environ["GEMINI_BASE_URL"] = base_url
+    if cert_file:
+        # Trust the stub on top of the normal CA bundle (loading the bundle is part of client construction cost)
+        import certifi
+        bundle = os.path.join(os.path.dirname(cert_file), "bundle.pem")
+        with open(bundle, "w") as f:
+            f.write(open(certifi.where()).read() + "\n" + open(cert_file).read())
+        os.environ["SSL_CERT_FILE"] = bundle
+
+    try:
+        import main as processor
+        target = "main.py"
+    except ImportError:
+        import main_railway as processor
+        target = "main_railway.py"
+
+    print(f"🧪 _process_single_row ({target}) x {args.rows} rows, {args.workers} workers, "
+          f"stub {base_url} ({args.latency_ms:.0f}ms/request)")
+
+    # Warm-up (imports, first connection)
+    processor.GENAI_CLIENT_CACHE = True
+    run_rows(processor, min(args.workers, args.rows), args.workers)
+
+    results = {}
+    for label, cached in (("per-row client (old)", False), ("shared client", True)):
+        processor.GENAI_CLIENT_CACHE = cached
+        processor._genai_clients.clear()
+        wall, latencies = run_rows(processor, args.rows, args.workers)
+        mean = sum(latencies) / len(latencies)
+        overhead = mean - args.latency_ms  # one Gemini call per row without tools
+        results[label] = overhead
+        print(f"   {label:<22} {wall:6.2f}s  {args.rows / wall:7.1f} rows/s  "
+              f"mean {mean:6.1f}ms/row  overhead {overhead:6.1f}ms/row")
+
+    old, new = results["per-row client (old)"], results["shared client"]
+    print(f"   ⚡ per-row overhead {old:.1f}ms -> {new:.1f}ms ({old / new:.1f}x less)" if new > 0 else "")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
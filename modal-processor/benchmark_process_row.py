@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for _process_single_row
+==========================================
+
+Runs the row pipeline (native-tools phase + structured JSON phase) on replayed Gemini
+calls, so row throughput and tail latency can be measured without a Gemini key.
+Uses the record/replay harness from services/aeo-checks/replay_harness.py, which
+intercepts google.genai.Client.
+
+Targets main.py when `modal` is installed, main_railway.py otherwise.
+
+Usage:
+    python benchmark_process_row.py [--rows 200] [--workers 50] [--tools web-search]
+    python benchmark_process_row.py --gemini "p50=1500,p99=6000,errors=0.01,burst=0.02x10"
+    python benchmark_process_row.py --trace rows_trace.jsonl
+    python benchmark_process_row.py --record rows_trace.jsonl --rows 20   # live (needs GEMINI_API_KEY)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+# Replay harness lives with the other AI/SERP clients
+sys.path.insert(0, str(Path(__file__).parent.parent / "services" / "aeo-checks"))
+
+from replay_harness import LatencyProfile, Trace, TraceRecord, percentile, recording, replaying, route_for
+
+try:
+    import main as processor
+    TARGET = "main.py"
+except ImportError:
+    import main_railway as processor
+    TARGET = "main_railway.py"
+
+MODEL = "gemini-2.5-flash-lite"
+PROMPT = "What does {{company}} do and which industry is it in?"
+OUTPUT_SCHEMA = [{"name": "industry"}, {"name": "summary"}]
+
+
+def synthetic_trace() -> Trace:
+    """Native search answers + structured outputs, served by route."""
+    def gemini_response(text: str) -> dict:
+        return {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finish_reason": "STOP"}],
+            "usage_metadata": {"prompt_token_count": 450, "candidates_token_count": 120, "total_token_count": 570},
+        }
+
+    search_route = route_for("gemini", {"model": MODEL, "config": {"tools": [{"google_search": {}}]}})
+    json_route = route_for("gemini", {"model": MODEL, "config": {"response_mime_type": "application/json"}})
+    records = [
+        TraceRecord("gemini", f"synthetic-search-{i}", search_route, "synthetic",
+                    gemini_response(f"Company {i} builds logistics software for mid-size retailers."), 1000.0)
+        for i in range(3)
+    ] + [
+        TraceRecord("gemini", f"synthetic-json-{i}", json_route, "synthetic",
+                    gemini_response(json.dumps({"industry": industry, "summary": "Logistics software vendor"})), 800.0)
+        for i, industry in enumerate(["Logistics", "Retail Tech", "SaaS"])
+    ]
+    return Trace(records)
+
+
+def run_rows(rows: int, workers: int, tools, api_key: str):
+    """Process rows on a thread pool (like the batch endpoints); per-row latency + statuses."""
+    latencies = []
+    statuses = {}
+
+    def one(i: int):
+        start = time.perf_counter()
+        result = processor._process_single_row(
+            "bench", {"id": str(i), "company": f"Company {i}"}, i, PROMPT, "", OUTPUT_SCHEMA, tools, api_key,
+        )
+        return (time.perf_counter() - start) * 1000, result.get("status", "unknown")
+
+    start = time.perf_counter()
+    # Row pipeline prints debug output per row
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for latency, status in pool.map(one, range(rows)):
+                latencies.append(latency)
+                statuses[status] = statuses.get(status, 0) + 1
+    return time.perf_counter() - start, latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay benchmark for _process_single_row")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--tools", default="web-search", help="Comma-separated tools ('' for none)")
+    parser.add_argument("--trace", help="Recorded JSONL trace (default: synthetic)")
+    parser.add_argument("--record", metavar="PATH", help="Run live and record a trace")
+    parser.add_argument("--gemini", metavar="SPEC", help='Latency profile, e.g. "p50=1500,p99=6000,burst=0.02x10"')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-scale", type=float, default=0.1, help="Multiply injected sleeps (results are rescaled)")
+    args = parser.parse_args()
+    tools = [t for t in args.tools.split(",") if t]
+
+    if args.record:
+        with recording(args.record):
+            wall, latencies, statuses = run_rows(args.rows, args.workers, tools, os.environ["GEMINI_API_KEY"])
+        print(f"📼 {args.rows} rows recorded to {args.record} in {wall:.1f}s: {statuses}")
+        return
+
+    trace = Trace.load(args.trace) if args.trace else synthetic_trace()
+    profiles = {"gemini": LatencyProfile.parse(args.gemini)} if args.gemini else {"gemini": LatencyProfile(p50_ms=1500, p99_ms=6000)}
+    scale = args.time_scale
+
+    print(f"🧪 _process_single_row ({TARGET}): {args.rows} rows, {args.workers} workers, tools={tools or 'none'}, "
+          f"time scale {scale}")
+    with replaying(trace, profiles, seed=args.seed, time_scale=scale) as replayer:
+        wall, latencies, statuses = run_rows(args.rows, args.workers, tools, "replay")
+
+    gemini = replayer.summary().get("gemini", {})
+    print(f"   ⏱️  {wall / scale:.1f}s nominal  ->  {args.rows * scale / wall:.2f} rows/s")
+    print(f"   📈 row latency p50 {percentile(latencies, 0.5) / scale:.0f}  p95 {percentile(latencies, 0.95) / scale:.0f}  "
+          f"p99 {percentile(latencies, 0.99) / scale:.0f} ms (nominal)")
+    print(f"   📊 statuses: {statuses}")
+    print(f"   🌐 gemini: {gemini.get('calls', 0)} calls, {gemini.get('errors', 0)} 5xx, {gemini.get('rate_limited', 0)} 429")
+
+
+if __name__ == "__main__":
+    main()
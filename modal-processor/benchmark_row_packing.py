@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one Gemini call per row vs. packed rows
+===================================================
+
+Runs a tool-less batch against a local stub Gemini endpoint (GEMINI_BASE_URL) whose
+latency is a fixed per-request cost plus a per-item generation cost, once with one
+_process_single_row call per row and once with _process_row_pack (K chosen by
+row_packing.choose_pack_size). Reports Gemini requests, wall time and rows/s.
+
+--invalid-rate makes the stub drop that fraction of items from packed responses,
+to exercise the single-row fallback.
+
+Usage:
+    python benchmark_row_packing.py [--rows 1000] [--workers 50] [--request-ms 400] [--item-ms 15]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from row_packing import choose_pack_size
+
+PROMPT = "Classify {{company}} ({{domain}}) into one industry and give a one-line summary."
+OUTPUT_SCHEMA = [{"name": "industry"}, {"name": "summary"}]
+
+
+def start_stub_server(request_ms: float, item_ms: float, invalid_rate: float, seed: int):
+    """generateContent endpoint answering single-row and packed (array schema) requests."""
+    stats = {"requests": 0}
+    lock = threading.Lock()
+    rng = random.Random(seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            text = request["contents"][0]["parts"][0]["text"]
+            schema = (request.get("generationConfig") or {}).get("responseSchema") or {}
+            packed = str(schema.get("type", "")).upper() == "ARRAY"
+            n_items = text.count("### Item ") if packed else 1
+            with lock:
+                stats["requests"] += 1
+                keep = [rng.random() >= invalid_rate for _ in range(n_items)]
+            time.sleep((request_ms + item_ms * n_items) / 1000)
+
+            def item(i):
+                return {"industry": "Logistics", "summary": f"Stub answer {i}"}
+
+            if packed:
+                answer = [dict(item(i), item=i + 1) for i in range(n_items) if keep[i]]
+            else:
+                answer = item(0)
+            body = json.dumps({
+                "candidates": [{"content": {"role": "model", "parts": [{"text": json.dumps(answer)}]}, "finishReason": "STOP"}],
+                "usageMetadata": {"promptTokenCount": 60 * n_items, "candidatesTokenCount": 25 * n_items},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gemini requests and wall time, per-row vs packed rows")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--request-ms", type=float, default=400.0, help="Stub fixed cost per request")
+    parser.add_argument("--item-ms", type=float, default=15.0, help="Stub generation cost per item")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="Fraction of packed items the stub drops")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server, base_url, stats = start_stub_server(args.request_ms, args.item_ms, args.invalid_rate, args.seed)
+    os.environ["GEMINI_BASE_URL"] = base_url
+
+    try:
+        import main as processor
+        target = "main.py"
+    except ImportError:
+        import main_railway as processor
+        target = "main_railway.py"
+
+    rows = [{"id": str(i), "company": f"Company {i}", "domain": f"company{i}.com"} for i in range(args.rows)]
+    items = list(enumerate(rows))
+    k = choose_pack_size(PROMPT, rows, processor._build_schema_fields(OUTPUT_SCHEMA))
+    print(f"🧪 {args.rows} tool-less rows ({target}), {args.workers} workers, stub {args.request_ms:.0f}ms/request "
+          f"+ {args.item_ms:.0f}ms/item, K={k}")
+
+    def per_row(item):
+        index, row = item
+        return [processor._process_single_row("bench", row, index, PROMPT, "", OUTPUT_SCHEMA, [], "stub-key")]
+
+    def per_pack(pack):
+        return processor._process_row_pack("bench", pack, PROMPT, "", OUTPUT_SCHEMA, "stub-key")
+
+    runs = {}
+    for label, fn, units in (
+        ("one call per row", per_row, items),
+        (f"packed (K={k})", per_pack, [items[i:i + k] for i in range(0, len(items), k)]),
+    ):
+        stats["requests"] = 0
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                results = [r for unit_results in pool.map(fn, units) for r in unit_results]
+        wall = time.perf_counter() - start
+        ok = sum(1 for r in results if r["status"] == "success")
+        assert sorted(r["row_index"] for r in results) == list(range(args.rows))
+        runs[label] = (stats["requests"], wall)
+        print(f"   {label:<18} {stats['requests']:6d} requests  {wall:6.2f}s  {args.rows / wall:7.1f} rows/s  "
+              f"{ok}/{args.rows} success")
+
+    (req_a, wall_a), (req_b, wall_b) = runs.values()
+    print(f"   ⚡ {req_a / req_b:.1f}x fewer requests, {wall_a / wall_b:.1f}x faster")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,11 @@ DATAFORSEO_LOCK = threading.Semaphore(30)
 # Gemini: 4000 RPM = ~66/sec, use 60 concurrent to be safe  
 GEMINI_LOCK = threading.Semaphore(60)
 
+# Shared keep-alive session for DataForSEO (pool sized to DATAFORSEO_LOCK), so rows in
+# the same container reuse connections instead of a new TLS handshake per search
+_dataforseo_session = requests.Session()
+_dataforseo_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=30))
+
 def with_retry_sync(func, max_retries=3, base_delay=0.5):
     """Execute sync function with exponential backoff retry."""
     import time
@@ -109,7 +114,7 @@ def search_web_dataforseo(
                 "depth": num_results,
             }]
             
-            response = requests.post(endpoint, headers=headers, json=payload, timeout=15)
+            response = _dataforseo_session.post(endpoint, headers=headers, json=payload, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -30,6 +30,7 @@ import time
 from fastapi import FastAPI, Request, HTTPException
 # No retry/backoff - all requests run in parallel without delays
 import logging
+import threading
 
 # Import fallback services for web search (DataForSEO) and URL context (OpenPull)
 # Handle Modal environment where module is mounted to /root
@@ -58,6 +59,9 @@ except ImportError:
     def get_url_context_simple(*args, **kwargs):
         return {"success": False, "error": "fallback_services not available", "content": ""}
 
+from batch_writer import BatchResultWriter, batch_retry_count, load_succeeded_rows
+from row_packing import choose_pack_size, process_packed_rows
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -84,7 +88,7 @@ image = (
         "libnss3-dev", "libgdk-pixbuf2.0-0", "libpango-1.0-0", "libpangocairo-1.0-0",
     )
     .pip_install(
-        "google-genai>=1.0.0",
+        "google-genai>=1.20.0",  # HttpOptions.client_args (shared connection pool limits)
         "supabase>=2.0.0",
         "python-dotenv>=1.0.0",
         "fastapi[standard]>=0.115.0",
@@ -105,6 +109,8 @@ image = (
         "DISPLAY": "",  # No display needed for headless
     })
     .add_local_file("fallback_services.py", "/root/fallback_services.py")
+    .add_local_file("batch_writer.py", "/root/batch_writer.py")
+    .add_local_file("row_packing.py", "/root/row_packing.py")
 )
 
 # Create FastAPI app for HTTP endpoints
@@ -273,6 +279,79 @@ def fire_webhook(webhook_url: str, payload: Dict[str, Any]) -> bool:
         return False
 
 
+# Per-container client reuse: rows handled by the same container share one Gemini
+# client per API key (one keep-alive connection pool) instead of a new client,
+# pool and TLS handshake per row. GENAI_CLIENT_CACHE=0 restores per-row clients.
+GENAI_CLIENT_CACHE = os.getenv("GENAI_CLIENT_CACHE", "1") != "0"
+GENAI_MAX_CONNECTIONS = int(os.getenv("GENAI_MAX_CONNECTIONS", "100"))
+_genai_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _new_genai_client(api_key: str):
+    import httpx
+    from google import genai
+    from google.genai import types
+
+    limits = httpx.Limits(max_connections=GENAI_MAX_CONNECTIONS, max_keepalive_connections=GENAI_MAX_CONNECTIONS)
+    http_options: Dict[str, Any] = {"client_args": {"limits": limits}}
+    if os.getenv("GEMINI_BASE_URL"):
+        # Proxies / local stub endpoints (see benchmark_client_reuse.py)
+        http_options["base_url"] = os.getenv("GEMINI_BASE_URL")
+    return genai.Client(api_key=api_key, http_options=types.HttpOptions(**http_options))
+
+
+def get_genai_client(api_key: str):
+    """Gemini client for this API key, shared by all rows processed in this container."""
+    if not GENAI_CLIENT_CACHE:
+        return _new_genai_client(api_key)
+    client = _genai_clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _genai_clients.get(api_key)
+            if client is None:
+                client = _new_genai_client(api_key)
+                _genai_clients[api_key] = client
+    return client
+
+
+_supabase_clients: Dict[tuple, Any] = {}
+
+
+def get_supabase_client(supabase_url: str, supabase_key: str):
+    """Supabase client shared by all rows in this container (per-row cancellation checks)."""
+    client = _supabase_clients.get((supabase_url, supabase_key))
+    if client is None:
+        with _clients_lock:
+            client = _supabase_clients.get((supabase_url, supabase_key))
+            if client is None:
+                from supabase import create_client
+                client = create_client(supabase_url, supabase_key)
+                _supabase_clients[(supabase_url, supabase_key)] = client
+    return client
+
+
+def _build_schema_fields(output_schema: List[Any]) -> List[tuple]:
+    """(name, description) pairs for the response schema from output_schema columns."""
+    schema_fields = []
+    for col in output_schema or []:
+        if isinstance(col, dict):
+            name = col.get('name', str(col))
+            desc = col.get('description') or get_smart_field_description(name)
+        elif isinstance(col, (list, tuple)) and len(col) >= 2:
+            # Handle [name, description] format
+            name = str(col[0])
+            desc = str(col[1])
+        elif isinstance(col, (list, tuple)) and len(col) == 1:
+            name = str(col[0])
+            desc = get_smart_field_description(name)
+        else:
+            name = str(col)
+            desc = get_smart_field_description(name)
+        schema_fields.append((name, desc))
+    return schema_fields
+
+
 def _process_single_row(
     batch_id: str,
     row: Dict[str, str],
@@ -288,7 +367,8 @@ def _process_single_row(
     Process a single CSV row through Gemini API.
     
     Pure function designed for parallel execution via Modal's .starmap().
-    Results are returned (not saved) - batch insert happens after all rows complete.
+    Results are returned (not saved) - the caller hands them to BatchResultWriter,
+    which writes them behind in chunks as rows finish.
     
     Args:
         batch_id: Unique identifier for the batch
@@ -303,13 +383,12 @@ def _process_single_row(
     Returns:
         Dict with row_id, output, status, and optional error
     """
-    from google import genai
     from google.genai import types
     
     row_id = f"{batch_id}-row-{row_index}"
     
-    # Initialize Gemini client
-    client = genai.Client(api_key=gemini_api_key)
+    # Gemini client shared across rows in this container (keep-alive connection pool)
+    client = get_genai_client(gemini_api_key)
     
     # Use Gemini 2.5 Flash Lite - supports BOTH google_search AND url_context
     # Note: 2.0-flash only supports google_search (not url_context)
@@ -342,26 +421,9 @@ def _process_single_row(
         # 4. Get final structured JSON response
         
         # Build output schema for final response
-        schema_fields = []
+        schema_fields = _build_schema_fields(output_schema)
         actual_tools_called = []  # Track which tools Gemini actually calls
         
-        if output_schema:
-            for col in output_schema:
-                if isinstance(col, dict):
-                    name = col.get('name', str(col))
-                    desc = col.get('description') or get_smart_field_description(name)
-                elif isinstance(col, (list, tuple)) and len(col) >= 2:
-                    # Handle [name, description] format
-                    name = str(col[0])
-                    desc = str(col[1])
-                elif isinstance(col, (list, tuple)) and len(col) == 1:
-                    name = str(col[0])
-                    desc = get_smart_field_description(name)
-                else:
-                    name = str(col)
-                    desc = get_smart_field_description(name)
-                schema_fields.append((name, desc))
-        
         # Default to "output" field if no schema defined
         if not schema_fields:
             schema_fields = [("output", "The complete answer to the prompt")]
@@ -856,8 +918,8 @@ def _process_single_row(
     # Use actual tools called (if any), otherwise fall back to requested tools
     tools_used = actual_tools_called if actual_tools_called else (tools if tools else [])
     
-    # NOTE: Results are NOT saved to DB here - they're batch-inserted at the end
-    # of processing for efficiency (reduces N individual writes to N/100 batch writes)
+    # NOTE: Results are NOT saved to DB here - the caller's BatchResultWriter writes
+    # them behind in chunks as rows finish (N/100 batch writes instead of N)
 
     return {
         "id": row_id,
@@ -874,6 +936,39 @@ def _process_single_row(
     }
 
 
+def _process_row_pack(
+    batch_id: str,
+    items: List[tuple],
+    prompt: str,
+    context: str,
+    output_schema: List[Dict[str, str]],
+    gemini_api_key: str,
+) -> List[Dict[str, Any]]:
+    """
+    Process several tool-less rows with one packed Gemini call (see row_packing.py).
+
+    Rows the packed response leaves missing or invalid are re-run through
+    _process_single_row, so every (row_index, row) item gets exactly one result.
+    """
+    model_name = "gemini-2.5-flash-lite"
+    results, failed = process_packed_rows(
+        get_genai_client(gemini_api_key),
+        batch_id,
+        items,
+        prompt,
+        context,
+        _build_schema_fields(output_schema),
+        get_system_prompt(tools=[]),
+        model_name,
+        log=print,
+    )
+    for row_index, row in failed:
+        results.append(_process_single_row(
+            batch_id, row, row_index, prompt, context, output_schema, [], gemini_api_key,
+        ))
+    return results
+
+
 @app.function(
     image=image,
     timeout=3600,
@@ -925,8 +1020,7 @@ def process_row(
     # CHECK FOR CANCELLATION before processing
     # This allows stopping a batch mid-processing
     try:
-        from supabase import create_client
-        supabase = create_client(supabase_url, supabase_key)
+        supabase = get_supabase_client(supabase_url, supabase_key)
         batch_check = supabase.table("batches").select("status").eq("id", batch_id).single().execute()
         if batch_check.data and batch_check.data.get("status") == "cancelled":
             print(f"[{batch_id}] Row {row_index}: Batch cancelled - skipping")
@@ -954,6 +1048,72 @@ def process_row(
     )
 
 
+@app.function(
+    image=image,
+    timeout=3600,
+    memory=2048,
+    secrets=[MODAL_SECRET],
+    # Each input is a whole pack (up to PACK_MAX_ROWS rows), so fewer per container
+    allow_concurrent_inputs=20,
+)
+def process_row_pack(
+    batch_id: str,
+    items: List[tuple],
+    prompt: str,
+    context: str,
+    output_schema: List[Dict[str, str]],
+) -> List[Dict[str, Any]]:
+    """
+    Modal function to process a pack of tool-less rows with one Gemini call.
+
+    Args:
+        batch_id: Unique identifier for the batch
+        items: (row_index, row) pairs in this pack
+        prompt: Template prompt with {{column}} placeholders
+        context: Additional context for the task
+        output_schema: Expected output columns/format
+
+    Returns:
+        One result dict per item (same shape as process_row)
+    """
+    gemini_api_key = os.getenv("GEMINI_API_KEY")
+    supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL") or os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+
+    if not all([gemini_api_key, supabase_url, supabase_key]):
+        return [
+            {
+                "id": f"{batch_id}-row-{row_index}",
+                "output": "",
+                "status": "error",
+                "error": "Missing required environment variables",
+                "row_index": row_index,
+            }
+            for row_index, _ in items
+        ]
+
+    # CHECK FOR CANCELLATION before processing (once per pack)
+    try:
+        supabase = get_supabase_client(supabase_url, supabase_key)
+        batch_check = supabase.table("batches").select("status").eq("id", batch_id).single().execute()
+        if batch_check.data and batch_check.data.get("status") == "cancelled":
+            print(f"[{batch_id}] Pack of {len(items)} rows: Batch cancelled - skipping")
+            return [
+                {
+                    "id": f"{batch_id}-row-{row_index}",
+                    "output": "",
+                    "status": "cancelled",
+                    "error": "Batch was cancelled",
+                    "row_index": row_index,
+                }
+                for row_index, _ in items
+            ]
+    except Exception as e:
+        print(f"[{batch_id}] Pack of {len(items)} rows: Could not check cancellation status: {e}")
+
+    return _process_row_pack(batch_id, items, prompt, context, output_schema, gemini_api_key)
+
+
 def _process_batch_internal(
     batch_id: str,
     rows: List[Dict[str, str]],
@@ -962,6 +1122,8 @@ def _process_batch_internal(
     output_schema: Optional[List[Dict[str, str]]] = None,
     tools: Optional[List[str]] = None,
     webhook_url: Optional[str] = None,
+    resume: Optional[bool] = None,
+    pack_rows: bool = False,
 ) -> Dict[str, Any]:
     """
     Internal function to orchestrate parallel batch processing.
@@ -974,9 +1136,14 @@ def _process_batch_internal(
         output_schema: Expected output columns/format
         tools: List of tool names to enable
         webhook_url: Optional webhook URL to POST results to when complete
+        resume: Skip rows already stored as success in batch_results (None = only
+            when batch_queue shows this batch is being retried); skipped rows are
+            listed in the summary's resumed_row_indexes
+        pack_rows: Send several rows per Gemini call (tool-less batches with an
+            output schema only; rows that fail validation are re-run one by one)
 
     Returns:
-        Dict with processing results and statistics
+        Dict with statistics (row outputs are in batch_results, not held in memory)
     """
     from supabase import create_client
     
@@ -1016,49 +1183,67 @@ def _process_batch_internal(
         # For direct API calls, batch won't exist. We'll just process without DB tracking
         print(f"[{batch_id}] Batch not in DB - processing anyway (direct API call)")
     
+    # Resume: a retried batch only re-dispatches rows not already stored as success
+    # (explicit `resume` flag, otherwise automatic when batch_queue shows a retry)
+    succeeded = {}
+    if resume is None:
+        try:
+            resume = batch_exists and batch_retry_count(supabase, batch_id) > 0
+        except Exception as e:
+            print(f"[{batch_id}] Warning: Could not read retry count: {e}")
+            resume = False
+    if resume:
+        try:
+            succeeded = load_succeeded_rows(supabase, batch_id)
+        except Exception as e:
+            print(f"[{batch_id}] Warning: Could not load stored results, processing all rows: {e}")
+        print(f"[{batch_id}] Resuming: {len(succeeded)}/{len(rows)} rows already succeeded")
+    pending_rows = [(idx, row) for idx, row in enumerate(rows) if idx not in succeeded]
+
+    # Results are written behind as rows finish (chunked by size/time) so Supabase
+    # latency never holds up row processing and processed_rows shows live progress
+    writer = BatchResultWriter(supabase, batch_id, track_progress=batch_exists)
+    writer.add_existing(succeeded)
+    pack_size = 1
+    if pack_rows:
+        if tools or not output_schema:
+            print(f"[{batch_id}] Row packing needs a tool-less prompt with an output schema - processing rows individually")
+        else:
+            pack_size = choose_pack_size(prompt, [row for _, row in pending_rows], _build_schema_fields(output_schema))
+            print(f"[{batch_id}] Row packing: {pack_size} rows per Gemini call")
+
     try:
-        results = list(process_row.starmap([
-            (batch_id, row, idx, prompt, context or "", output_schema or [], tools or [])
-            for idx, row in enumerate(rows)
-        ]))
+        if pack_size > 1:
+            packs = [pending_rows[i:i + pack_size] for i in range(0, len(pending_rows), pack_size)]
+            result_stream = (
+                result
+                for pack_results in process_row_pack.starmap(
+                    [(batch_id, pack, prompt, context or "", output_schema) for pack in packs],
+                    order_outputs=False,
+                )
+                for result in pack_results
+            )
+        else:
+            result_stream = process_row.starmap(
+                [
+                    (batch_id, row, idx, prompt, context or "", output_schema or [], tools or [])
+                    for idx, row in pending_rows
+                ],
+                order_outputs=False,
+            )
+        for result in result_stream:
+            writer.add(result)
     except Exception as parallel_error:
         print(f"[{batch_id}] Error during parallel processing: {parallel_error}")
-        results = []
-
-    successful_count = sum(1 for r in results if r.get("status") == "success")
-    error_count = sum(1 for r in results if r.get("status") == "error")
+    finally:
+        write_stats = writer.close()
 
-    # BATCH INSERT: Save all results to Supabase in chunks (more efficient than per-row)
-    BATCH_SIZE = 100
-    print(f"[{batch_id}] Batch inserting {len(results)} results to database (chunk size: {BATCH_SIZE})...")
-    
-    for i in range(0, len(results), BATCH_SIZE):
-        chunk = results[i:i + BATCH_SIZE]
-        batch_records = []
-        
-        for r in chunk:
-            batch_records.append({
-                "id": r.get("id"),
-                "batch_id": batch_id,
-                "input_data": json.dumps(r.get("input_data", {})),
-                "output_data": r.get("output", ""),
-                "row_index": r.get("row_index", 0),
-                "status": r.get("status", "error"),
-                "error_message": r.get("error"),
-                "input_tokens": r.get("input_tokens", 0),
-                "output_tokens": r.get("output_tokens", 0),
-                "model": r.get("model", ""),
-                "tools_used": r.get("tools_used", []),
-            })
-        
-        try:
-            supabase.table("batch_results").upsert(
-                batch_records, 
-                on_conflict="batch_id,row_index"
-            ).execute()
-            print(f"[{batch_id}] Inserted chunk {i//BATCH_SIZE + 1} ({len(chunk)} rows)")
-        except Exception as chunk_error:
-            print(f"[{batch_id}] Warning: Failed to insert chunk {i//BATCH_SIZE + 1}: {chunk_error}")
+    successful_count = write_stats["successful"]
+    error_count = write_stats["failed"]
+    print(
+        f"[{batch_id}] Wrote {write_stats['written']} results in {write_stats['flushes']} flushes"
+        + (f" ({write_stats['write_errors']} failed to write)" if write_stats["write_errors"] else "")
+    )
 
     total_time = time.time() - start_time
     avg_time_per_row = total_time / len(rows) if rows else 0
@@ -1067,14 +1252,11 @@ def _process_batch_internal(
     
     # Update batch status and totals
     try:
-        total_input_tokens = sum(r.get("input_tokens", 0) for r in results)
-        total_output_tokens = sum(r.get("output_tokens", 0) for r in results)
-        
         supabase.table("batches").update({
             "status": completion_status,
             "processed_rows": successful_count,
-            "total_input_tokens": total_input_tokens,
-            "total_output_tokens": total_output_tokens,
+            "total_input_tokens": write_stats["input_tokens"],
+            "total_output_tokens": write_stats["output_tokens"],
             "updated_at": "now()",
         }).eq("id", batch_id).execute()
     except Exception as e:
@@ -1088,7 +1270,11 @@ def _process_batch_internal(
         "processing_time_seconds": round(total_time, 2),
         "avg_time_per_row": round(avg_time_per_row, 3),
         "status": completion_status,
-        "results": results,
+        "resumed_rows": len(succeeded),
+        # Rows kept from an earlier attempt (not re-run); their outputs, like those of
+        # the rows processed now, are read from batch_results
+        "resumed_row_indexes": sorted(succeeded),
+        "pack_size": pack_size,
     }
     
     print(
@@ -1116,9 +1302,11 @@ def process_batch_modal(
     output_schema: Optional[List[Dict[str, str]]] = None,
     tools: Optional[List[str]] = None,
     webhook_url: Optional[str] = None,
+    resume: Optional[bool] = None,
+    pack_rows: bool = False,
 ) -> Dict[str, Any]:
     """Modal function that processes batches."""
-    return _process_batch_internal(batch_id, rows, prompt, context, output_schema, tools, webhook_url)
+    return _process_batch_internal(batch_id, rows, prompt, context, output_schema, tools, webhook_url, resume, pack_rows)
 
 
 @app.function(
@@ -1137,7 +1325,6 @@ def generate_output_columns(prompt: str) -> Dict[str, Any]:
     Returns:
         Dict with columns, status, and optional error
     """
-    from google import genai
     from google.genai import types
 
     gemini_api_key = os.getenv("GEMINI_API_KEY")
@@ -1148,7 +1335,7 @@ def generate_output_columns(prompt: str) -> Dict[str, Any]:
             "error": "Missing GEMINI_API_KEY environment variable",
         }
 
-    client = genai.Client(api_key=gemini_api_key)
+    client = get_genai_client(gemini_api_key)
 
     try:
         system_instruction = """You are an AI that generates output column definitions for bulk data processing.
@@ -1266,7 +1453,9 @@ async def process_action(request: Request, action: str):
     Unified endpoint for all processing actions.
     
     Actions:
-    - 'batch': Process a batch of CSV rows
+    - 'batch': Process a batch of CSV rows (`resume: true` skips rows already
+      stored as success, e.g. when retrying a batch that timed out; `pack_rows: true`
+      sends several rows per Gemini call for tool-less prompts)
     - 'columns': Generate output columns from a prompt
     
     Args:
@@ -1299,6 +1488,8 @@ async def process_action(request: Request, action: str):
             output_schema=output_schema,
             tools=body.get("tools", []),
             webhook_url=body.get("webhook_url"),
+            resume=body.get("resume"),
+            pack_rows=bool(body.get("pack_rows", False)),
         )
 
         return {
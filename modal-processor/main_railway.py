@@ -21,6 +21,7 @@ from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import threading
 import functools
 
 # Import fallback services
@@ -45,6 +46,9 @@ except ImportError:
     def get_url_context_simple(*args, **kwargs):
         return {"success": False, "error": "fallback_services not available", "content": ""}
 
+from batch_writer import BatchResultWriter, batch_retry_count, load_succeeded_rows
+from row_packing import choose_pack_size, process_packed_rows
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -177,6 +181,63 @@ def fire_webhook(webhook_url: str, payload: Dict[str, Any]) -> bool:
         return False
 
 
+# Per-container client reuse: rows handled by the same container share one Gemini
+# client per API key (one keep-alive connection pool) instead of a new client,
+# pool and TLS handshake per row. GENAI_CLIENT_CACHE=0 restores per-row clients.
+GENAI_CLIENT_CACHE = os.getenv("GENAI_CLIENT_CACHE", "1") != "0"
+GENAI_MAX_CONNECTIONS = int(os.getenv("GENAI_MAX_CONNECTIONS", "250"))
+_genai_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _new_genai_client(api_key: str):
+    import httpx
+    from google import genai
+    from google.genai import types
+
+    limits = httpx.Limits(max_connections=GENAI_MAX_CONNECTIONS, max_keepalive_connections=GENAI_MAX_CONNECTIONS)
+    http_options: Dict[str, Any] = {"client_args": {"limits": limits}}
+    if os.getenv("GEMINI_BASE_URL"):
+        # Proxies / local stub endpoints (see benchmark_client_reuse.py)
+        http_options["base_url"] = os.getenv("GEMINI_BASE_URL")
+    return genai.Client(api_key=api_key, http_options=types.HttpOptions(**http_options))
+
+
+def get_genai_client(api_key: str):
+    """Gemini client for this API key, shared by all rows processed in this container."""
+    if not GENAI_CLIENT_CACHE:
+        return _new_genai_client(api_key)
+    client = _genai_clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _genai_clients.get(api_key)
+            if client is None:
+                client = _new_genai_client(api_key)
+                _genai_clients[api_key] = client
+    return client
+
+
+def _build_schema_fields(output_schema: List[Any]) -> List[tuple]:
+    """(name, description) pairs for the response schema from output_schema columns."""
+    schema_fields = []
+    for col in output_schema or []:
+        if isinstance(col, dict):
+            name = col.get('name', str(col))
+            desc = col.get('description') or get_smart_field_description(name)
+        elif isinstance(col, (list, tuple)) and len(col) >= 2:
+            # Handle [name, description] format
+            name = str(col[0])
+            desc = str(col[1])
+        elif isinstance(col, (list, tuple)) and len(col) == 1:
+            name = str(col[0])
+            desc = get_smart_field_description(name)
+        else:
+            name = str(col)
+            desc = get_smart_field_description(name)
+        schema_fields.append((name, desc))
+    return schema_fields
+
+
 def _process_single_row(
     batch_id: str,
     row: Dict[str, str],
@@ -192,15 +253,15 @@ def _process_single_row(
     Process a single CSV row through Gemini API.
     
     Pure function designed for parallel execution via ThreadPoolExecutor.
-    Results are returned (not saved) - batch insert happens after all rows complete.
+    Results are returned (not saved) - the caller hands them to BatchResultWriter,
+    which writes them behind in chunks as rows finish.
     """
-    from google import genai
     from google.genai import types
     
     row_id = f"{batch_id}-row-{row_index}"
     
-    # Initialize Gemini client
-    client = genai.Client(api_key=gemini_api_key)
+    # Gemini client shared across rows in this container (keep-alive connection pool)
+    client = get_genai_client(gemini_api_key)
     model_name = "gemini-2.5-flash-lite"
     
     try:
@@ -215,25 +276,9 @@ def _process_single_row(
             final_prompt = f"Context: {context}\n\n{final_prompt}"
         
         # Build output schema
-        schema_fields = []
+        schema_fields = _build_schema_fields(output_schema)
         actual_tools_called = []
         
-        if output_schema:
-            for col in output_schema:
-                if isinstance(col, dict):
-                    name = col.get('name', str(col))
-                    desc = col.get('description') or get_smart_field_description(name)
-                elif isinstance(col, (list, tuple)) and len(col) >= 2:
-                    name = str(col[0])
-                    desc = str(col[1])
-                elif isinstance(col, (list, tuple)) and len(col) == 1:
-                    name = str(col[0])
-                    desc = get_smart_field_description(name)
-                else:
-                    name = str(col)
-                    desc = get_smart_field_description(name)
-                schema_fields.append((name, desc))
-        
         if not schema_fields:
             schema_fields = [("output", "The complete answer to the prompt")]
         
@@ -382,6 +427,39 @@ def _process_single_row(
         }
 
 
+def _process_row_pack(
+    batch_id: str,
+    items: List[tuple],
+    prompt: str,
+    context: str,
+    output_schema: List[Dict[str, str]],
+    gemini_api_key: str,
+) -> List[Dict[str, Any]]:
+    """
+    Process several tool-less rows with one packed Gemini call (see row_packing.py).
+
+    Rows the packed response leaves missing or invalid are re-run through
+    _process_single_row, so every (row_index, row) item gets exactly one result.
+    """
+    model_name = "gemini-2.5-flash-lite"
+    results, failed = process_packed_rows(
+        get_genai_client(gemini_api_key),
+        batch_id,
+        items,
+        prompt,
+        context,
+        _build_schema_fields(output_schema),
+        get_system_prompt(),
+        model_name,
+        log=logger.info,
+    )
+    for row_index, row in failed:
+        results.append(_process_single_row(
+            batch_id, row, row_index, prompt, context, output_schema, [], gemini_api_key,
+        ))
+    return results
+
+
 def _process_batch_internal(
     batch_id: str,
     rows: List[Dict[str, str]],
@@ -390,6 +468,8 @@ def _process_batch_internal(
     output_schema: Optional[List[Dict[str, str]]] = None,
     tools: Optional[List[str]] = None,
     webhook_url: Optional[str] = None,
+    resume: Optional[bool] = None,
+    pack_rows: bool = False,
 ) -> Dict[str, Any]:
     """Internal function to orchestrate parallel batch processing."""
     from supabase import create_client
@@ -415,6 +495,46 @@ def _process_batch_internal(
     except Exception as e:
         logger.warning(f"[{batch_id}] Could not update batch status: {e}")
     
+    # Resume: a retried batch only re-dispatches rows not already stored as success
+    # (explicit `resume` flag, otherwise automatic when batch_queue shows a retry)
+    succeeded = {}
+    if resume is None:
+        try:
+            resume = batch_retry_count(supabase, batch_id) > 0
+        except Exception as e:
+            logger.warning(f"[{batch_id}] Could not read retry count: {e}")
+            resume = False
+    if resume:
+        try:
+            succeeded = load_succeeded_rows(supabase, batch_id)
+        except Exception as e:
+            logger.warning(f"[{batch_id}] Could not load stored results, processing all rows: {e}")
+        logger.info(f"[{batch_id}] Resuming: {len(succeeded)}/{len(rows)} rows already succeeded")
+    pending_rows = [(idx, row) for idx, row in enumerate(rows) if idx not in succeeded]
+
+    # Results are written behind as rows finish (chunked by size/time) so Supabase
+    # latency never holds up row processing and processed_rows shows live progress
+    writer = BatchResultWriter(supabase, batch_id, log=logger.info)
+    writer.add_existing(succeeded)
+
+    # Results go to the writer only - nothing is collected here, so memory stays
+    # bounded by the write buffer however large the batch is
+    def process_and_record(args) -> None:
+        writer.add(_process_single_row(*args))  # blocks this worker only if the write buffer is full
+
+    # Row packing: several tool-less rows per Gemini call (see row_packing.py)
+    pack_size = 1
+    if pack_rows:
+        if tools or not output_schema:
+            logger.info(f"[{batch_id}] Row packing needs a tool-less prompt with an output schema - processing rows individually")
+        else:
+            pack_size = choose_pack_size(prompt, [row for _, row in pending_rows], _build_schema_fields(output_schema))
+            logger.info(f"[{batch_id}] Row packing: {pack_size} rows per Gemini call")
+
+    def process_pack_and_record(pack) -> None:
+        for result in _process_row_pack(batch_id, pack, prompt, context or "", output_schema, gemini_api_key):
+            writer.add(result)
+
     # Process rows in parallel using asyncio for better I/O-bound performance
     # Use semaphore to limit concurrent requests (250 at a time, matching Modal)
     # This prevents overwhelming the system while maximizing throughput
@@ -422,7 +542,7 @@ def _process_batch_internal(
         """Async wrapper for row processing"""
         loop = asyncio.get_event_loop()
         # Run CPU-bound work in thread pool, but keep async for I/O
-        return await loop.run_in_executor(executor, lambda: _process_single_row(*args))
+        return await loop.run_in_executor(executor, lambda: process_and_record(args))
     
     async def process_batch_async():
         """Process all rows with controlled concurrency"""
@@ -432,62 +552,48 @@ def _process_batch_internal(
             async with semaphore:
                 return await process_row_async(args)
         
-        tasks = [
-            process_with_semaphore((batch_id, row, idx, prompt, context or "", output_schema or [], tools or [], gemini_api_key))
-            for idx, row in enumerate(rows)
-        ]
+        if pack_size > 1:
+            async def process_pack_with_semaphore(pack):
+                async with semaphore:
+                    loop = asyncio.get_event_loop()
+                    return await loop.run_in_executor(executor, lambda: process_pack_and_record(pack))
+
+            tasks = [
+                process_pack_with_semaphore(pending_rows[i:i + pack_size])
+                for i in range(0, len(pending_rows), pack_size)
+            ]
+        else:
+            tasks = [
+                process_with_semaphore((batch_id, row, idx, prompt, context or "", output_schema or [], tools or [], gemini_api_key))
+                for idx, row in pending_rows
+            ]
         
         # Process all tasks concurrently (limited by semaphore)
-        return await asyncio.gather(*tasks)
+        await asyncio.gather(*tasks)
     
     # Run async processing
-    results = asyncio.run(process_batch_async())
-    
-    successful_count = sum(1 for r in results if r.get("status") == "success")
-    error_count = sum(1 for r in results if r.get("status") == "error")
-    
-    # Batch insert results
-    BATCH_SIZE = 100
-    for i in range(0, len(results), BATCH_SIZE):
-        chunk = results[i:i + BATCH_SIZE]
-        batch_records = []
-        
-        for r in chunk:
-            batch_records.append({
-                "id": r.get("id"),
-                "batch_id": batch_id,
-                "input_data": json.dumps(r.get("input_data", {})),
-                "output_data": r.get("output", ""),
-                "row_index": r.get("row_index", 0),
-                "status": r.get("status", "error"),
-                "error_message": r.get("error"),
-                "input_tokens": r.get("input_tokens", 0),
-                "output_tokens": r.get("output_tokens", 0),
-                "model": r.get("model", ""),
-                "tools_used": r.get("tools_used", []),
-            })
-        
-        try:
-            supabase.table("batch_results").upsert(
-                batch_records, 
-                on_conflict="batch_id,row_index"
-            ).execute()
-        except Exception as chunk_error:
-            logger.warning(f"[{batch_id}] Failed to insert chunk: {chunk_error}")
+    try:
+        asyncio.run(process_batch_async())
+    finally:
+        write_stats = writer.close()
+
+    successful_count = write_stats["successful"]
+    error_count = write_stats["failed"]
+    logger.info(
+        f"[{batch_id}] Wrote {write_stats['written']} results in {write_stats['flushes']} flushes"
+        + (f" ({write_stats['write_errors']} failed to write)" if write_stats["write_errors"] else "")
+    )
     
     total_time = time.time() - start_time
     completion_status = "completed" if error_count == 0 else "completed_with_errors"
     
     # Update batch status
     try:
-        total_input_tokens = sum(r.get("input_tokens", 0) for r in results)
-        total_output_tokens = sum(r.get("output_tokens", 0) for r in results)
-        
         supabase.table("batches").update({
             "status": completion_status,
             "processed_rows": successful_count,
-            "total_input_tokens": total_input_tokens,
-            "total_output_tokens": total_output_tokens,
+            "total_input_tokens": write_stats["input_tokens"],
+            "total_output_tokens": write_stats["output_tokens"],
             "updated_at": "now()",
         }).eq("id", batch_id).execute()
     except Exception as e:
@@ -500,6 +606,11 @@ def _process_batch_internal(
         "failed": error_count,
         "processing_time_seconds": round(total_time, 2),
         "status": completion_status,
+        "resumed_rows": len(succeeded),
+        # Rows kept from an earlier attempt (not re-run); their outputs, like those of
+        # the rows processed now, are read from batch_results
+        "resumed_row_indexes": sorted(succeeded),
+        "pack_size": pack_size,
     }
     
     logger.info(f"[{batch_id}] Batch complete: {successful_count} success, {error_count} errors in {total_time:.1f}s")
@@ -512,7 +623,6 @@ def _process_batch_internal(
 
 def generate_output_columns(prompt: str) -> Dict[str, Any]:
     """Analyze a user's prompt and suggest appropriate output columns."""
-    from google import genai
     from google.genai import types
 
     gemini_api_key = os.getenv("GEMINI_API_KEY")
@@ -523,7 +633,7 @@ def generate_output_columns(prompt: str) -> Dict[str, Any]:
             "error": "Missing GEMINI_API_KEY environment variable",
         }
 
-    client = genai.Client(api_key=gemini_api_key)
+    client = get_genai_client(gemini_api_key)
 
     try:
         system_instruction = """You are an AI that generates output column definitions for bulk data processing.
@@ -648,6 +758,8 @@ async def process_action(request: Request, action: str, background_tasks: Backgr
             output_schema=output_schema,
             tools=body.get("tools", []),
             webhook_url=body.get("webhook_url"),
+            resume=body.get("resume"),
+            pack_rows=bool(body.get("pack_rows", False)),
         )
 
         return {
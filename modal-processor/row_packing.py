@@ -0,0 +1,219 @@
+"""
+Multi-row packing for tool-less prompts
+=======================================
+
+For batches without tools, most templates are small classification/enrichment
+prompts with a handful of output fields, so one Gemini request per row is mostly
+per-request overhead. Packing renders K rows into one request whose
+response_schema is an ARRAY of per-row objects, then unpacks and validates each
+row's output. Rows whose output is missing or invalid are returned as failed so
+the caller can re-run them through the normal single-row path.
+
+K is chosen from estimated tokens per row (prompt in, schema fields out) so a pack
+stays well inside the model's input/output limits.
+
+Shared by main.py (Modal) and main_railway.py (Railway).
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+# Upper bound on rows per packed request
+PACK_MAX_ROWS = int(os.getenv("PACK_MAX_ROWS", "25"))
+# Token budgets per packed request (kept far below model limits: long JSON arrays
+# are where structured output starts dropping or merging items)
+PACK_INPUT_TOKEN_BUDGET = int(os.getenv("PACK_INPUT_TOKEN_BUDGET", "16000"))
+PACK_OUTPUT_TOKEN_BUDGET = int(os.getenv("PACK_OUTPUT_TOKEN_BUDGET", "4000"))
+# Output estimate per field (short classification/enrichment values)
+PACK_TOKENS_PER_FIELD = 40
+
+ITEM_KEY = "item"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def render_row_prompt(prompt: str, row: Dict[str, str]) -> str:
+    """Fill {{column}} placeholders for one row (same substitution as single-row calls)."""
+    rendered = prompt.strip()
+    for key, value in row.items():
+        if key != "id" and value:
+            rendered = rendered.replace(f"{{{{{key}}}}}", str(value))
+    return rendered
+
+
+def choose_pack_size(
+    prompt: str,
+    rows: List[Dict[str, str]],
+    schema_fields: List[Tuple[str, str]],
+    max_rows: int = PACK_MAX_ROWS,
+) -> int:
+    """
+    Rows per packed request, from estimated tokens per row.
+
+    Uses the largest of a sample of rendered rows so a few long rows don't push
+    a pack over budget. Returns 1 when packing would not fit at least 2 rows.
+    """
+    if not rows:
+        return 1
+    sample = rows[:: max(1, len(rows) // 50)][:50]
+    input_per_row = max(estimate_tokens(render_row_prompt(prompt, row)) for row in sample) + 10
+    output_per_row = PACK_TOKENS_PER_FIELD * len(schema_fields) + 10
+    k = min(
+        max_rows,
+        PACK_INPUT_TOKEN_BUDGET // input_per_row,
+        PACK_OUTPUT_TOKEN_BUDGET // output_per_row,
+    )
+    return max(1, k)
+
+
+def build_packed_prompt(prompt: str, context: str, rows: List[Dict[str, str]]) -> str:
+    """One request for len(rows) independent items; shared context is sent once."""
+    parts = []
+    if context:
+        parts.append(f"Context: {context}")
+    parts.append(
+        f"Complete the task below independently for each of the {len(rows)} items. "
+        f"Return a JSON array with exactly {len(rows)} objects in item order. "
+        f'Each object must have "{ITEM_KEY}" set to the item number and all output fields; '
+        "do not let one item's answer influence another."
+    )
+    for i, row in enumerate(rows, 1):
+        parts.append(f"### Item {i}\n{render_row_prompt(prompt, row)}")
+    return "\n\n".join(parts)
+
+
+def packed_response_schema(schema_fields: List[Tuple[str, str]]):
+    from google.genai import types
+
+    properties = {ITEM_KEY: types.Schema(type=types.Type.INTEGER, description="Item number")}
+    properties.update({
+        name: types.Schema(type=types.Type.STRING, description=desc)
+        for name, desc in schema_fields
+    })
+    return types.Schema(
+        type=types.Type.ARRAY,
+        items=types.Schema(
+            type=types.Type.OBJECT,
+            properties=properties,
+            required=[ITEM_KEY] + [name for name, _ in schema_fields],
+        ),
+    )
+
+
+def _validate_item(item: Any, field_names: List[str]) -> Optional[Dict[str, str]]:
+    """Row output in the single-row format, or None if the item is unusable."""
+    if not isinstance(item, dict):
+        return None
+    lowered = {str(k).lower(): v for k, v in item.items()}
+    validated = {}
+    for name in field_names:
+        value = item[name] if name in item else lowered.get(name.lower())
+        if value is None:
+            return None
+        validated[name] = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+    return validated
+
+
+def unpack_items(raw_output: Optional[str], n_rows: int, field_names: List[str]) -> Dict[int, Dict[str, str]]:
+    """Position in pack -> validated output; rows missing from the result are absent."""
+    try:
+        parsed = json.loads(raw_output or "")
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    if not isinstance(parsed, list):
+        return {}
+
+    outputs: Dict[int, Dict[str, str]] = {}
+    for position, item in enumerate(parsed):
+        validated = _validate_item(item, field_names)
+        if validated is None:
+            continue
+        number = item.get(ITEM_KEY)
+        # Trust the item number when present; fall back to position if the model
+        # returned exactly one object per row without numbering
+        if isinstance(number, int) and 1 <= number <= n_rows:
+            index = number - 1
+        elif len(parsed) == n_rows:
+            index = position
+        else:
+            continue
+        if index in outputs:
+            # Two answers for one item: neither can be trusted
+            outputs[index] = None
+        else:
+            outputs[index] = validated
+    return {i: v for i, v in outputs.items() if v is not None}
+
+
+def process_packed_rows(
+    client,
+    batch_id: str,
+    items: List[Tuple[int, Dict[str, str]]],
+    prompt: str,
+    context: str,
+    schema_fields: List[Tuple[str, str]],
+    system_instruction: str,
+    model_name: str,
+    log=print,
+) -> Tuple[List[Dict[str, Any]], List[Tuple[int, Dict[str, str]]]]:
+    """
+    Process (row_index, row) items in one Gemini request.
+
+    Returns (results, failed_items): results use the same shape as
+    _process_single_row; failed_items should be re-run one row at a time.
+    Token usage is split evenly across the rows that came back valid.
+    """
+    from google.genai import types
+
+    rows = [row for _, row in items]
+    field_names = [name for name, _ in schema_fields]
+    try:
+        response = client.models.generate_content(
+            model=model_name,
+            contents=build_packed_prompt(prompt, context, rows),
+            config=types.GenerateContentConfig(
+                system_instruction=system_instruction,
+                response_mime_type="application/json",
+                response_schema=packed_response_schema(schema_fields),
+            ),
+        )
+    except Exception as e:
+        log(f"[{batch_id}] Packed call for {len(items)} rows failed, falling back to single rows: {e}")
+        return [], list(items)
+
+    outputs = unpack_items(response.text if response else None, len(items), field_names)
+
+    input_tokens = output_tokens = 0
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        input_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+    share = max(1, len(outputs))
+
+    results = []
+    failed = []
+    for position, (row_index, row) in enumerate(items):
+        if position not in outputs:
+            failed.append((row_index, row))
+            continue
+        results.append({
+            "id": f"{batch_id}-row-{row_index}",
+            "output": json.dumps(outputs[position]),
+            "status": "success",
+            "error": None,
+            "input_tokens": input_tokens // share,
+            "output_tokens": output_tokens // share,
+            "model": model_name,
+            "tools_used": [],
+            "batch_id": batch_id,
+            "input_data": row,
+            "row_index": row_index,
+        })
+
+    if failed:
+        log(f"[{batch_id}] Packed call: {len(results)}/{len(items)} rows valid, {len(failed)} to single-row fallback")
+    return results, failed
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+pytest-benchmark suite for _process_single_row
+===============================================
+
+Same setup as benchmark_process_row.py: the row pipeline runs on a thread pool
+against replayed Gemini calls (services/aeo-checks/replay_harness.py), so no
+Gemini key is needed and runs can be compared with `pytest --benchmark-compare`.
+
+Usage:
+    pip install pytest pytest-benchmark
+    pytest test_benchmark_process_row.py --benchmark-autosave
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_process_row import run_rows, synthetic_trace
+from replay_harness import LatencyProfile, replaying
+
+TIME_SCALE = 0.01  # 1s of nominal latency sleeps 10ms
+ROWS = 50
+WORKERS = 25
+PROFILES = {"gemini": LatencyProfile(p50_ms=1500, p99_ms=6000)}
+
+
+@pytest.mark.parametrize("tools", [[], ["web-search"]], ids=["no-tools", "web-search"])
+def test_process_rows(benchmark, tools):
+    with replaying(synthetic_trace(), PROFILES, seed=0, time_scale=TIME_SCALE) as replayer:
+        wall, latencies, statuses = benchmark.pedantic(
+            run_rows, args=(ROWS, WORKERS, tools, "replay"), rounds=3, iterations=1,
+        )
+
+    benchmark.extra_info["time_scale"] = TIME_SCALE
+    benchmark.extra_info["statuses"] = statuses
+    benchmark.extra_info["gemini"] = replayer.summary().get("gemini", {})
+    assert sum(statuses.values()) == ROWS
+    assert statuses.get("success", 0) == ROWS
@@ -5,6 +5,9 @@ Calls the mentions service from services/aeo-checks/mentions_service.py
 
 This script is called from Next.js API route via spawn().
 Reads JSON from stdin, calls the mentions service, outputs JSON to stdout.
+
+With "stream": true in the input, emits NDJSON events to stdout as queries complete
+(query_result / progress events, then a "final" event with the full result).
 """
 
 import sys
@@ -25,7 +28,7 @@ sys.path.insert(0, services_path)
 # Import the mentions service
 # Note: We import the function directly, not the FastAPI app
 try:
-    from mentions_service import check_mentions, MentionsCheckRequest, CompanyAnalysis
+    from mentions_service import check_mentions, stream_mentions_check, MentionsCheckRequest, CompanyAnalysis
 except ImportError as e:
     logger.error(f"Failed to import mentions_service: {e}")
     logger.error(f"Services path: {services_path}")
@@ -120,6 +123,32 @@ async def run_check(input_data: Dict[str, Any]) -> Dict[str, Any]:
         logger.error(f"Mentions check error: {e}", exc_info=True)
         raise
 
+async def run_check_streaming(input_data: Dict[str, Any]) -> bool:
+    """Run the mentions check, writing each event to stdout as one JSON line.
+    
+    Returns False if the check ended with an error event.
+    """
+    request = convert_to_python_format(input_data)
+    if not request.companyName:
+        raise ValueError("company_name is required")
+    
+    # Set API keys in environment if provided
+    if input_data.get('api_key'):
+        os.environ['OPENROUTER_API_KEY'] = input_data['api_key']
+    if input_data.get('gemini_api_key'):
+        os.environ['GEMINI_API_KEY'] = input_data['gemini_api_key']
+    
+    logger.info(f"Running streaming mentions check for: {request.companyName} (mode: {request.mode})")
+    
+    ok = True
+    async for event in stream_mentions_check(request):
+        if event["type"] == "error":
+            ok = False
+        elif event["type"] == "final":
+            logger.info(f"Mentions check complete: visibility={event['result']['visibility']}%, band={event['result']['band']}")
+        print(json.dumps(event, default=str), flush=True)
+    return ok
+
 def main():
     """Main entry point - reads from stdin, writes to stdout."""
     try:
@@ -132,6 +161,10 @@ def main():
         
         input_data = json.loads(input_json)
         
+        if input_data.get('stream'):
+            ok = asyncio.run(run_check_streaming(input_data))
+            sys.exit(0 if ok else 1)
+        
         # Run async check
         result = asyncio.run(run_check(input_data))
         
@@ -0,0 +1,141 @@
+"""Adaptive (early-stopping) sampling for mentions checks.
+
+Visibility = presence_rate x quality_factor, and the reported band only depends on
+which threshold range visibility falls into. For clearly visible or clearly invisible
+companies the band is settled long before all queries x platforms calls return.
+
+AdaptiveStopper keeps a Wilson score interval on the presence rate (per platform and
+pooled over all responses), maps the pooled interval to a visibility interval using the
+current quality factor, and reports the band as settled once both ends of that interval
+fall into the same band. Budgets (live calls, seconds) stop sampling regardless.
+
+Queries are interleaved across dimensions before sampling so an early stop doesn't
+only see the first dimension's queries.
+"""
+
+import time
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Band is never decided on fewer responses than this
+DEFAULT_MIN_RESPONSES = 12
+
+
+def wilson_interval(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion."""
+    if trials <= 0:
+        return (0.0, 1.0)
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * ((p * (1 - p) / trials + z * z / (4 * trials * trials)) ** 0.5) / denominator
+    return (max(0.0, center - margin), min(1.0, center + margin))
+
+
+def interleave_by_dimension(queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Round-robin queries across dimensions (order within a dimension is kept)."""
+    by_dimension: Dict[str, List[Dict[str, Any]]] = {}
+    for query in queries:
+        by_dimension.setdefault(query.get("dimension", ""), []).append(query)
+    interleaved = []
+    buckets = list(by_dimension.values())
+    for i in range(max((len(b) for b in buckets), default=0)):
+        for bucket in buckets:
+            if i < len(bucket):
+                interleaved.append(bucket[i])
+    return interleaved
+
+
+@dataclass
+class _PlatformCounts:
+    responses: int = 0
+    mentioned: int = 0
+
+
+@dataclass
+class AdaptiveStopper:
+    """Tracks presence per platform and decides when to stop issuing queries."""
+    band_for: Callable[[float], str]
+    confidence: float = 0.95
+    min_responses: int = DEFAULT_MIN_RESPONSES
+    max_calls: Optional[int] = None
+    max_seconds: Optional[float] = None
+    started_at: float = field(default_factory=time.time)
+
+    calls: int = 0  # Live platform calls (count against max_calls)
+    cached_calls: int = 0
+    quality_sum: float = 0.0
+    platforms: Dict[str, _PlatformCounts] = field(default_factory=dict)
+
+    def record(self, platform: str, mentioned: Optional[bool], quality_score: float = 0.0, live: bool = True) -> None:
+        """Record one platform result (mentioned=None for a failed call, live=False for a cache hit)."""
+        if live:
+            self.calls += 1
+        else:
+            self.cached_calls += 1
+        if mentioned is None:
+            return
+        counts = self.platforms.setdefault(platform, _PlatformCounts())
+        counts.responses += 1
+        if mentioned:
+            counts.mentioned += 1
+            self.quality_sum += quality_score
+
+    # ==================== Estimates ====================
+
+    @property
+    def responses(self) -> int:
+        return sum(c.responses for c in self.platforms.values())
+
+    @property
+    def mentioned(self) -> int:
+        return sum(c.mentioned for c in self.platforms.values())
+
+    def quality_factor(self) -> float:
+        # Same formula as the final visibility (0.85 - 1.15)
+        avg_quality = self.quality_sum / self.mentioned if self.mentioned else 0.0
+        return 0.85 + (avg_quality / 10) * 0.30
+
+    def presence_interval(self) -> Tuple[float, float]:
+        return wilson_interval(self.mentioned, self.responses, self.confidence)
+
+    def visibility_interval(self) -> Tuple[float, float]:
+        low, high = self.presence_interval()
+        factor = self.quality_factor()
+        return (
+            min(100.0, round(low * factor * 100, 1)),
+            min(100.0, round(high * factor * 100, 1)),
+        )
+
+    def platform_intervals(self) -> Dict[str, List[float]]:
+        return {
+            platform: [round(v, 3) for v in wilson_interval(c.mentioned, c.responses, self.confidence)]
+            for platform, c in self.platforms.items()
+        }
+
+    # ==================== Stopping ====================
+
+    def band_settled(self) -> bool:
+        if self.responses < self.min_responses:
+            return False
+        low, high = self.visibility_interval()
+        return self.band_for(low) == self.band_for(high)
+
+    def budget_exhausted(self) -> Optional[str]:
+        """Name of the exhausted budget, if any."""
+        if self.max_calls is not None and self.calls >= self.max_calls:
+            return "call_budget"
+        if self.max_seconds is not None and time.time() - self.started_at >= self.max_seconds:
+            return "time_budget"
+        return None
+
+    def stop_reason(self) -> Optional[str]:
+        """Why no further queries should be issued (None = keep sampling)."""
+        budget = self.budget_exhausted()
+        if budget:
+            return budget
+        if self.band_settled():
+            return "band_settled"
+        return None
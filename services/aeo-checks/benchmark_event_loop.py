@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Load test: event-loop responsiveness under heavy health checks
+==============================================================
+
+Starts the health service (uvicorn, one worker) against a local stub website serving
+a multi-MB homepage, keeps N /check requests in flight, and meanwhile pings the
+lightweight /health endpoint. Ping latency is what every other request (mentions,
+company) on that worker would see.
+
+Run once per CPU_POOL_MODE: "inline" (parse + checks on the event loop, the old
+behaviour) vs "process" (cpu_pool.py).
+
+Usage:
+    python benchmark_event_loop.py [--page-mb 3] [--concurrency 8] [--duration 20] [--modes inline,process]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+SERVICE_DIR = Path(__file__).parent
+
+
+def build_page(size_mb: float) -> bytes:
+    """Content-heavy homepage (plenty of words, so no JS-rendering fallback)."""
+    block = (
+        '<div class="card"><h2>Section {i}</h2><p>Our logistics platform helps retailers plan '
+        'routes, track shipments and reduce delivery costs across Europe.</p>'
+        '<a href="/page-{i}">Read more</a><img src="/img/{i}.png" alt="Shipment {i}"></div>\n'
+    )
+    parts = [
+        '<!DOCTYPE html><html><head><title>Acme Logistics - Delivery software</title>'
+        '<meta name="description" content="Route planning and shipment tracking">'
+        '<script type="application/ld+json">{"@context": "https://schema.org", "@type": "Organization", '
+        '"name": "Acme Logistics", "url": "https://acme.example"}</script></head><body><h1>Acme Logistics</h1>\n'
+    ]
+    size, i = 0, 0
+    while size < size_mb * 1024 * 1024:
+        chunk = block.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append("</body></html>")
+    return "".join(parts).encode()
+
+
+def start_stub_site(page: bytes):
+    files = {
+        "/": (page, "text/html; charset=utf-8"),
+        "/robots.txt": (b"User-agent: *\nAllow: /\n", "text/plain"),
+        "/sitemap.xml": (b'<?xml version="1.0"?><urlset></urlset>', "application/xml"),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body, content_type = files.get(self.path.split("?")[0], (b"not found", "text/plain"))
+            self.send_response(200 if self.path.split("?")[0] in files else 404)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_service(mode: str, port: int) -> subprocess.Popen:
+    env = {**os.environ, "CPU_POOL_MODE": mode}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "health_service:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))] if ordered else 0.0
+
+
+async def run_load(base: str, site_url: str, concurrency: int, duration: float, ping_interval: float):
+    pings, checks, failures = [], [], 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base, timeout=120) as client:
+        # Warm-up: worker processes, imports, first parse
+        await client.post("/check", json={"url": site_url})
+
+        async def heavy():
+            nonlocal failures
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/check", json={"url": site_url})
+                if response.status_code == 200:
+                    checks.append((time.perf_counter() - start) * 1000)
+                else:
+                    failures += 1
+
+        async def pinger():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/health")
+                pings.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(ping_interval)
+
+        await asyncio.gather(pinger(), *[heavy() for _ in range(concurrency)])
+    return pings, checks, failures
+
+
+async def wait_ready(base: str, timeout: float = 60.0):
+    async with httpx.AsyncClient(base_url=base, timeout=2) as client:
+        end = time.time() + timeout
+        while time.time() < end:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.3)
+    raise RuntimeError("health service did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/health latency under concurrent heavy /check requests")
+    parser.add_argument("--page-mb", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=8, help="Heavy /check requests in flight")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per mode")
+    parser.add_argument("--ping-interval-ms", type=float, default=20.0)
+    parser.add_argument("--modes", default="inline,process")
+    args = parser.parse_args()
+
+    page = build_page(args.page_mb)
+    site, site_url = start_stub_site(page)
+    print(f"🧪 {args.concurrency} concurrent /check on a {len(page) / 1e6:.1f}MB page, pinging /health "
+          f"every {args.ping_interval_ms:.0f}ms for {args.duration:.0f}s")
+
+    for mode in args.modes.split(","):
+        port = free_port()
+        service = start_service(mode, port)
+        base = f"http://127.0.0.1:{port}"
+        try:
+            asyncio.run(wait_ready(base))
+            pings, checks, failures = asyncio.run(
+                run_load(base, site_url, args.concurrency, args.duration, args.ping_interval_ms / 1000)
+            )
+        finally:
+            service.terminate()
+            service.wait()
+        print(
+            f"   {mode:<8} /health p50 {percentile(pings, 0.5):7.1f}ms  p99 {percentile(pings, 0.99):7.1f}ms  "
+            f"max {max(pings):7.1f}ms  ({len(pings)} pings) | /check {len(checks)} done "
+            f"({len(checks) / args.duration:.2f}/s, p50 {percentile(checks, 0.5):.0f}ms, {failures} failed)"
+        )
+
+    site.shutdown()
+
+
+if __name__ == "__main__":
+    main()
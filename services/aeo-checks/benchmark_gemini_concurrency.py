@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark: concurrent Gemini mentions queries on the async client vs. the old blocking call.
+
+Replaces the genai client with a stub that takes a fixed latency per call, so no API key
+or network is needed. With client.aio, N concurrent queries should finish in ~max(latency);
+the old blocking client.models.generate_content pattern takes ~sum(latency).
+
+Usage:
+    python benchmark_gemini_concurrency.py [num_queries] [latency_seconds]
+"""
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gemini_client import GeminiCompanyAnalysisClient
+
+logging.getLogger("gemini_client").setLevel(logging.WARNING)
+
+
+class _StubAsyncModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def generate_content(self, model, contents, config=None):
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text=f"Stub answer mentioning Acme for: {contents[:40]}")
+
+
+class _StubBlockingModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, model, contents, config=None):
+        time.sleep(self.latency)  # Blocks the event loop, like the old sync SDK call
+        return SimpleNamespace(text=f"Stub answer mentioning Acme for: {contents[:40]}")
+
+
+async def run_async_client(num_queries: int, latency: float) -> float:
+    """N concurrent queries through GeminiCompanyAnalysisClient (client.aio path)."""
+    client = GeminiCompanyAnalysisClient(api_key="benchmark")
+    client.client = SimpleNamespace(aio=SimpleNamespace(models=_StubAsyncModels(latency)))
+
+    start = time.time()
+    results = await asyncio.gather(*[
+        client.query_mentions_with_search_grounding(f"best tools query {i}", "Acme")
+        for i in range(num_queries)
+    ])
+    elapsed = time.time() - start
+    assert all(r["success"] for r in results), "stub queries should all succeed"
+    return elapsed
+
+
+async def run_blocking_client(num_queries: int, latency: float) -> float:
+    """N concurrent queries using a blocking generate_content inside async def (old behaviour)."""
+    models = _StubBlockingModels(latency)
+
+    async def blocking_query(i: int):
+        return models.generate_content(model="gemini-2.5-flash", contents=f"best tools query {i}")
+
+    start = time.time()
+    await asyncio.gather(*[blocking_query(i) for i in range(num_queries)])
+    return time.time() - start
+
+
+async def main():
+    num_queries = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+
+    print(f"🧪 {num_queries} concurrent Gemini mentions queries, {latency:.2f}s stub latency each")
+    print()
+
+    blocking = await run_blocking_client(num_queries, latency)
+    print(f"⏱️  Blocking client (old): {blocking:.2f}s  (~sum = {num_queries * latency:.2f}s)")
+
+    non_blocking = await run_async_client(num_queries, latency)
+    print(f"⚡ Async client (new):    {non_blocking:.2f}s  (~max = {latency:.2f}s)")
+
+    print()
+    print(f"🎯 Speedup: {blocking / non_blocking:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Benchmark: pipelined logo detection vs. the old sequential candidate loop.
+
+Serves a local fixture site (one page, N distinct PNG candidates, per-image latency)
+and stubs the GPT-4o-mini vision call with a fixed latency, so no API key or network
+is needed. Clearbit is skipped.
+
+The sequential baseline runs crawl_for_logos with fetch/vision concurrency 1 and early
+stopping disabled, which is the old one-image-at-a-time loop.
+
+Usage:
+    python benchmark_logo_detection.py [num_images] [image_latency] [vision_latency]
+"""
+import asyncio
+import io
+import logging
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import logo_detector
+from logo_detector import LogoResult, crawl_for_logos
+
+logging.getLogger("logo_detector").setLevel(logging.WARNING)
+
+
+def build_fixture_site(num_images: int) -> dict:
+    """Page + distinct PNGs. The real logo sits in the header, in the middle of the list."""
+    files = {}
+    body_imgs = []
+    for i in range(num_images):
+        image = Image.new("RGB", (200, 120), ((i * 37) % 255, (i * 91) % 255, (i * 53) % 255))
+        buffered = io.BytesIO()
+        image.save(buffered, format="PNG")
+        files[f"/img/photo-{i}.png"] = buffered.getvalue()
+        body_imgs.append(f'<img src="/img/photo-{i}.png">')
+
+    logo = Image.new("RGB", (240, 80), (10, 20, 30))
+    buffered = io.BytesIO()
+    logo.save(buffered, format="PNG")
+    files["/img/acme-logo.png"] = buffered.getvalue()
+
+    half = len(body_imgs) // 2
+    html = (
+        "<html><head><title>Acme</title></head><body>"
+        + "".join(body_imgs[:half])
+        + '<header><img src="/img/acme-logo.png" alt="Acme"></header>'
+        + "".join(body_imgs[half:])
+        + "</body></html>"
+    )
+    files["/"] = html.encode("utf-8")
+    return files
+
+
+def start_fixture_server(files: dict, image_latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            content = files.get(self.path)
+            if content is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            if self.path != "/":
+                time.sleep(image_latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html" if self.path == "/" else "image/png")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def install_stubs(vision_latency: float):
+    async def no_clearbit(domain, page_url):
+        return None
+
+    async def stub_vision(client, image_base64, image_url, page_url):
+        await asyncio.sleep(vision_latency)
+        if "logo" in image_url:
+            return LogoResult(url=image_url, confidence=0.95, description="Acme wordmark",
+                              page_url=page_url, image_hash="")
+        return None
+
+    logo_detector.try_clearbit_logo = no_clearbit
+    logo_detector.analyze_image_with_openai = stub_vision
+
+
+async def run(url: str, max_images: int, **kwargs) -> tuple:
+    start = time.time()
+    result = await crawl_for_logos(url, max_images=max_images, **kwargs)
+    return time.time() - start, result
+
+
+async def main():
+    num_images = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    image_latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    vision_latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.4
+
+    server = start_fixture_server(build_fixture_site(num_images), image_latency)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    install_stubs(vision_latency)
+
+    print(f"🧪 Fixture site: {num_images} images + 1 header logo, "
+          f"{image_latency:.2f}s per image fetch, {vision_latency:.2f}s per vision call")
+    print()
+
+    sequential, seq_result = await run(
+        url, num_images + 1,
+        fetch_concurrency=1, vision_concurrency=1, early_stop_confidence=1.1,
+    )
+    print(f"⏱️  Sequential (old):  {sequential:.2f}s  "
+          f"analyzed={seq_result.images_analyzed} best={seq_result.best_logo.url if seq_result.best_logo else None}")
+
+    no_stop, no_stop_result = await run(url, num_images + 1, early_stop_confidence=1.1)
+    print(f"⚡ Pipelined:         {no_stop:.2f}s  "
+          f"analyzed={no_stop_result.images_analyzed} best={no_stop_result.best_logo.url if no_stop_result.best_logo else None}")
+
+    pipelined, pipe_result = await run(url, num_images + 1)
+    print(f"🏁 Pipelined + early stop: {pipelined:.2f}s  "
+          f"analyzed={pipe_result.images_analyzed} best={pipe_result.best_logo.url if pipe_result.best_logo else None}")
+
+    server.shutdown()
+
+    assert seq_result.best_logo and pipe_result.best_logo
+    assert seq_result.best_logo.url == pipe_result.best_logo.url == no_stop_result.best_logo.url
+
+    print()
+    print(f"🎯 Speedup: {sequential / no_stop:.1f}x pipelined, {sequential / pipelined:.1f}x with early stop")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: MentionScorer vs. the old count_mentions / extract_competitor_mentions.
+
+Scores a large synthetic corpus of AI-style responses (markdown lists, long paragraphs,
+competitor names, no-mention responses) and checks that the compiled scorer returns
+exactly what the old per-response regex implementation returned.
+
+Usage:
+    python benchmark_mention_scoring.py [num_responses] [response_kb]
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import mention_scorer
+from mention_scorer import MentionScorer
+
+COMPANY = "Acme Analytics"
+COMPETITORS = [{"name": n} for n in (
+    "Globex", "Initech", "Umbrella Insights", "Hooli", "Stark Data", "Wayne Metrics",
+    "Soylent Cloud", "Vandelay", "Tyrell Labs", "Cyberdyne", "Wonka Data", "Gringotts BI",
+)]
+RUNS = 3
+
+
+# ==================== Old implementation (baseline) ====================
+
+def legacy_detect_mention_type(text, company_name):
+    text_lower = text.lower()
+    company_lower = company_name.lower()
+    for pattern in [f"recommend {company_lower}", f"{company_lower} is the best", f"best.*{company_lower}",
+                    f"{company_lower}.*excellent", f"top choice.*{company_lower}"]:
+        if re.search(pattern, text_lower):
+            return 'primary_recommendation'
+    for pattern in [f"(top|leading|best).*{company_lower}", f"{company_lower}.*(top|leading|best)",
+                    f"among.*{company_lower}", f"{company_lower}.*among.*the"]:
+        if re.search(pattern, text_lower):
+            return 'top_option'
+    if re.search(f"\\d+\\.|\\*.*{company_lower}", text):
+        return 'listed_option'
+    if company_lower in text_lower:
+        return 'mentioned_in_context'
+    return 'none'
+
+
+def legacy_detect_list_position(text, company_name):
+    for i, line in enumerate(text.split('\n')):
+        if re.search(re.escape(company_name), line, re.IGNORECASE):
+            match = re.match(r'^\s*([\d]+)[\.)\s]', line)
+            if match:
+                return int(match.group(1))
+            if re.match(r'^\s*[\*\-\•]', line):
+                return i + 1
+    return None
+
+
+def legacy_count_mentions(text, company_name):
+    raw_mentions = len(re.findall(re.escape(company_name), text, re.IGNORECASE))
+    if raw_mentions == 0:
+        return {'raw_mentions': 0, 'capped_mentions': 0, 'quality_score': 0.0, 'mention_type': 'none', 'position': None}
+    capped_mentions = min(raw_mentions, 3)
+    mention_type = legacy_detect_mention_type(text, company_name)
+    position = legacy_detect_list_position(text, company_name)
+    base_score = mention_scorer.BASE_SCORES.get(mention_type, 3.0)
+    position_bonus = 0.0
+    if position:
+        if position == 1:
+            position_bonus = 2.0
+        elif position <= 3:
+            position_bonus = 1.0
+        elif position <= 5:
+            position_bonus = 0.5
+    mention_bonus = min(1.0, (capped_mentions - 1) * 0.5)
+    quality_score = min(10.0, base_score + position_bonus + mention_bonus)
+    return {'raw_mentions': raw_mentions, 'capped_mentions': capped_mentions,
+            'quality_score': round(quality_score, 2), 'mention_type': mention_type, 'position': position}
+
+
+def legacy_extract_competitor_mentions(text, competitors):
+    results = []
+    for comp in competitors:
+        name = comp.get("name", "")
+        if name:
+            count = len(re.findall(re.escape(name), text, re.IGNORECASE))
+            if count > 0:
+                results.append({"name": name, "count": count})
+    return results
+
+
+# ==================== Corpus ====================
+
+def synthetic_corpus(num_responses: int, response_kb: int):
+    """AI-style answers: intro paragraphs, numbered/bulleted vendor lists, long explanations."""
+    random.seed(7)
+    words = ("data platform teams reporting pipeline warehouse dashboards pricing integration "
+             "support enterprise startups analytics the a of for with and scale").split()
+    phrases = ["is a strong option", "offers excellent support", "is among the leaders",
+               "is popular with startups", "ranks as a top choice", "is worth evaluating"]
+    vendors = [COMPANY, COMPANY.upper(), COMPANY.lower()] + [c["name"] for c in COMPETITORS]
+
+    corpus = []
+    for n in range(num_responses):
+        lines = []
+        size = 0
+        include_company = n % 3 != 0  # a third of responses never mention the company
+        while size < response_kb * 1024:
+            kind = random.random()
+            if kind < 0.55:
+                line = " ".join(random.choices(words, k=random.randint(40, 160))) + "."
+            elif kind < 0.8:
+                vendor = random.choice(vendors if include_company else vendors[3:])
+                marker = random.choice([f"{random.randint(1, 9)}. ", "* ", "- ", "", "   "])
+                line = f"{marker}**{vendor}** {random.choice(phrases)} " + " ".join(random.choices(words, k=30))
+            else:
+                vendor = random.choice(vendors if include_company else vendors[3:])
+                line = f"Many teams compare {vendor} with " + " ".join(random.choices(words, k=60))
+            lines.append(line)
+            size += len(line) + 1
+        if include_company and n % 5 == 0:
+            lines.append(f"Overall I would recommend {COMPANY.lower()} for most teams.")
+        corpus.append("\n".join(lines))
+    return corpus
+
+
+def time_it(fn):
+    best = float("inf")
+    result = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    num_responses = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    response_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    corpus = synthetic_corpus(num_responses, response_kb)
+    total_mb = sum(len(t) for t in corpus) / 1e6
+
+    print(f"🧪 {num_responses} responses x ~{response_kb}KB ({total_mb:.1f} MB), {len(COMPETITORS)} competitors, "
+          f"Aho-Corasick: {'yes' if mention_scorer.AHOCORASICK_AVAILABLE else 'no (substring fallback)'}")
+
+    def legacy():
+        return [(legacy_count_mentions(t, COMPANY), legacy_extract_competitor_mentions(t, COMPETITORS)) for t in corpus]
+
+    def compiled():
+        scorer = MentionScorer(COMPANY, competitors=COMPETITORS)
+        results = []
+        for score in scorer.score_many(corpus):
+            counts = score.to_dict()
+            competitors = counts.pop("competitor_mentions")
+            results.append((counts, competitors))
+        return results
+
+    old_time, old_result = time_it(legacy)
+    new_time, new_result = time_it(compiled)
+    for i, (old, new) in enumerate(zip(old_result, new_result)):
+        assert old == new, f"response {i}: results differ\nold={old}\nnew={new}"
+
+    types = {}
+    for counts, _ in new_result:
+        types[counts["mention_type"]] = types.get(counts["mention_type"], 0) + 1
+    print(f"   ⏱️  per-response regexes: {old_time * 1000:8.1f} ms")
+    print(f"   ⚡ MentionScorer:         {new_time * 1000:8.1f} ms  ({old_time / new_time:.1f}x)")
+    print(f"   ✅ identical results for all {len(corpus)} responses: {types}")
+
+
+if __name__ == "__main__":
+    main()
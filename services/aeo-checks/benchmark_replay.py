@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""Offline benchmark: mentions checks, company analysis and raw clients on replayed calls.
+
+All Gemini / OpenRouter / DataForSEO calls are served by replay_harness from a recorded
+trace (or a small synthetic trace) with injected latency, 5xx errors and 429 bursts,
+so throughput and tail latency can be compared between commits without API keys.
+
+Usage:
+    python benchmark_replay.py                                   # synthetic trace, default profiles
+    python benchmark_replay.py --trace trace.jsonl --seed 3
+    python benchmark_replay.py --gemini "p50=2500,p99=9000,burst=0.02x6" --time-scale 0.05
+    python benchmark_replay.py --record trace.jsonl --runs 2     # live calls (needs API keys)
+
+Suites: mentions (check_mentions), analysis (_analyze_internal_gemini_native),
+gemini, openrouter, dataforseo (single client calls).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from replay_harness import (
+    LatencyProfile, Trace, TraceRecord, recording, replaying, route_for, percentile,
+)
+
+SUITES = ("mentions", "analysis", "gemini", "openrouter", "dataforseo")
+
+COMPANY = "Acme Analytics"
+COMPANY_ANALYSIS = {
+    "companyInfo": {
+        "industry": "Business Intelligence",
+        "products": ["Acme Dashboards", "Acme Pipelines"],
+        "services": ["Data consulting"],
+        "target_audience": ["Data teams"],
+    },
+    "competitors": [{"name": "Globex"}, {"name": "Initech"}, {"name": "Hooli"}],
+}
+
+
+# ==================== Synthetic trace ====================
+
+def _gemini_response(text: str) -> Dict:
+    return {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finish_reason": "STOP"}],
+        "usage_metadata": {"prompt_token_count": 600, "candidates_token_count": 400, "total_token_count": 1000},
+    }
+
+
+def _chat_completion(content: str = None, tool_query: str = None) -> Dict:
+    message = {"role": "assistant", "content": content}
+    if tool_query:
+        message["tool_calls"] = [{
+            "id": "call_0", "type": "function",
+            "function": {"name": "google_search", "arguments": json.dumps({"query": tool_query})},
+        }]
+    return {
+        "id": "gen-replay", "object": "chat.completion", "created": 0, "model": "replay",
+        "choices": [{"index": 0, "finish_reason": "tool_calls" if tool_query else "stop", "message": message}],
+        "usage": {"prompt_tokens": 700, "completion_tokens": 350, "total_tokens": 1050},
+    }
+
+
+def synthetic_trace() -> Trace:
+    """A few plausible responses per route; every request falls back to its route pool."""
+    answers = [
+        f"The leading BI tools are:\n1. **{COMPANY}** - excellent dashboards\n2. Globex\n3. Initech",
+        f"Popular options include Globex, Hooli and {COMPANY}, which is among the best for startups.",
+        "Most teams pick Globex or Initech for reporting.",
+        f"I would recommend {COMPANY} for most teams; Hooli is a cheaper alternative.",
+    ]
+    queries = [{"query": f"best business intelligence tool {i}", "dimension": d}
+               for i, d in enumerate(["Branded", "Industry", "Service", "Competitive", "Problem"] * 10)]
+    analysis = {
+        "company_info": {"description": "BI platform", "industry": "Business Intelligence",
+                         "target_audience": ["Data teams"], "products": ["Acme Dashboards"]},
+        "competitors": [{"name": "Globex", "strengths": ["Scale"]}],
+        "insights": [], "legal_info": {"headquarters": {"city": "Berlin", "country": "DE"}},
+        "brand_assets": {"colors": [{"hex": "#112233"}]}, "website_tech": {"cms": "WordPress"},
+    }
+
+    def record(service: str, route: str, response: Dict, i: int) -> TraceRecord:
+        return TraceRecord(service=service, key=f"synthetic-{route}-{i}", route=route, request="synthetic",
+                           response=response, latency_ms=1000.0)
+
+    gemini_json = route_for("gemini", {"model": "gemini-2.5-flash", "config": {"response_mime_type": "application/json"}})
+    gemini_search = route_for("gemini", {"model": "gemini-2.5-flash", "config": {"tools": [{"google_search": {}}]}})
+    gemini_analysis = route_for("gemini", {"model": "gemini-3-pro-preview", "config": {
+        "tools": [{"google_search": {}}, {"url_context": {}}], "response_mime_type": "application/json"}})
+
+    records = [record("gemini", gemini_json, _gemini_response(json.dumps(queries)), 0)]
+    records += [record("gemini", gemini_search, _gemini_response(a), i) for i, a in enumerate(answers)]
+    records.append(record("gemini", gemini_analysis, _gemini_response(json.dumps(analysis)), 0))
+    # One in five OpenRouter turns asks for a search, exercising the tool loop and DataForSEO
+    records += [record("openrouter", "synthetic", _chat_completion(a), i) for i, a in enumerate(answers)]
+    records.append(record("openrouter", "synthetic", _chat_completion(tool_query="best bi tools 2025"), len(answers)))
+    records.append(record("dataforseo", "dataforseo", {
+        "success": True, "query": "best bi tools", "provider": "dataforseo", "total_results": 3,
+        "results": [{"position": i + 1, "title": f"Top BI tools #{i + 1}", "link": f"https://example.com/{i}",
+                     "snippet": f"{COMPANY}, Globex and Initech compared."} for i in range(3)],
+    }, 0))
+    return Trace(records)
+
+
+# ==================== Suites ====================
+
+async def _run_ops(op: Callable[[int], Awaitable], runs: int, concurrency: int) -> Dict:
+    """Run op(i) runs times with bounded concurrency; per-op latencies and failures."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one(i: int):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await op(i)
+            except Exception:
+                failures += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(runs)])
+    wall = time.perf_counter() - start
+    return {"ops": runs, "failed": failures, "wall_s": wall, "latencies_ms": latencies}
+
+
+def build_suites(num_queries: int) -> Dict[str, Callable[[int], Awaitable]]:
+    suites: Dict[str, Callable[[int], Awaitable]] = {}
+
+    import mentions_service
+    request = mentions_service.MentionsCheckRequest(
+        companyName=COMPANY, companyAnalysis=COMPANY_ANALYSIS, numQueries=num_queries,
+        mode="full", cache_policy="bypass", archive=False,
+    )
+    suites["mentions"] = lambda i: mentions_service.check_mentions(request)
+
+    try:
+        import company_service
+        analysis_request = company_service.CompanyAnalysisRequest(
+            website_url="https://acme.example", company_name=COMPANY, extract_logo=False,
+        )
+        suites["analysis"] = lambda i: company_service._analyze_internal_gemini_native(analysis_request, "acme.example")
+    except ImportError as e:
+        print(f"⚠️  analysis suite skipped (company_service not importable: {e})")
+
+    from gemini_client import GeminiCompanyAnalysisClient
+    from openrouter_client import OpenRouterClient
+    from serp_dataforseo import DataForSeoProvider
+
+    async def gemini_op(i: int):
+        result = await GeminiCompanyAnalysisClient().query_mentions_with_search_grounding(f"best bi tool {i}", COMPANY)
+        if not result.get("success"):
+            raise RuntimeError(result.get("error"))
+
+    async def openrouter_op(i: int):
+        await OpenRouterClient().complete_with_tools(
+            [{"role": "user", "content": f"What are the best BI tools? ({i})"}],
+            model="openai/gpt-4.1", tools=["google_search"],
+        )
+
+    async def dataforseo_op(i: int):
+        provider = DataForSeoProvider(os.environ["DATAFORSEO_LOGIN"], os.environ["DATAFORSEO_PASSWORD"], use_cache=False)
+        result = await provider.search(f"best bi tools {i}")
+        if not result.success:
+            raise RuntimeError(result.error)
+
+    suites["gemini"] = gemini_op
+    suites["openrouter"] = openrouter_op
+    suites["dataforseo"] = dataforseo_op
+    return suites
+
+
+def print_row(name: str, result: Dict, time_scale: float) -> None:
+    lat = result["latencies_ms"]
+    ops_per_s = result["ops"] / result["wall_s"] if result["wall_s"] else 0.0
+    print(
+        f"   {name:<11} {result['ops']:>5} ops  {result['failed']:>4} failed  "
+        f"{result['wall_s']:7.2f}s  {ops_per_s * time_scale:8.3f} ops/s*  "
+        f"p50 {percentile(lat, 0.5) / time_scale:8.0f}  p95 {percentile(lat, 0.95) / time_scale:8.0f}  "
+        f"p99 {percentile(lat, 0.99) / time_scale:8.0f} ms*"
+    )
+
+
+async def run(args, suites: Dict[str, Callable[[int], Awaitable]]) -> None:
+    selected = [s for s in (args.only.split(",") if args.only else SUITES) if s in suites]
+    for name in selected:
+        try:
+            await suites[name](-1)  # warm-up (lazy imports, client construction)
+        except Exception:
+            pass
+        result = await _run_ops(suites[name], args.runs, args.concurrency)
+        print_row(name, result, args.time_scale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay-based benchmark for AI platform / SERP callers")
+    parser.add_argument("--trace", help="Recorded JSONL trace (default: synthetic)")
+    parser.add_argument("--record", metavar="PATH", help="Run live (needs API keys) and record a trace")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--strict", action="store_true", help="Fail on requests missing from the trace")
+    parser.add_argument("--time-scale", type=float, default=0.1, help="Multiply injected sleeps; results are rescaled (CPU time is inflated by 1/scale)")
+    parser.add_argument("--runs", type=int, default=20, help="Operations per suite")
+    parser.add_argument("--concurrency", type=int, default=5, help="Concurrent operations per suite")
+    parser.add_argument("--queries", type=int, default=10, help="Queries per mentions check")
+    parser.add_argument("--only", help=f"Comma-separated suites ({', '.join(SUITES)})")
+    for service in ("gemini", "openrouter", "dataforseo"):
+        parser.add_argument(f"--{service}", metavar="SPEC", help='Latency profile, e.g. "p50=800,p99=4000,errors=0.01,burst=0.02x6"')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+    # No disk caches/archives: every run must reach the (replayed) clients
+    for name in ("MENTIONS_CACHE_DB", "SERP_CACHE_DB", "MENTIONS_ARCHIVE_DIR"):
+        os.environ[name] = ""
+
+    if args.record:
+        args.time_scale = 1.0
+        suites = build_suites(args.queries)
+        with recording(args.record):
+            asyncio.run(run(args, suites))
+        print(f"📼 Trace written to {args.record}")
+        return
+
+    for name in ("GEMINI_API_KEY", "OPENROUTER_API_KEY", "DATAFORSEO_LOGIN", "DATAFORSEO_PASSWORD"):
+        os.environ.setdefault(name, "replay")
+    trace = Trace.load(args.trace) if args.trace else synthetic_trace()
+    profiles = {
+        service: LatencyProfile.parse(getattr(args, service))
+        for service in ("gemini", "openrouter", "dataforseo") if getattr(args, service)
+    }
+    suites = build_suites(args.queries)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"🧪 Replay benchmark: {'trace ' + args.trace if args.trace else 'synthetic trace'} "
+          f"({len(trace.records)} records), seed {args.seed}, {args.runs} ops/suite x{args.concurrency} concurrent, "
+          f"time scale {args.time_scale}")
+    print("   (* rescaled to nominal latency)")
+    with replaying(trace, profiles, seed=args.seed, strict=args.strict, time_scale=args.time_scale) as replayer:
+        asyncio.run(run(args, suites))
+
+    print()
+    print("   Injected per service (nominal):")
+    for service, stats in replayer.summary().items():
+        print(f"   {service:<11} {stats['calls']:>5} calls  {stats['errors']:>4} 5xx  {stats['rate_limited']:>4} 429  "
+              f"{stats['inexact']:>5} route-served  p50 {stats['p50_ms']:8.0f}  p95 {stats['p95_ms']:8.0f}  p99 {stats['p99_ms']:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
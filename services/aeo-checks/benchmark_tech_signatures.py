@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: signature engine vs. the old per-pattern re.search loop.
+
+Runs detect_cms + detect_tech_stack + extract_social_links on large HTML fixtures and
+checks that the engine returns exactly what the old implementation returned.
+
+Fixtures: pass saved pages (e.g. `curl -s https://www.shopify.com > shopify.html`) as
+arguments. Without arguments a ~3MB synthetic page (SPA bundle, inline JSON, third-party
+tags) is generated.
+
+Usage:
+    python benchmark_tech_signatures.py [page.html ...]
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import signature_engine
+import tech_detector
+from tech_detector import (
+    CMS_SIGNATURES, FRAMEWORK_SIGNATURES, ANALYTICS_SIGNATURES, MARKETING_SIGNATURES,
+    PAYMENT_SIGNATURES, COOKIE_CONSENT_SIGNATURES, SOCIAL_PATTERNS, SOCIAL_EXCLUDES,
+)
+
+RUNS = 3
+
+
+# ==================== Old implementation (baseline) ====================
+
+def legacy_detect_cms(html):
+    for cms, signatures in CMS_SIGNATURES.items():
+        for pattern, description in signatures:
+            if re.search(pattern, html, re.IGNORECASE):
+                return (cms, f"detected via {description}")
+    return (None, None)
+
+
+def legacy_detect_tech_stack(html):
+    result = {"frameworks": [], "analytics": [], "marketing": [], "payments": [], "cookie_consent": None}
+    for key, sigs in (("frameworks", FRAMEWORK_SIGNATURES), ("analytics", ANALYTICS_SIGNATURES),
+                      ("marketing", MARKETING_SIGNATURES), ("payments", PAYMENT_SIGNATURES)):
+        for tech, signatures in sigs.items():
+            for pattern, _ in signatures:
+                if re.search(pattern, html, re.IGNORECASE):
+                    if tech not in result[key]:
+                        result[key].append(tech)
+                    break
+    for tech, signatures in COOKIE_CONSENT_SIGNATURES.items():
+        for pattern, _ in signatures:
+            if re.search(pattern, html, re.IGNORECASE):
+                result["cookie_consent"] = tech
+                break
+        if result["cookie_consent"]:
+            break
+    return result
+
+
+def legacy_extract_social_links(html):
+    social_links = {}
+    for platform, patterns in SOCIAL_PATTERNS.items():
+        for pattern in patterns:
+            for match in re.findall(pattern, html, re.IGNORECASE):
+                if match.lower() in SOCIAL_EXCLUDES.get(platform, []) or match.lower() in ["", "/", "#"]:
+                    continue
+                if platform == "twitter" and "x.com" in pattern:
+                    url = f"https://x.com/{match}"
+                elif platform == "twitter":
+                    url = f"https://twitter.com/{match}"
+                elif platform == "linkedin":
+                    url = f"https://linkedin.com/company/{match}" if "/company/" in pattern else f"https://linkedin.com/in/{match}"
+                elif platform == "youtube":
+                    if match.startswith("@") or "channel/" in pattern or "c/" in pattern:
+                        url = f"https://youtube.com/@{match.lstrip('@')}"
+                    else:
+                        url = f"https://youtube.com/{match}"
+                else:
+                    url = f"https://{platform}.com/{match}"
+                if platform not in social_links:
+                    social_links[platform] = url
+                    break
+    return social_links
+
+
+# ==================== Fixtures ====================
+
+def synthetic_page(target_bytes: int = 3_000_000) -> str:
+    """Large SPA-like page: hashed class names, inline JSON state, third-party tags."""
+    random.seed(42)
+    words = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt".split()
+    parts = [
+        '<!DOCTYPE html><html lang="en"><head><title>Acme</title>',
+        '<script src="https://www.googletagmanager.com/gtag/js?id=G-1"></script>',
+        '<script src="https://js.hs-scripts.com/123.js"></script>',
+        '<script src="https://cdn.cookielaw.org/scripttemplates/otSDKStub.js"></script>',
+        '</head><body><div id="__next">',
+    ]
+    size = sum(len(p) for p in parts)
+    i = 0
+    while size < target_bytes:
+        chunk = (
+            f'<div class="css-{random.getrandbits(32):08x} card"><a href="/p/{i}">'
+            f'{" ".join(random.choices(words, k=14))}</a><img src="/img/{i}.webp" alt=""></div>'
+        )
+        if i % 500 == 0:
+            chunk += '<script>window.__STATE__=' + '{"k":"' + "x" * 2000 + '"}</script>'
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append(
+        '<footer><a href="https://www.linkedin.com/company/acme">LinkedIn</a>'
+        '<a href="https://x.com/acme">X</a><a href="https://github.com/acme">GitHub</a></footer>'
+        '<script id="__NEXT_DATA__" type="application/json">{}</script>'
+        '<script src="https://js.stripe.com/v3"></script></div></body></html>'
+    )
+    return "".join(parts)
+
+
+def time_it(fn, html):
+    best = float("inf")
+    result = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    fixtures = [(path, Path(path).read_text(encoding="utf-8", errors="ignore")) for path in sys.argv[1:]]
+    if not fixtures:
+        fixtures = [("synthetic-3MB", synthetic_page())]
+
+    print(f"🧪 {tech_detector._signature_engine.size} signatures, "
+          f"Aho-Corasick: {'yes' if signature_engine.AHOCORASICK_AVAILABLE else 'no (substring fallback)'}")
+    print()
+
+    def legacy(html):
+        return legacy_detect_cms(html), legacy_detect_tech_stack(html), legacy_extract_social_links(html)
+
+    def engine(html):
+        hits = tech_detector.scan_signatures(html)
+        return (
+            tech_detector.detect_cms(html, hits=hits),
+            tech_detector.detect_tech_stack(html, hits=hits),
+            tech_detector.extract_social_links(html),
+        )
+
+    for name, html in fixtures:
+        old_time, old_result = time_it(legacy, html)
+        new_time, new_result = time_it(engine, html)
+        assert old_result == new_result, f"{name}: results differ\nold={old_result}\nnew={new_result}"
+        print(f"📄 {name} ({len(html) / 1e6:.2f} MB)")
+        print(f"   ⏱️  per-pattern re.search: {old_time * 1000:8.1f} ms")
+        print(f"   ⚡ signature engine:      {new_time * 1000:8.1f} ms  ({old_time / new_time:.1f}x)")
+        print(f"   ✅ identical results: cms={new_result[0][0]} frameworks={new_result[1]['frameworks']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Shared Chromium browser pool for Playwright fetches.
+
+One Playwright driver and N long-lived Chromium browsers per process, shared by
+fetcher.fetch_with_playwright and openpull.FlexibleScraper:
+- Each fetch gets a fresh browser context (and page), closed on exit, so cookies
+  and localStorage never carry over between sites or companies
+- A semaphore bounds concurrent pages across the whole pool
+- Browsers are restarted after they crash/disconnect or after serving K pages
+- Optional request interception aborts images/fonts/media when only HTML/text is needed
+
+Config (env):
+- BROWSER_POOL_SIZE - number of browsers (default 2)
+- BROWSER_POOL_MAX_PAGES - max concurrent pages across the pool (default 6)
+- BROWSER_POOL_RECYCLE_AFTER - restart a browser after this many pages (default 100)
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Resource types aborted when block_resources=True
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+DEFAULT_LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+async def _block_heavy_resources(route) -> None:
+    """Route handler: abort images/fonts/media, continue everything else."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _BrowserSlot:
+    """One pooled browser plus the contexts currently open on it."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser = None
+        self.contexts: Set[Any] = set()
+        self.active_pages = 0
+        self.pages_served = 0
+        self.launches = 0
+        self.recycle_pending = False
+        self.lock = asyncio.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+
+class BrowserPool:
+    """Process-wide pool of long-lived Chromium browsers."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 6,
+        recycle_after: int = 100,
+        launch_args: Optional[List[str]] = None,
+    ):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.recycle_after = max(1, recycle_after)
+        self.launch_args = launch_args or DEFAULT_LAUNCH_ARGS
+
+        self._playwright = None
+        self._start_lock = asyncio.Lock()
+        self._page_semaphore = asyncio.Semaphore(self.max_pages)
+        self._slots = [_BrowserSlot(i) for i in range(self.size)]
+
+        # Stats
+        self.pages_opened = 0
+        self.crashes = 0
+        self.recycles = 0
+
+    async def _ensure_playwright(self):
+        if self._playwright is None:
+            async with self._start_lock:
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+                    self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def _close_slot(self, slot: _BrowserSlot) -> None:
+        browser, slot.browser = slot.browser, None
+        slot.contexts = set()
+        slot.pages_served = 0
+        slot.recycle_pending = False
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug(f"Browser {slot.index} close failed: {e}")
+
+    async def _ensure_browser(self, slot: _BrowserSlot):
+        async with slot.lock:
+            if slot.healthy:
+                return slot.browser
+            if slot.browser is not None:
+                # Browser died underneath us - drop it and relaunch
+                self.crashes += 1
+                logger.warning(f"⚠️  [BROWSER] Browser {slot.index} disconnected, restarting")
+                await self._close_slot(slot)
+            playwright = await self._ensure_playwright()
+            slot.browser = await playwright.chromium.launch(headless=True, args=self.launch_args)
+            slot.launches += 1
+            logger.info(f"🌐 [BROWSER] Launched browser {slot.index} (launch #{slot.launches})")
+            return slot.browser
+
+    async def _new_context(
+        self,
+        slot: _BrowserSlot,
+        user_agent: str,
+        viewport: Optional[Dict[str, int]],
+        block_resources: bool,
+    ):
+        """Open an isolated context for one fetch (no shared cookies/storage)."""
+        browser = await self._ensure_browser(slot)
+        kwargs: Dict[str, Any] = {"user_agent": user_agent}
+        if viewport:
+            kwargs["viewport"] = viewport
+        context = await browser.new_context(**kwargs)
+        slot.contexts.add(context)
+        try:
+            if block_resources:
+                await context.route("**/*", _block_heavy_resources)
+        except Exception:
+            await self._close_context(slot, context)
+            raise
+        return context
+
+    async def _close_context(self, slot: _BrowserSlot, context) -> None:
+        slot.contexts.discard(context)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Context close on browser {slot.index} failed: {e}")
+
+    def _pick_slot(self) -> _BrowserSlot:
+        # Prefer browsers not waiting to be recycled, then the least busy one
+        return min(self._slots, key=lambda s: (s.recycle_pending, s.active_pages, s.index))
+
+    @asynccontextmanager
+    async def page(
+        self,
+        user_agent: str = DEFAULT_USER_AGENT,
+        viewport: Optional[Dict[str, int]] = None,
+        block_resources: bool = True,
+    ) -> AsyncIterator[Any]:
+        """Open a page in a fresh context on a pooled browser; both are closed on exit.
+
+        Args:
+            user_agent: User agent for the browser context
+            viewport: Optional viewport, e.g. {"width": 1280, "height": 720}
+            block_resources: Abort image/font/media requests (HTML/text only)
+        """
+        async with self._page_semaphore:
+            slot = self._pick_slot()
+            slot.active_pages += 1
+            context = None
+            page = None
+            try:
+                try:
+                    context = await self._new_context(slot, user_agent, viewport, block_resources)
+                    page = await context.new_page()
+                except Exception:
+                    if context is not None:
+                        await self._close_context(slot, context)
+                        context = None
+                    # Retry once; only restart the browser if it actually died
+                    # (crashed between checks), not for a transient context failure
+                    if not slot.healthy:
+                        self.crashes += 1
+                        async with slot.lock:
+                            if not slot.healthy:
+                                await self._close_slot(slot)
+                    context = await self._new_context(slot, user_agent, viewport, block_resources)
+                    page = await context.new_page()
+
+                self.pages_opened += 1
+                yield page
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                if context is not None:
+                    await self._close_context(slot, context)
+                slot.active_pages -= 1
+                slot.pages_served += 1
+                if slot.pages_served >= self.recycle_after:
+                    slot.recycle_pending = True
+                if slot.recycle_pending and slot.active_pages == 0:
+                    async with slot.lock:
+                        # Re-check: another page may have claimed the slot while we waited
+                        if slot.recycle_pending and slot.active_pages == 0:
+                            self.recycles += 1
+                            logger.info(f"♻️  [BROWSER] Recycling browser {slot.index} after {slot.pages_served} pages")
+                            await self._close_slot(slot)
+
+    async def close(self) -> None:
+        """Close all browsers and the Playwright driver."""
+        for slot in self._slots:
+            async with slot.lock:
+                await self._close_slot(slot)
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"Playwright stop failed: {e}")
+            self._playwright = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool snapshot for status endpoints."""
+        return {
+            "size": self.size,
+            "max_pages": self.max_pages,
+            "recycle_after": self.recycle_after,
+            "pages_opened": self.pages_opened,
+            "crashes": self.crashes,
+            "recycles": self.recycles,
+            "browsers": [
+                {
+                    "index": slot.index,
+                    "running": slot.healthy,
+                    "active_pages": slot.active_pages,
+                    "pages_served": slot.pages_served,
+                    "launches": slot.launches,
+                    "contexts": len(slot.contexts),
+                }
+                for slot in self._slots
+            ],
+        }
+
+
+# Lazy singleton
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool (created on first use)."""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(
+            size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+            max_pages=int(os.getenv("BROWSER_POOL_MAX_PAGES", "6")),
+            recycle_after=int(os.getenv("BROWSER_POOL_RECYCLE_AFTER", "100")),
+        )
+    return _browser_pool
+
+
+async def close_browser_pool() -> None:
+    """Shut down the pool if it was started (app shutdown)."""
+    global _browser_pool
+    if _browser_pool is not None:
+        await _browser_pool.close()
+        _browser_pool = None
@@ -25,6 +25,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
 from tech_detector import analyze_website_tech
+from cpu_pool import run_cpu
+from http_clients import get_http_client
+from fetch_cache import cached_derived, content_fingerprint, fetch_cached
 from openlogo import LogoCrawler
 from ai_client import AIClient
 
@@ -467,8 +470,8 @@ async def call_scaile_url_extract(url: str, prompt: str) -> Optional[str]:
             "timeout": 90  # Increased timeout for URL extraction
         }
         
-        async with httpx.AsyncClient(timeout=120.0, follow_redirects=True) as client:  # Follow Modal 303 redirects
-            resp = await client.post(scaile_url, json=payload)
+        client = get_http_client("api")
+        resp = await client.post(scaile_url, json=payload, timeout=120.0, follow_redirects=True)  # Follow Modal 303 redirects
             
         if resp.status_code == 200:
             result = resp.json()
@@ -511,8 +514,8 @@ async def call_scaile_search(query: str, country: str = "US") -> Optional[str]:
             "provider": "auto"  # Prefers free SearXNG, falls back to DataForSEO
         }
         
-        async with httpx.AsyncClient(timeout=90.0, follow_redirects=True) as client:  # Follow Modal 303 redirects
-            resp = await client.post(scaile_url, json=payload)
+        client = get_http_client("api")
+        resp = await client.post(scaile_url, json=payload, timeout=90.0, follow_redirects=True)  # Follow Modal 303 redirects
             
         if resp.status_code == 200:
             result = resp.json()
@@ -780,28 +783,25 @@ async def fetch_logo(website_url: str) -> Optional[LogoInfo]:
         return None
 
 
+# Bump when tech_detector output changes (invalidates memoized detections)
+TECH_DETECTION_VERSION = 1
+
+
 async def fetch_website_html(website_url: str) -> tuple[Optional[str], str]:
     """Fetch website HTML content.
     
+    Served from the shared fetch cache (browser headers, single-flight), so a
+    concurrent /health/check or logo crawl of the same site shares the download.
+    
     Returns:
         Tuple of (html_content, final_url after redirects)
     """
-    # Realistic browser headers to avoid bot blocking
-    # Note: Don't include Accept-Encoding - let httpx handle decompression automatically
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "no-cache",
-    }
-    
     try:
-        async with httpx.AsyncClient(timeout=45.0, follow_redirects=True, headers=headers) as client:
-            resp = await client.get(website_url)
-            if resp.status_code == 200:
-                return (resp.text, str(resp.url))
-            logger.warning(f"Failed to fetch {website_url}: HTTP {resp.status_code}")
-            return (None, website_url)
+        resp = await fetch_cached(website_url, timeout=45.0)
+        if resp.status_code == 200:
+            return (resp.text, resp.final_url)
+        logger.warning(f"Failed to fetch {website_url}: HTTP {resp.status_code}")
+        return (None, website_url)
     except httpx.TimeoutException:
         logger.warning(f"Timeout fetching {website_url}")
         return (None, website_url)
@@ -827,7 +827,15 @@ async def detect_website_technology(website_url: str) -> Optional[WebsiteTech]:
     
     try:
         logger.info(f"🔍 detect_website_technology: Calling analyze_website_tech...")
-        tech_data = analyze_website_tech(html, final_url)
+
+        async def compute() -> Dict[str, Any]:
+            # Full lxml parse + signature scan - CPU pool, like the health analysis
+            return await run_cpu(analyze_website_tech, html, final_url)
+
+        # Unchanged HTML (e.g. 304 on a re-analysis) reuses the previous detection;
+        # hashing a multi-MB page is kept off the event loop as well
+        fingerprint = await asyncio.to_thread(content_fingerprint, TECH_DETECTION_VERSION, html, final_url)
+        tech_data = await cached_derived("tech_detection", fingerprint, compute)
         logger.info(f"✅ detect_website_technology: analyze_website_tech completed")
         result = WebsiteTech(
             cms=tech_data.get("cms"),
@@ -966,8 +974,8 @@ async def save_to_supabase(
             "Prefer": "return=minimal",
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.patch(url, json=payload, headers=headers)
+        client = get_http_client("api")
+        resp = await client.patch(url, json=payload, headers=headers, timeout=30.0)
             
         if resp.status_code in (200, 204):
             logger.info(f"Successfully saved analysis to Supabase for client {client_id}")
@@ -1010,8 +1018,8 @@ async def trigger_mentions_check(
 
         logger.info(f"Triggering mentions check for {company_name} (client {client_id})")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(url, json=payload, headers=headers)
+        client = get_http_client("api")
+        resp = await client.post(url, json=payload, headers=headers, timeout=30.0)
 
         if resp.status_code in (200, 202):
             logger.info(f"Mentions check triggered successfully for {company_name}")
@@ -1061,7 +1069,7 @@ async def extract_brand_assets_async(website_url: str, domain: str) -> BrandAsse
         logger.info(f"🔍 Brand: About to call Gemini API...")
         # Call native Gemini SDK with url_context tool
         try:
-            response = gemini_client.client.models.generate_content(
+            response = await gemini_client.client.aio.models.generate_content(
                 model="gemini-3-pro-preview",
                 contents=brand_prompt,
                 config={
@@ -1688,7 +1696,7 @@ async def test_tech(url: str = "https://www.scaile.tech"):
         if not html:
             return {"error": "Failed to fetch HTML", "url": url}
         
-        tech_data = analyze_website_tech(html, final_url)
+        tech_data = await run_cpu(analyze_website_tech, html, final_url)
         return {
             "html_length": len(html),
             "final_url": final_url,
@@ -1761,16 +1769,17 @@ async def _run_fire_and_forget_background(request: CompanyAnalysisRequest, domai
         
         # Update status
         status = "completed" if saved else "failed"
-        async with httpx.AsyncClient(timeout=10) as client:
-            await client.patch(
-                f"{request.supabase_url}/rest/v1/clients?id=eq.{request.client_id}",
-                json={"analysis_status": status},
-                headers={
-                    "apikey": request.supabase_key,
-                    "Authorization": f"Bearer {request.supabase_key}",
-                    "Content-Type": "application/json",
-                }
-            )
+        client = get_http_client("api")
+        await client.patch(
+            f"{request.supabase_url}/rest/v1/clients?id=eq.{request.client_id}",
+            json={"analysis_status": status},
+            timeout=10,
+            headers={
+                "apikey": request.supabase_key,
+                "Authorization": f"Bearer {request.supabase_key}",
+                "Content-Type": "application/json",
+            }
+        )
         
         logger.info(f"Background task complete for {domain}: status={status}")
         
@@ -1789,16 +1798,17 @@ async def _run_fire_and_forget_background(request: CompanyAnalysisRequest, domai
         logger.error(f"Background task failed for {domain}: {type(e).__name__}: {e}")
         # Update status to failed
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                await client.patch(
-                    f"{request.supabase_url}/rest/v1/clients?id=eq.{request.client_id}",
-                    json={"analysis_status": "failed"},
-                    headers={
-                        "apikey": request.supabase_key,
-                        "Authorization": f"Bearer {request.supabase_key}",
-                        "Content-Type": "application/json",
-                    }
-                )
+            client = get_http_client("api")
+            await client.patch(
+                f"{request.supabase_url}/rest/v1/clients?id=eq.{request.client_id}",
+                json={"analysis_status": "failed"},
+                timeout=10,
+                headers={
+                    "apikey": request.supabase_key,
+                    "Authorization": f"Bearer {request.supabase_key}",
+                    "Content-Type": "application/json",
+                }
+            )
         except Exception as update_err:
             logger.error(f"Failed to update status for {domain}: {update_err}")
 
@@ -1820,16 +1830,17 @@ async def _run_fire_and_forget_inline(request: CompanyAnalysisRequest, domain: s
         
         if saved:
             logger.info(f"Inline background: Saved analysis for {domain}")
-            async with httpx.AsyncClient(timeout=10) as client:
-                await client.patch(
-                    f"{request.supabase_url}/rest/v1/clients?id=eq.{request.client_id}",
-                    json={"analysis_status": "completed"},
-                    headers={
-                        "apikey": request.supabase_key,
-                        "Authorization": f"Bearer {request.supabase_key}",
-                        "Content-Type": "application/json",
-                    }
-                )
+            client = get_http_client("api")
+            await client.patch(
+                f"{request.supabase_url}/rest/v1/clients?id=eq.{request.client_id}",
+                json={"analysis_status": "completed"},
+                timeout=10,
+                headers={
+                    "apikey": request.supabase_key,
+                    "Authorization": f"Bearer {request.supabase_key}",
+                    "Content-Type": "application/json",
+                }
+            )
                 
     except Exception as e:
         logger.error(f"Inline background failed for {domain}: {e}")
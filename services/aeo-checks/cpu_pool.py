@@ -0,0 +1,100 @@
+"""Process pool for CPU-bound work (HTML parsing, health checks, scoring).
+
+BeautifulSoup/lxml parses and the health checks are pure CPU; run on the event loop
+a multi-MB page stalls every other request on the worker. run_cpu() moves such
+work to a shared process pool. Arguments and results must be picklable, so callers
+pass raw HTML in and get plain dicts/summaries back.
+
+Configuration:
+- CPU_POOL_MODE: "process" (default), "thread" (GIL-bound, for debugging) or
+  "inline" (run on the event loop - the old behaviour)
+- CPU_POOL_WORKERS: worker processes (default: usable CPUs, at most 4 - each
+  worker holds its own copy of bs4/lxml and the check modules)
+
+Workers are started with forkserver (not fork) since the parent runs threads
+(uvicorn, httpx, Playwright).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CPU_POOL_MODE = os.getenv("CPU_POOL_MODE", "process")
+
+
+def _default_workers() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+    return max(1, min(4, cpus))
+
+
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", "0")) or _default_workers()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_stats = {"tasks": 0, "restarts": 0}
+
+
+def _init_worker() -> None:
+    # Per-page INFO logs from workers are noise (the parent logs the outcome)
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """Lazy shared process pool."""
+    global _pool
+    if _pool is None:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+        _pool = ProcessPoolExecutor(max_workers=CPU_POOL_WORKERS, mp_context=context, initializer=_init_worker)
+        logger.info(f"🧮 [CPU] Process pool ready: {CPU_POOL_WORKERS} workers")
+    return _pool
+
+
+async def run_cpu(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run fn(*args) off the event loop according to CPU_POOL_MODE."""
+    _stats["tasks"] += 1
+    if CPU_POOL_MODE == "inline":
+        return fn(*args)
+    if CPU_POOL_MODE == "thread":
+        return await asyncio.to_thread(fn, *args)
+
+    global _pool
+    loop = asyncio.get_running_loop()
+    pool = get_cpu_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge page) - start a fresh pool and retry once
+        if _pool is pool:
+            _stats["restarts"] += 1
+            logger.warning("🧮 [CPU] Process pool broken, restarting")
+            _pool = None
+        return await loop.run_in_executor(get_cpu_pool(), fn, *args)
+
+
+def warm_cpu_pool() -> None:
+    """Start worker processes now instead of on the first request (app startup)."""
+    if CPU_POOL_MODE == "process":
+        pool = get_cpu_pool()
+        for future in [pool.submit(os.getpid) for _ in range(CPU_POOL_WORKERS)]:
+            future.result()
+
+
+def close_cpu_pool() -> None:
+    """Shut down worker processes (app shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def cpu_pool_stats() -> Dict[str, Any]:
+    return {"mode": CPU_POOL_MODE, "workers": CPU_POOL_WORKERS, "started": _pool is not None, **_stats}
@@ -0,0 +1,427 @@
+# ABOUTME: Shared website fetch layer with single-flight deduplication and a short-TTL response cache
+# ABOUTME: Used by the health check fetcher, company analysis HTML fetch and the logo crawler
+
+"""
+Onboarding a client triggers /company/analyze, /health/check and the logo crawl for
+the same domain at about the same time; each used to download the homepage (and
+robots.txt / sitemap.xml) on its own. fetch_cached() is the one entry point for
+those page fetches (the health check keeps its own User-Agent, so it shares
+downloads with its own concurrent and repeated runs rather than with the others):
+
+- identical concurrent requests share one HTTP call (single-flight); "identical"
+  means same URL and same request headers, so a caller with its own User-Agent
+  (the health check) gets its own entries and never sees another UA's response
+- responses (body, headers, final URL, timing) are kept for FETCH_CACHE_TTL_SECONDS
+  in a memory LRU plus SQLite (FETCH_CACHE_DB, "" = memory only), so requests a few
+  seconds apart - or on another worker process - reuse them too
+
+Only definitive answers are cached (2xx/3xx/4xx except 408/429); 5xx, 429 and
+network errors are shared with concurrent waiters but never stored.
+
+Revalidation: responses carrying an ETag or Last-Modified are kept for
+FETCH_CACHE_STORE_SECONDS. Once stale, the next fetch sends If-None-Match /
+If-Modified-Since and a 304 reuses the stored body (and its original timing).
+cached_derived() memoizes results computed from fetched content (health check
+analysis, tech detection) by content fingerprint, so an unchanged site is not
+re-parsed or re-scored either.
+
+Bodies are streamed with a byte cap per content type (read_capped): HTML/XML/text
+keep only the first FETCH_MAX_*_BYTES, anything else is abandoned once it is
+larger than its cap (up front when Content-Length says so). One oversized page
+can't take a worker's memory with it.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, asdict, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+from http_clients import get_http_client
+from response_cache import CacheBackend, MemoryLRUBackend, SQLiteBackend
+
+logger = logging.getLogger(__name__)
+
+FETCH_CACHE_DB = os.getenv("FETCH_CACHE_DB", "/tmp/aeo_fetch_cache.sqlite")
+FETCH_CACHE_TTL_SECONDS = int(os.getenv("FETCH_CACHE_TTL_SECONDS", "300"))
+FETCH_CACHE_MAX_ENTRIES = int(os.getenv("FETCH_CACHE_MAX_ENTRIES", "200"))
+# How long responses with validators (and derived results) are kept for revalidation
+FETCH_CACHE_STORE_SECONDS = int(os.getenv("FETCH_CACHE_STORE_SECONDS", str(7 * 24 * 3600)))
+# Bodies above this are served to the caller but not cached
+FETCH_CACHE_MAX_BODY_CHARS = int(os.getenv("FETCH_CACHE_MAX_BODY_CHARS", str(5 * 1024 * 1024)))
+
+# Byte caps per content type. Text-like bodies are truncated to their cap (the checks
+# only need the start of a page, sitemap or robots.txt); others are dropped
+FETCH_MAX_HTML_BYTES = int(os.getenv("FETCH_MAX_HTML_BYTES", str(5 * 1024 * 1024)))
+FETCH_MAX_TEXT_BYTES = int(os.getenv("FETCH_MAX_TEXT_BYTES", str(1024 * 1024)))
+FETCH_MAX_IMAGE_BYTES = int(os.getenv("FETCH_MAX_IMAGE_BYTES", str(10 * 1024 * 1024)))
+FETCH_MAX_OTHER_BYTES = int(os.getenv("FETCH_MAX_OTHER_BYTES", str(1024 * 1024)))
+
+# Default header set for shared page fetches (company analysis, logo crawl).
+# Callers may send their own headers; entries are keyed by URL + headers
+FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cache-Control": "no-cache",
+}
+
+# 304 only answers our own conditional requests and has no body of its own
+_UNCACHEABLE_STATUS = {304, 408, 429}
+# Headers a 304 may update on the stored response
+_REVALIDATION_HEADERS = ("etag", "last-modified", "cache-control", "expires", "date")
+
+
+def normalize_url(url: str) -> str:
+    """Cache identity of a URL: lowercase scheme/host, no fragment, "/" for an empty path."""
+    if not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+def body_limit(content_type: str) -> Tuple[int, bool]:
+    """(max bytes, truncate instead of dropping) for a Content-Type header value."""
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type in ("", "text/html", "application/xhtml+xml"):
+        # Servers omitting Content-Type are almost always sending HTML
+        return FETCH_MAX_HTML_BYTES, True
+    if content_type.startswith("text/") or content_type.endswith(("xml", "json")):
+        return FETCH_MAX_TEXT_BYTES, True
+    if content_type.startswith("image/"):
+        return FETCH_MAX_IMAGE_BYTES, False
+    return FETCH_MAX_OTHER_BYTES, False
+
+
+async def read_capped(response: httpx.Response, limit: int, truncate: bool) -> Tuple[Optional[bytes], bool]:
+    """Read a streamed response body up to limit bytes.
+    
+    Returns (body, truncated). With truncate=False an oversized body is abandoned
+    and body is None. Stops reading as soon as the cap is hit, so memory per
+    download stays around limit + one chunk.
+    """
+    length = response.headers.get("content-length", "")
+    if not truncate and length.isdigit() and int(length) > limit:
+        return None, True
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        body.extend(chunk)
+        if len(body) > limit:
+            if not truncate:
+                return None, True
+            del body[limit:]
+            return bytes(body), True
+    return bytes(body), False
+
+
+def _decode_body(body: bytes, response: httpx.Response) -> str:
+    try:
+        return body.decode(response.charset_encoding or "utf-8", errors="replace")
+    except LookupError:  # unknown charset name
+        return body.decode("utf-8", errors="replace")
+
+
+def make_fetch_key(url: str, headers: Optional[Dict[str, str]] = None) -> str:
+    header_items = sorted((k.lower(), v) for k, v in (headers or FETCH_HEADERS).items())
+    return hashlib.sha256(json.dumps(["fetch", normalize_url(url), header_items]).encode("utf-8")).hexdigest()
+
+
+def make_derived_key(kind: str, fingerprint: str) -> str:
+    return hashlib.sha256(json.dumps(["derived", kind, fingerprint]).encode("utf-8")).hexdigest()
+
+
+def content_fingerprint(*parts: Any) -> str:
+    """Stable hash of everything a derived result depends on (HTML, URL, flags, versions)."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FetchedResponse:
+    """A fetched URL as seen by every downstream module."""
+    url: str                 # requested URL (normalized)
+    final_url: str           # after redirects
+    status_code: int
+    headers: Dict[str, str]  # lowercase names
+    text: str
+    elapsed_ms: int          # original network time, also on cache hits
+    fetched_at: float
+    from_cache: bool = False
+    revalidated: bool = False  # stored body confirmed unchanged by a 304
+    truncated: bool = False    # body cut at (or, for non-text types, dropped above) its byte cap
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for revalidating this response."""
+        headers = {}
+        if self.headers.get("etag"):
+            headers["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("from_cache")
+        data.pop("revalidated")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FetchedResponse":
+        return cls(**data)
+
+
+@dataclass
+class FetchCacheStats:
+    """Cache counters (lifetime of the process)."""
+    requests: int = 0
+    hits: int = 0
+    coalesced: int = 0  # requests that shared another request's in-flight HTTP call
+    misses: int = 0
+    revalidations: int = 0  # conditional requests sent for stale entries
+    not_modified: int = 0   # ... answered with 304 (stored body reused)
+    derived_hits: int = 0   # analyses served by content fingerprint
+    writes: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        served = self.hits + self.coalesced
+        data["hit_rate"] = round(served / self.requests, 3) if self.requests else 0.0
+        return data
+
+
+class FetchCache:
+    """Single-flight + short-TTL cache in front of the pooled "web" client."""
+
+    def __init__(
+        self,
+        backends: List[CacheBackend],
+        ttl_seconds: int = FETCH_CACHE_TTL_SECONDS,
+        store_seconds: int = FETCH_CACHE_STORE_SECONDS,
+    ):
+        self.backends = backends
+        self.ttl_seconds = ttl_seconds
+        self.store_seconds = max(store_seconds, ttl_seconds)
+        self.stats = FetchCacheStats()
+        self._inflight: Dict[str, "asyncio.Future"] = {}
+
+    @staticmethod
+    async def _run(backend: CacheBackend, method: str, *args):
+        # Disk backends do blocking I/O - keep them off the event loop
+        if isinstance(backend, MemoryLRUBackend):
+            return getattr(backend, method)(*args)
+        return await asyncio.to_thread(getattr(backend, method), *args)
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        for i, backend in enumerate(self.backends):
+            try:
+                value = await self._run(backend, "get", key)
+            except Exception as e:
+                logger.warning(f"Fetch cache read failed ({type(backend).__name__}): {e}")
+                continue
+            if value is not None:
+                # Promote to faster tiers with the entry's original expiry
+                for faster in self.backends[:i]:
+                    try:
+                        await self._run(faster, "set", key, "fetch", value, value["expires_at"])
+                    except Exception:
+                        pass
+                return value
+        return None
+
+    async def _store(self, key: str, platform: str, value: Dict[str, Any], expires_at: float) -> None:
+        value = {**value, "expires_at": expires_at}
+        for backend in self.backends:
+            try:
+                await self._run(backend, "set", key, platform, value, expires_at)
+            except Exception as e:
+                logger.warning(f"Fetch cache write failed ({type(backend).__name__}): {e}")
+        self.stats.writes += 1
+
+    async def _set(self, key: str, response: FetchedResponse) -> None:
+        fresh_until = response.fetched_at + self.ttl_seconds
+        # Without validators a stale copy is useless - drop it when it stops being fresh
+        expires_at = response.fetched_at + self.store_seconds if response.conditional_headers() else fresh_until
+        await self._store(key, "fetch", {"fresh_until": fresh_until, "response": response.to_dict()}, expires_at)
+
+    async def _fetch(
+        self,
+        client: Optional[httpx.AsyncClient],
+        url: str,
+        timeout: Any,
+        stale: Optional[FetchedResponse] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> FetchedResponse:
+        start = time.time()
+        client = client or get_http_client("web")
+        headers = headers or FETCH_HEADERS
+        if stale is not None:
+            self.stats.revalidations += 1
+            headers = {**headers, **stale.conditional_headers()}
+        async with client.stream("GET", url, headers=headers, follow_redirects=True, timeout=timeout) as response:
+            if response.status_code == 304 and stale is not None:
+                self.stats.not_modified += 1
+                logger.info(f"♻️ [FETCH-CACHE] Not modified (304), reusing stored body: {url}")
+                updated = {k: v for k, v in response.headers.items() if k.lower() in _REVALIDATION_HEADERS}
+                # elapsed_ms stays that of the last full download (scoring input, see module docstring)
+                return replace(
+                    stale,
+                    headers={**stale.headers, **{k.lower(): v for k, v in updated.items()}},
+                    fetched_at=time.time(),
+                    revalidated=True,
+                )
+            limit, truncate = body_limit(response.headers.get("content-type", ""))
+            body, truncated = await read_capped(response, limit, truncate)
+            if truncated:
+                action = f"kept first {limit} bytes" if truncate else f"dropped (> {limit} bytes)"
+                logger.warning(f"✂️ [FETCH-CACHE] Oversized body {action}: {url}")
+            return FetchedResponse(
+                url=url,
+                final_url=str(response.url),
+                status_code=response.status_code,
+                headers={k.lower(): v for k, v in response.headers.items()},
+                text=_decode_body(body, response) if body is not None else "",
+                elapsed_ms=int((time.time() - start) * 1000),
+                fetched_at=time.time(),
+                truncated=truncated,
+            )
+
+    async def fetch(
+        self,
+        url: str,
+        timeout: Any = httpx.USE_CLIENT_DEFAULT,
+        use_cache: bool = True,
+        client: Optional[httpx.AsyncClient] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> FetchedResponse:
+        """Serve a URL from cache, an identical in-flight fetch, or the network.
+
+        Raises the underlying httpx error if the (shared) fetch fails.
+        use_cache=False skips the cache read (no revalidation either) but still
+        coalesces and refreshes the entry. headers (default FETCH_HEADERS) are
+        part of the cache key: only callers sending the same headers share entries.
+        """
+        self.stats.requests += 1
+        url = normalize_url(url)
+        key = make_fetch_key(url, headers)
+
+        stale = None
+        if use_cache:
+            cached = await self._get(key)
+            if cached is not None:
+                stored = FetchedResponse.from_dict(cached["response"])
+                if time.time() < cached.get("fresh_until", cached["expires_at"]):
+                    self.stats.hits += 1
+                    logger.info(f"💾 [FETCH-CACHE] Hit: {url}")
+                    stored.from_cache = True
+                    return stored
+                stale = stored
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            # Shielded: one waiter giving up must not cancel the fetch for the others
+            response = await asyncio.shield(inflight)
+            if response is not None:
+                self.stats.coalesced += 1
+                logger.info(f"🔗 [FETCH-CACHE] Coalesced with in-flight fetch: {url}")
+                return FetchedResponse(**{**asdict(response), "from_cache": True})
+            # The leading request was cancelled - join a newer fetch or run our own
+            inflight = self._inflight.get(key)
+
+        self.stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._fetch(client, url, timeout, stale, headers)
+        except asyncio.CancelledError:
+            # Don't cancel the waiters along with us: None tells them to refetch
+            future.set_result(None)
+            raise
+        except Exception as e:
+            self.stats.errors += 1
+            future.set_exception(e)
+            future.exception()  # retrieved - no "never retrieved" warning without waiters
+            raise
+        else:
+            future.set_result(response)
+            cacheable = response.status_code < 500 and response.status_code not in _UNCACHEABLE_STATUS
+            if cacheable and len(response.text) <= FETCH_CACHE_MAX_BODY_CHARS:
+                # Write before leaving in-flight so there is no window where a new request refetches
+                await self._set(key, response)
+            return response
+        finally:
+            if not future.done():
+                future.set_result(None)
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def cached_derived(
+        self,
+        kind: str,
+        fingerprint: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Result of compute() for this content fingerprint, computed at most once per store period."""
+        key = make_derived_key(kind, fingerprint)
+        cached = await self._get(key)
+        if cached is not None:
+            self.stats.derived_hits += 1
+            logger.info(f"💾 [FETCH-CACHE] Reusing {kind} result for unchanged content")
+            return cached["result"]
+        result = await compute()
+        await self._store(key, kind, {"result": result}, time.time() + self.store_seconds)
+        return result
+
+
+# Lazy singleton
+_fetch_cache: Optional[FetchCache] = None
+
+
+def get_fetch_cache() -> FetchCache:
+    """Shared fetch cache (memory LRU + SQLite when FETCH_CACHE_DB is writable)."""
+    global _fetch_cache
+    if _fetch_cache is None:
+        backends: List[CacheBackend] = [MemoryLRUBackend(max_entries=FETCH_CACHE_MAX_ENTRIES)]
+        if FETCH_CACHE_DB:
+            try:
+                backends.append(SQLiteBackend(FETCH_CACHE_DB))
+            except Exception as e:
+                logger.warning(f"SQLite fetch cache unavailable ({FETCH_CACHE_DB}): {e} - using memory only")
+        _fetch_cache = FetchCache(backends)
+    return _fetch_cache
+
+
+async def fetch_cached(
+    url: str,
+    timeout: Any = httpx.USE_CLIENT_DEFAULT,
+    use_cache: bool = True,
+    client: Optional[httpx.AsyncClient] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> FetchedResponse:
+    """Fetch a page through the shared single-flight cache (see module docstring).
+
+    client defaults to the pooled "web" client, headers to FETCH_HEADERS.
+    """
+    return await get_fetch_cache().fetch(url, timeout=timeout, use_cache=use_cache, client=client, headers=headers)
+
+
+async def cached_derived(
+    kind: str,
+    fingerprint: str,
+    compute: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Memoize a JSON-serializable result derived from fetched content (see FetchCache.cached_derived)."""
+    return await get_fetch_cache().cached_derived(kind, fingerprint, compute)
+
+
+def fetch_cache_stats() -> Dict[str, float]:
+    return get_fetch_cache().stats.to_dict()
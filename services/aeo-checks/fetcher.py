@@ -9,10 +9,15 @@ v2.5: Added Cloudflare detection + JS rendering fallback
 import asyncio
 import httpx
 import logging
-from typing import Optional, Tuple
+import re
+from typing import Any, Optional, Tuple
 from urllib.parse import urlparse, urljoin
 from dataclasses import dataclass
 
+from fetch_cache import fetch_cached
+from http_clients import get_http_client
+from parsed_page import NON_TEXT_TAGS, ParsedPage
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,9 +33,11 @@ class FetchResult:
     status_code: int
     js_rendered: bool = False   # Whether JS rendering was used
     error: Optional[str] = None
+    page: Optional[ParsedPage] = None  # Parsed html (shared by all downstream analysis)
 
 
-# Common browser headers to avoid bot blocking
+# Health check identifies itself (what bot-aware sites and robots rules see);
+# the fetch cache keys on these headers, so other callers' browser UA responses aren't reused
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; AEO-HealthCheck/2.5; +https://scaile.tech)",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -77,9 +84,43 @@ def is_cloudflare_challenge(html: str) -> bool:
     return False
 
 
-def needs_js_rendering(html: str) -> bool:
+_NON_TEXT_TAG_PATTERN = "|".join(sorted(NON_TEXT_TAGS))
+# Comments and script/style/template blocks (not visible text)
+_NON_TEXT_BLOCK_RE = re.compile(rf"<!--.*?-->|<({_NON_TEXT_TAG_PATTERN})\b[^>]*>.*?</\1\s*>", re.S | re.I)
+# ...opened but not closed within a prefix window
+_UNCLOSED_NON_TEXT_RE = re.compile(rf"<!--|<(?:{_NON_TEXT_TAG_PATTERN})\b", re.I)
+_TAG_RE = re.compile(r"<[^>]*>")
+# Prefix sizes tried before scanning the whole document
+_WORD_ESTIMATE_WINDOWS = (256 * 1024, 1024 * 1024)
+
+
+def estimate_word_count(html: str, enough: int = 100) -> int:
+    """Visible word count without an HTML parse (regex tag stripping).
+    
+    Exact enough for the SPA threshold: scans growing prefixes and stops as soon
+    as `enough` words are found, so a content page costs a few ms instead of a
+    full parse. Counts below `enough` are over the whole document.
+    """
+    for size in (*_WORD_ESTIMATE_WINDOWS, len(html)):
+        window = html[:size]
+        text = _NON_TEXT_BLOCK_RE.sub(" ", window)
+        if size < len(html):
+            # A script/comment cut off by the window is not visible text
+            unclosed = _UNCLOSED_NON_TEXT_RE.search(text)
+            if unclosed:
+                text = text[:unclosed.start()]
+        count = len(_TAG_RE.sub(" ", text).split())
+        if count >= enough or size >= len(html):
+            return count
+    return 0
+
+
+def needs_js_rendering(html: str, page: Optional[ParsedPage] = None) -> bool:
     """Check if the page likely needs JavaScript rendering.
     
+    Word count comes from the ParsedPage when one is passed in, otherwise from
+    estimate_word_count (no parse - the full parse happens once, in the analysis).
+    
     Returns True if:
     - Word count is very low (< 100 words)
     - Contains common SPA framework markers
@@ -102,16 +143,8 @@ def needs_js_rendering(html: str) -> bool:
     
     has_spa_marker = any(marker in html for marker in spa_markers)
     
-    # Quick word count check - remove script/style tags first, then strip HTML
-    import re
-    # Remove script and style content (including the tags)
-    text = re.sub(r'<script[^>]*>[\s\S]*?</script>', ' ', html, flags=re.IGNORECASE)
-    text = re.sub(r'<style[^>]*>[\s\S]*?</style>', ' ', text, flags=re.IGNORECASE)
-    # Remove remaining HTML tags
-    text = re.sub(r'<[^>]+>', ' ', text)
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    word_count = len(text.split()) if text else 0
+    # Visible word count (script/style excluded)
+    word_count = page.word_count if page is not None else estimate_word_count(html)
     
     logger.info(f"needs_js_rendering check: word_count={word_count}, has_spa_marker={has_spa_marker}")
     
@@ -131,26 +164,21 @@ def needs_js_rendering(html: str) -> bool:
 async def fetch_with_playwright(url: str, timeout: float = 30.0) -> Tuple[Optional[str], int, str, int]:
     """Fetch URL using Playwright for JavaScript rendering.
     
+    Uses the shared browser pool (no per-call browser launch); images, fonts and
+    media are blocked since only the rendered HTML is needed.
+    
     Returns: (html, status_code, final_url, response_time_ms)
     """
     import time
     start = time.time()
     
     try:
-        from playwright.async_api import async_playwright
+        from browser_pool import get_browser_pool
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage']
-            )
-            
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            page = await context.new_page()
-            
+        async with get_browser_pool().page(
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            block_resources=True,
+        ) as page:
             # Navigate and wait for network to be idle
             response = await page.goto(
                 url, 
@@ -165,12 +193,10 @@ async def fetch_with_playwright(url: str, timeout: float = 30.0) -> Tuple[Option
             # Get rendered HTML
             html = await page.content()
             
-            await browser.close()
-            
-            elapsed_ms = int((time.time() - start) * 1000)
-            logger.info(f"Playwright fetch completed for {url} in {elapsed_ms}ms")
-            
-            return (html, status_code, final_url, elapsed_ms)
+        elapsed_ms = int((time.time() - start) * 1000)
+        logger.info(f"Playwright fetch completed for {url} in {elapsed_ms}ms")
+        
+        return (html, status_code, final_url, elapsed_ms)
             
     except Exception as e:
         elapsed_ms = int((time.time() - start) * 1000)
@@ -178,14 +204,18 @@ async def fetch_with_playwright(url: str, timeout: float = 30.0) -> Tuple[Option
         return (None, 0, url, elapsed_ms)
 
 
-async def fetch_url(client: httpx.AsyncClient, url: str) -> Tuple[Optional[str], int, str, int]:
-    """Fetch a single URL and return (content, status_code, final_url, response_time_ms)."""
+async def fetch_url(client: httpx.AsyncClient, url: str, timeout: Any = httpx.USE_CLIENT_DEFAULT) -> Tuple[Optional[str], int, str, int]:
+    """Fetch a single URL and return (content, status_code, final_url, response_time_ms).
+
+    Goes through the shared fetch cache (single-flight, short TTL, keyed by our
+    AEO-HealthCheck headers); response_time_ms is the original network time. Only the
+    first FETCH_MAX_HTML_BYTES of a page are kept (see fetch_cache.body_limit).
+    """
     import time
     start = time.time()
     try:
-        response = await client.get(url, headers=HEADERS, follow_redirects=True)
-        elapsed_ms = int((time.time() - start) * 1000)
-        return (response.text, response.status_code, str(response.url), elapsed_ms)
+        response = await fetch_cached(url, timeout=timeout, client=client, headers=HEADERS)
+        return (response.text, response.status_code, response.final_url, response.elapsed_ms)
     except httpx.TimeoutException:
         elapsed_ms = int((time.time() - start) * 1000)
         return (None, 0, url, elapsed_ms)
@@ -197,13 +227,13 @@ async def fetch_url(client: httpx.AsyncClient, url: str) -> Tuple[Optional[str],
         return (None, 0, url, elapsed_ms)
 
 
-async def fetch_robots_txt(client: httpx.AsyncClient, base_url: str) -> Optional[str]:
+async def fetch_robots_txt(client: httpx.AsyncClient, base_url: str, timeout: Any = httpx.USE_CLIENT_DEFAULT) -> Optional[str]:
     """Fetch robots.txt from the website root."""
     parsed = urlparse(base_url)
     robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
     
     try:
-        response = await client.get(robots_url, headers=HEADERS, follow_redirects=True)
+        response = await fetch_cached(robots_url, timeout=timeout, client=client, headers=HEADERS)
         if response.status_code == 200:
             return response.text
         return None
@@ -211,7 +241,7 @@ async def fetch_robots_txt(client: httpx.AsyncClient, base_url: str) -> Optional
         return None
 
 
-async def fetch_sitemap(client: httpx.AsyncClient, base_url: str) -> bool:
+async def fetch_sitemap(client: httpx.AsyncClient, base_url: str, timeout: Any = httpx.USE_CLIENT_DEFAULT) -> bool:
     """Check if sitemap.xml exists at the website root.
     
     Returns:
@@ -221,7 +251,7 @@ async def fetch_sitemap(client: httpx.AsyncClient, base_url: str) -> bool:
     sitemap_url = f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"
     
     try:
-        response = await client.get(sitemap_url, headers=HEADERS, follow_redirects=True)
+        response = await fetch_cached(sitemap_url, timeout=timeout, client=client, headers=HEADERS)
         if response.status_code == 200:
             content_type = response.headers.get('content-type', '').lower()
             # Valid sitemap should be XML or contain XML content
@@ -256,18 +286,20 @@ async def fetch_website(url: str, timeout: float = 30.0, enable_js_rendering: bo
     if not url.startswith(('http://', 'https://')):
         url = f'https://{url}'
     
-    # Phase 1: Static fetch for HTML, robots.txt, and sitemap in parallel
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        html_task = fetch_url(client, url)
-        robots_task = fetch_robots_txt(client, url)
-        sitemap_task = fetch_sitemap(client, url)
-        
-        (html, status_code, final_url, html_response_time_ms), robots_txt, sitemap_found = await asyncio.gather(
-            html_task, robots_task, sitemap_task
-        )
+    # Phase 1: Static fetch for HTML, robots.txt, and sitemap in parallel (pooled keep-alive client)
+    client = get_http_client("web")
+    html_task = fetch_url(client, url, timeout=timeout)
+    robots_task = fetch_robots_txt(client, url, timeout=timeout)
+    sitemap_task = fetch_sitemap(client, url, timeout=timeout)
+    
+    (html, status_code, final_url, html_response_time_ms), robots_txt, sitemap_found = await asyncio.gather(
+        html_task, robots_task, sitemap_task
+    )
     
     # Phase 2: Check if we need JS rendering (Cloudflare challenge OR SPA)
     cloudflare_detected = html and is_cloudflare_challenge(html)
+    page = ParsedPage(html, final_url) if html else None
+    # Regex word estimate: the page is parsed only once, by the analysis
     spa_detected = html and needs_js_rendering(html)
     
     if enable_js_rendering and (cloudflare_detected or spa_detected):
@@ -280,6 +312,7 @@ async def fetch_website(url: str, timeout: float = 30.0, enable_js_rendering: bo
         if js_html and not is_cloudflare_challenge(js_html):
             # Playwright succeeded and bypassed any challenges
             html = js_html
+            page = ParsedPage(js_html, js_final_url)
             status_code = js_status
             final_url = js_final_url
             html_response_time_ms = js_time_ms
@@ -327,6 +360,7 @@ async def fetch_website(url: str, timeout: float = 30.0, enable_js_rendering: bo
         html_response_time_ms=html_response_time_ms,
         total_fetch_time_ms=total_fetch_time_ms,
         status_code=status_code,
-        js_rendered=js_rendered
+        js_rendered=js_rendered,
+        page=page,
     )
 
@@ -2,6 +2,7 @@
 Native Gemini Client for Company Analysis
 Uses Google's Gemini SDK with native tools: googleSearch and urlContext
 Single-phase analysis with structured JSON output
+All calls go through the async client (client.aio) so they never block the event loop
 """
 import os
 import json
@@ -59,13 +60,13 @@ Include specific quotes from your search results to support your analysis."""
             prompt_time = time.time()
             logger.info(f"⏱️  [GEMINI] Prompt preparation: {(prompt_time - start_time)*1000:.1f}ms")
             
-            # Use client.models.generate_content with google_search tool
+            # Use async client (client.aio) so the event loop is never blocked
             api_start = time.time()
             logger.info(f"🌐 [GEMINI] Calling API with model=gemini-2.5-flash, tools=[google_search], max_remote_calls=3")
             
             from google.genai import types
             
-            response = self.client.models.generate_content(
+            response = await self.client.aio.models.generate_content(
                 model="gemini-2.5-flash",
                 contents=prompt,
                 config=types.GenerateContentConfig(
@@ -288,8 +289,8 @@ IMPORTANT:
         try:
             logger.info(f"Analyzing {company_name} at {website_url} with native Gemini tools...")
             
-            # Use client.models.generate_content with tools in config
-            response = self.client.models.generate_content(
+            # Use async client (client.aio) with tools in config
+            response = await self.client.aio.models.generate_content(
                 model="gemini-3-pro-preview",  # Correct model name for v1beta API
                 contents=prompt,
                 config={
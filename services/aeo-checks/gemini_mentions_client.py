@@ -81,8 +81,8 @@ Be thorough and accurate. Look for exact matches and reasonable variations of th
         try:
             logger.info(f"Checking mentions for query: '{query}' (company: {company_name})")
             
-            # Use client.models.generate_content with tools in config
-            response = self.client.models.generate_content(
+            # Use async client (client.aio) with tools in config
+            response = await self.client.aio.models.generate_content(
                 model="gemini-3-pro-preview",  # Latest model
                 contents=prompt,
                 config={
@@ -18,17 +18,30 @@ Scoring Tiers:
 - Tier 2 (Important): Complete schema, content quality
 - Tier 3 (Excellence): Full optimization
 
-Endpoint: POST /check
+Endpoints:
+- POST /check - one website
+- POST /check/batch - many websites, streamed as NDJSON (bounded concurrency,
+  per-host politeness)
+
+Parsing, checks and scoring run on the shared CPU process pool (cpu_pool.py) so a
+multi-MB page never blocks the event loop for other requests.
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional, List, Dict, Any
+import time
+from typing import AsyncIterator, Optional, List, Dict, Any
+from urllib.parse import urlparse
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from bs4 import BeautifulSoup
 
+from cpu_pool import CPU_POOL_WORKERS, run_cpu
+from fetch_cache import cached_derived, content_fingerprint
 from fetcher import fetch_website, FetchResult
+from parsed_page import ParsedPage
 from checks.technical import run_technical_checks, extract_technical_summary
 from checks.structured_data import (
     run_structured_data_checks, 
@@ -145,6 +158,14 @@ class HealthCheckResponse(BaseModel):
     summary: Summary
 
 
+class HealthBatchRequest(BaseModel):
+    """Health check for many websites (e.g. a prospect list)."""
+    urls: List[str] = Field(..., min_length=1, max_length=5000)
+    max_concurrency: int = Field(default=20, ge=1, le=100, description="Websites fetched at once")
+    per_host_concurrency: int = Field(default=1, ge=1, le=6, description="Websites fetched at once per host")
+    js_rendering: bool = Field(default=True, description="Playwright fallback for SPAs/Cloudflare (like /check)")
+
+
 # === API Endpoints ===
 
 @app.get("/")
@@ -162,6 +183,7 @@ async def root():
         ],
         "endpoints": {
             "/check": "POST - Run comprehensive health check",
+            "/check/batch": "POST - Health check many websites (NDJSON stream + summary)",
             "/health": "GET - Service health status",
         },
         "checks": {
@@ -215,8 +237,190 @@ async def check_website(request: HealthCheckRequest):
             detail=f"Failed to fetch website: {result.error}"
         )
     
-    # Parse HTML
-    soup = BeautifulSoup(result.html, 'lxml')
+    # Parse + checks + scoring off the event loop (CPU pool); the worker parses once
+    # and all checks share that tree
+    response = await analyze_fetch_result(result)
+    overall_score, grade = response["score"], response["grade"]
+    
+    js_info = " (JS rendered)" if result.js_rendered else ""
+    logger.info(f"Health check complete for {url}: score={overall_score}, grade={grade}{js_info}")
+    
+    return response
+
+
+# === Batch ===
+
+def _host_key(url: str) -> str:
+    host = urlparse(url if "://" in url else f"https://{url}").netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+
+def summarize_health_batch(results: List[Dict[str, Any]], failed: int, wall_time: float) -> Dict[str, Any]:
+    """Score distribution and timing percentiles over completed checks."""
+    scores = [r["score"] for r in results]
+    grades: Dict[str, int] = {}
+    bands: Dict[str, int] = {}
+    histogram = {f"{low}-{low + 9 if low < 90 else 100}": 0 for low in range(0, 100, 10)}
+    for r in results:
+        grades[r["grade"]] = grades.get(r["grade"], 0) + 1
+        bands[r["visibility_band"]] = bands.get(r["visibility_band"], 0) + 1
+        low = min(90, int(r["score"]) // 10 * 10)
+        histogram[f"{low}-{low + 9 if low < 90 else 100}"] += 1
+
+    def timing(key: str) -> Dict[str, float]:
+        values = [r["timing"][key] for r in results]
+        return {f"p{int(p * 100)}": round(_percentile(values, p), 1) for p in (0.5, 0.9, 0.99)}
+
+    return {
+        "total": len(results) + failed,
+        "succeeded": len(results),
+        "failed": failed,
+        "scores": {
+            "min": min(scores) if scores else None,
+            "mean": round(sum(scores) / len(scores), 1) if scores else None,
+            "median": _percentile(scores, 0.5) if scores else None,
+            "max": max(scores) if scores else None,
+            "histogram": histogram,
+            "grades": grades,
+            "visibility_bands": bands,
+        },
+        "timing_ms": {
+            "fetch": timing("fetch_ms"),
+            "analysis": timing("analysis_ms"),
+            "total": timing("total_ms"),
+        },
+        "wall_time_seconds": round(wall_time, 2),
+        "websites_per_second": round((len(results) + failed) / wall_time, 2) if wall_time else 0.0,
+    }
+
+
+async def stream_health_checks(
+    urls: List[str],
+    max_concurrency: int = 20,
+    per_host_concurrency: int = 1,
+    js_rendering: bool = True,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Health-check many websites and yield events as each one finishes.
+    
+    Fetches share the pooled "web" client under a global cap plus a per-host cap
+    (duplicate hosts in a list are fetched one at a time). Parsing, checks and
+    scoring run on the CPU pool so the event loop keeps fetching meanwhile.
+    
+    Events (dicts with a "type" key):
+    - "result": {"index", "url", "result": HealthCheckResponse dict, "timing"}
+    - "error": {"index", "url", "error"} - fetch or analysis failed
+    - "summary": score distribution and timing percentiles (always last)
+    """
+    start = time.time()
+    fetch_slots = asyncio.Semaphore(max_concurrency)
+    host_slots: Dict[str, asyncio.Semaphore] = {}
+    # Bound fetched-but-not-yet-analyzed pages (memory) to what the pool can chew on
+    analysis_slots = asyncio.Semaphore(CPU_POOL_WORKERS * 2)
+
+    async def check_one(index: int, raw_url: str) -> Dict[str, Any]:
+        url = raw_url.strip()
+        item_start = time.time()
+        host = host_slots.setdefault(_host_key(url), asyncio.Semaphore(per_host_concurrency))
+        try:
+            async with host, fetch_slots:
+                fetch_start = time.time()
+                result = await fetch_website(url, enable_js_rendering=js_rendering)
+                fetch_ms = (time.time() - fetch_start) * 1000
+                if result.error or not result.html:
+                    return {"type": "error", "index": index, "url": url, "error": f"Failed to fetch website: {result.error}"}
+                # Keep the fetch slot until the pool has room: fetching pauses instead of
+                # piling up pages in memory when analysis falls behind
+                await analysis_slots.acquire()
+            try:
+                analysis_start = time.time()
+                response = await analyze_fetch_result(result)
+                analysis_ms = (time.time() - analysis_start) * 1000
+            finally:
+                analysis_slots.release()
+        except Exception as e:
+            logger.warning(f"Batch health check failed for {url}: {e}")
+            return {"type": "error", "index": index, "url": url, "error": str(e)}
+
+        return {
+            "type": "result",
+            "index": index,
+            "url": url,
+            "result": response,
+            "timing": {
+                "fetch_ms": round(fetch_ms, 1),
+                "analysis_ms": round(analysis_ms, 1),
+                "total_ms": round((time.time() - item_start) * 1000, 1),
+            },
+        }
+
+    logger.info(f"Batch health check: {len(urls)} websites (concurrency {max_concurrency}, {per_host_concurrency}/host)")
+    tasks = [asyncio.create_task(check_one(i, url)) for i, url in enumerate(urls)]
+    completed: List[Dict[str, Any]] = []
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            event = await next_done
+            if event["type"] == "result":
+                completed.append({**event["result"], "timing": event["timing"]})
+            else:
+                failed += 1
+            yield event
+    finally:
+        # Client disconnected (generator closed) - stop remaining fetches
+        for task in tasks:
+            task.cancel()
+
+    summary = summarize_health_batch(completed, failed, time.time() - start)
+    logger.info(
+        f"Batch health check complete: {summary['succeeded']}/{summary['total']} in "
+        f"{summary['wall_time_seconds']}s (mean score {summary['scores']['mean']})"
+    )
+    yield {"type": "summary", **summary}
+
+
+@app.post("/check/batch")
+async def check_websites_batch(request: HealthBatchRequest):
+    """Health check a list of websites, streamed as NDJSON.
+    
+    One "result" (full /check response) or "error" line per URL in completion
+    order (each carries its input "index"), then a final "summary" line with
+    the score distribution and timing percentiles.
+    """
+    async def body():
+        async for event in stream_health_checks(
+            request.urls,
+            max_concurrency=request.max_concurrency,
+            per_host_concurrency=request.per_host_concurrency,
+            js_rendering=request.js_rendering,
+        ):
+            yield json.dumps(event, default=str) + "\n"
+    
+    return StreamingResponse(
+        body(), media_type="application/x-ndjson", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# === Checks ===
+
+def build_health_check_response(
+    page: ParsedPage,
+    robots_txt: Optional[str],
+    sitemap_found: bool,
+    html_response_time_ms: int,
+    js_rendered: bool = False,
+) -> HealthCheckResponse:
+    """Run all checks and scoring on a fetched page (CPU-bound, no network).
+    
+    page.url must be the final URL after redirects.
+    """
+    soup = page.soup
     
     # Run all checks
     all_issues = []
@@ -224,9 +428,9 @@ async def check_website(request: HealthCheckRequest):
     # 1. Technical SEO checks (16) - includes sitemap, response time, and enhanced robots/canonical checks
     technical_issues = run_technical_checks(
         soup, 
-        result.final_url,
-        sitemap_found=result.sitemap_found,
-        response_time_ms=result.html_response_time_ms  # Use HTML-only response time for scoring
+        page.url,
+        sitemap_found=sitemap_found,
+        response_time_ms=html_response_time_ms  # Use HTML-only response time for scoring
     )
     all_issues.extend(technical_issues)
     logger.info(f"Technical checks complete: {len(technical_issues)} checks")
@@ -242,7 +446,7 @@ async def check_website(request: HealthCheckRequest):
     same_as_urls = structured_summary.get('same_as_urls', [])
     
     # 3. AI crawler access checks (4)
-    crawler_issues = run_aeo_crawler_checks(result.robots_txt)
+    crawler_issues = run_aeo_crawler_checks(robots_txt)
     all_issues.extend(crawler_issues)
     logger.info(f"AI crawler checks complete: {len(crawler_issues)} checks")
     
@@ -279,8 +483,8 @@ async def check_website(request: HealthCheckRequest):
     severity_counts = count_issues_by_severity(all_issues)
     
     # Build summary
-    technical_summary = extract_technical_summary(soup, result.final_url)
-    crawler_summary = extract_crawler_summary(result.robots_txt)
+    technical_summary = extract_technical_summary(soup, page.url)
+    crawler_summary = extract_crawler_summary(robots_txt)
     authority_summary = extract_authority_summary(soup, same_as_urls=same_as_urls)
     
     summary = Summary(
@@ -302,19 +506,19 @@ async def check_website(request: HealthCheckRequest):
         same_as_count=structured_summary['same_as_count'],
         same_as_urls=structured_summary['same_as_urls'],
         robots_txt_found=crawler_summary['robots_txt_found'],
-        sitemap_found=result.sitemap_found,
+        sitemap_found=sitemap_found,
         ai_crawlers_allowed=crawler_summary['ai_crawlers_allowed'],
         ai_crawlers_blocked=crawler_summary['ai_crawlers_blocked'],
         has_about_page=authority_summary['has_about_page'],
         has_contact_info=authority_summary['has_contact_info'],
         social_links=authority_summary['social_links'],
-        response_time_ms=result.html_response_time_ms,  # HTML-only response time
-        js_rendered=result.js_rendered,  # Whether Playwright was used for SPA rendering
+        response_time_ms=html_response_time_ms,  # HTML-only response time
+        js_rendered=js_rendered,  # Whether Playwright was used for SPA rendering
     )
     
     # Build response
     response = HealthCheckResponse(
-        url=result.final_url,
+        url=page.url,
         score=overall_score,
         grade=grade,
         visibility_band=visibility_band,
@@ -331,9 +535,53 @@ async def check_website(request: HealthCheckRequest):
         issues=[Issue(**issue) for issue in all_issues],
         summary=summary,
     )
+
+    return response
+
+
+# === CPU pool entry point ===
+
+def analyze_page(
+    html: bytes,
+    final_url: str,
+    robots_txt: Optional[str],
+    sitemap_found: bool,
+    html_response_time_ms: int,
+    js_rendered: bool = False,
+) -> Dict[str, Any]:
+    """Parse + checks + scoring for one fetched page (runs in a CPU pool worker).
     
-    js_info = " (JS rendered)" if result.js_rendered else ""
-    logger.info(f"Health check complete for {url}: score={overall_score}, grade={grade}{js_info}")
+    Takes UTF-8 HTML bytes, returns the HealthCheckResponse as a dict.
+    """
+    response = build_health_check_response(
+        ParsedPage(html.decode("utf-8", errors="replace"), final_url),
+        robots_txt=robots_txt,
+        sitemap_found=sitemap_found,
+        html_response_time_ms=html_response_time_ms,
+        js_rendered=js_rendered,
+    )
+    return response.model_dump()
+
+
+async def analyze_fetch_result(result: FetchResult) -> Dict[str, Any]:
+    """Run analyze_page for a successful fetch on the CPU pool.
     
-    return response
+    Memoized on every analysis input (plus the service version): when a re-audit
+    finds the site unchanged (304 revalidation), the stored response is returned
+    without parsing or re-scoring.
+    """
+    inputs = (
+        result.html,
+        result.final_url,
+        result.robots_txt,
+        result.sitemap_found,
+        result.html_response_time_ms,
+        result.js_rendered,
+    )
+    # Hashing a multi-MB page is not free - keep it off the event loop too
+    fingerprint = await asyncio.to_thread(content_fingerprint, app.version, *inputs)
+
+    async def compute() -> Dict[str, Any]:
+        return await run_cpu(analyze_page, result.html.encode("utf-8"), *inputs[1:])
 
+    return await cached_derived("health_analysis", fingerprint, compute)
@@ -0,0 +1,252 @@
+"""Application-scoped pooled HTTP clients.
+
+One long-lived httpx.AsyncClient per profile instead of a new client (and new
+TCP/TLS handshake) per call:
+- "web" - crawling customer websites (fetcher, logo detection, company HTML fetch)
+- "api" - service APIs (Supabase, DataForSEO, SCAILE services, Clearbit)
+
+Each profile has keep-alive pooling, a per-host concurrency limit, HTTP/2 when the
+`h2` package is installed (negotiated via ALPN, HTTP/1.1 otherwise), shared default
+timeouts and transport-level connect retries.
+
+Clients are created in the gateway lifespan (init_http_clients) and closed on
+shutdown (close_http_clients); get_http_client() also creates them lazily so the
+sub-apps and scripts work standalone. Connection-reuse stats are exposed via
+http_client_stats() on /status.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass
+class ClientProfile:
+    """Pool settings for one client profile."""
+    timeout: float = 30.0
+    connect_timeout: float = 10.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    per_host_limit: int = 10
+    retries: int = 2
+    follow_redirects: bool = False
+    http2: bool = True
+
+
+CLIENT_PROFILES: Dict[str, ClientProfile] = {
+    # Third-party websites: be polite per host, follow redirects like a browser
+    "web": ClientProfile(timeout=30.0, per_host_limit=6, follow_redirects=True),
+    # Our own/partner APIs: higher per-host concurrency
+    "api": ClientProfile(timeout=30.0, per_host_limit=20, max_keepalive_connections=40),
+}
+
+
+@dataclass
+class _HostStats:
+    requests: int = 0
+    new_connections: int = 0
+    errors: int = 0
+
+
+@dataclass
+class _ProfileStats:
+    requests: int = 0
+    new_connections: int = 0
+    errors: int = 0
+    http2_responses: int = 0
+    hosts: Dict[str, _HostStats] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        reused = max(0, self.requests - self.new_connections)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            "http2_responses": self.http2_responses,
+            "errors": self.errors,
+            "hosts": len(self.hosts),
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees a per-host slot once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """Wraps httpx's pooled transport with per-host limits and connection-reuse stats."""
+
+    def __init__(self, profile: ClientProfile, stats: _ProfileStats):
+        self.profile = profile
+        self.stats = stats
+        self._transport = httpx.AsyncHTTPTransport(
+            http2=profile.http2 and HTTP2_AVAILABLE,
+            retries=profile.retries,
+            limits=httpx.Limits(
+                max_connections=profile.max_connections,
+                max_keepalive_connections=profile.max_keepalive_connections,
+                keepalive_expiry=profile.keepalive_expiry,
+            ),
+        )
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.profile.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        host_stats = self.stats.hosts.setdefault(host, _HostStats())
+        previous_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            # A TCP connect only happens when no pooled connection could be reused
+            if event_name == "connection.connect_tcp.complete":
+                self.stats.new_connections += 1
+                host_stats.new_connections += 1
+            if previous_trace is not None:
+                await previous_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        self.stats.requests += 1
+        host_stats.requests += 1
+
+        # Hold the per-host slot until the response body is closed, not just the headers
+        semaphore = self._semaphore(host)
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            self.stats.errors += 1
+            host_stats.errors += 1
+            raise
+
+        if response.extensions.get("http_version") == b"HTTP/2":
+            self.stats.http2_responses += 1
+        response.stream = _ReleasingStream(response.stream, semaphore)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HttpClientRegistry:
+    """Holds one pooled client per profile, bound to the running event loop."""
+
+    def __init__(self, profiles: Optional[Dict[str, ClientProfile]] = None):
+        self.profiles = profiles or CLIENT_PROFILES
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, _ProfileStats] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        profile = self.profiles.get(name) or ClientProfile()
+        stats = self._stats.setdefault(name, _ProfileStats())
+        return httpx.AsyncClient(
+            transport=PooledTransport(profile, stats),
+            timeout=httpx.Timeout(profile.timeout, connect=profile.connect_timeout),
+            follow_redirects=profile.follow_redirects,
+        )
+
+    def get(self, name: str = "api") -> httpx.AsyncClient:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not self._loop:
+            # Connections can't cross event loops (e.g. repeated asyncio.run in scripts)
+            self._clients = {}
+            self._loop = loop
+
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name)
+            self._clients[name] = client
+        return client
+
+    async def start(self) -> None:
+        for name in self.profiles:
+            self.get(name)
+        logger.info(
+            f"🌐 [HTTP] Pooled clients ready: {', '.join(self.profiles)} "
+            f"(http2={'on' if HTTP2_AVAILABLE else 'off - h2 not installed'})"
+        )
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Closing HTTP client {name} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2_available": HTTP2_AVAILABLE,
+            "clients": {name: stats.to_dict() for name, stats in self._stats.items()},
+        }
+
+
+# Lazy singleton
+_registry: Optional[HttpClientRegistry] = None
+
+
+def get_http_registry() -> HttpClientRegistry:
+    global _registry
+    if _registry is None:
+        _registry = HttpClientRegistry()
+    return _registry
+
+
+def get_http_client(name: str = "api") -> httpx.AsyncClient:
+    """Shared pooled client for a profile ("web" or "api"). Do not close it."""
+    return get_http_registry().get(name)
+
+
+async def init_http_clients() -> None:
+    """Create pooled clients (app startup)."""
+    await get_http_registry().start()
+
+
+async def close_http_clients() -> None:
+    """Close pooled clients (app shutdown)."""
+    if _registry is not None:
+        await _registry.close()
+
+
+def http_client_stats() -> Dict[str, Any]:
+    """Connection-reuse stats per profile."""
+    return get_http_registry().stats()
@@ -2,11 +2,16 @@
 
 Based on crawl4logo (https://github.com/federicodeponte/crawl4logo)
 Integrated into company-analysis service.
+
+Candidate images run through a bounded-concurrency pipeline
+(fetch → decode/resize → dedupe by hash → vision classify) that stops early
+once a high-confidence header/"logo"-URL candidate is found.
 """
 
 import os
 import io
 import re
+import asyncio
 import hashlib
 import logging
 import base64
@@ -14,10 +19,13 @@ from typing import Optional, List
 from urllib.parse import urljoin, urlparse
 
 import httpx
-from bs4 import BeautifulSoup
 from PIL import Image
 from pydantic import BaseModel, Field
 
+from fetch_cache import FETCH_MAX_IMAGE_BYTES, fetch_cached, read_capped
+from http_clients import get_http_client
+from parsed_page import ParsedPage
+
 # Try to import cairosvg for SVG conversion
 try:
     import cairosvg
@@ -242,52 +250,92 @@ async def analyze_image_with_openai(
     )
 
 
+# Max edge length for images sent to vision (logos stay recognizable, payload stays small)
+VISION_MAX_DIMENSION = 512
+
+# Decoded-size budget for raster images (pixels after JPEG draft reduction). Decoding
+# holds the full bitmap in memory - a 20000x20000 PNG is >1.5GB - and no logo needs it
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", str(16 * 1024 * 1024)))
+
+
+def decode_image_to_png_base64(
+    image_data: bytes,
+    image_url: str,
+    min_size: int = 32,
+    max_dimension: int = VISION_MAX_DIMENSION,
+) -> Optional[str]:
+    """Decode image bytes (SVG or raster), resize and convert to base64 PNG.
+    
+    CPU-bound - run via asyncio.to_thread from async code.
+    """
+    # Handle SVG
+    if image_url.lower().endswith(".svg"):
+        if not CAIROSVG_AVAILABLE:
+            logger.warning("cairosvg not available, skipping SVG")
+            return None
+        try:
+            png_data = cairosvg.svg2png(bytestring=image_data)
+            image = Image.open(io.BytesIO(png_data))
+        except Exception as e:
+            logger.error(f"SVG conversion failed: {e}")
+            return None
+    else:
+        try:
+            image = Image.open(io.BytesIO(image_data))
+        except Exception:
+            return None
+    
+    # Check minimum size (from the header - nothing decoded yet)
+    width, height = image.size
+    if width < min_size or height < min_size:
+        return None
+    
+    if max_dimension and max(width, height) > max_dimension:
+        # JPEG: let the decoder scale down by 1/2..1/8 while decoding
+        image.draft(image.mode, (max_dimension, max_dimension))
+    if image.size[0] * image.size[1] > IMAGE_MAX_PIXELS:
+        logger.debug(f"Skipping {image_url}: {image.size[0]}x{image.size[1]} exceeds decode budget")
+        return None
+    
+    # Downscale large images (keeps aspect ratio)
+    if max_dimension and max(image.size) > max_dimension:
+        image.thumbnail((max_dimension, max_dimension))
+    
+    # Convert to PNG base64
+    buffered = io.BytesIO()
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image.save(buffered, format="PNG")
+    else:
+        image = image.convert("RGB")
+        image.save(buffered, format="PNG")
+    
+    return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+
 async def fetch_and_process_image(
     client: httpx.AsyncClient,
     image_url: str,
     page_url: str,
     min_size: int = 32,
 ) -> Optional[tuple]:
-    """Fetch image and convert to base64 PNG."""
+    """Fetch image and convert to base64 PNG (decode runs off the event loop).
+    
+    The download is streamed and abandoned above FETCH_MAX_IMAGE_BYTES.
+    """
     try:
-        response = await client.get(image_url, timeout=15.0, headers=BROWSER_HEADERS)
-        if response.status_code != 200:
+        async with client.stream("GET", image_url, timeout=15.0, headers=BROWSER_HEADERS) as response:
+            if response.status_code != 200:
+                return None
+            image_data, _ = await read_capped(response, FETCH_MAX_IMAGE_BYTES, truncate=False)
+        if image_data is None:
+            logger.debug(f"Skipping {image_url}: larger than {FETCH_MAX_IMAGE_BYTES} bytes")
             return None
         
-        image_data = response.content
         image_hash = get_image_hash(image_data)
         
-        # Handle SVG
-        if image_url.lower().endswith(".svg"):
-            if not CAIROSVG_AVAILABLE:
-                logger.warning("cairosvg not available, skipping SVG")
-                return None
-            try:
-                png_data = cairosvg.svg2png(bytestring=image_data)
-                image = Image.open(io.BytesIO(png_data))
-            except Exception as e:
-                logger.error(f"SVG conversion failed: {e}")
-                return None
-        else:
-            try:
-                image = Image.open(io.BytesIO(image_data))
-            except Exception:
-                return None
-        
-        # Check minimum size
-        width, height = image.size
-        if width < min_size or height < min_size:
+        image_base64 = await asyncio.to_thread(decode_image_to_png_base64, image_data, image_url, min_size)
+        if not image_base64:
             return None
-        
-        # Convert to PNG base64
-        buffered = io.BytesIO()
-        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
-            image.save(buffered, format="PNG")
-        else:
-            image = image.convert("RGB")
-            image.save(buffered, format="PNG")
-        
-        image_base64 = base64.b64encode(buffered.getvalue()).decode("utf-8")
         return image_base64, image_hash
         
     except Exception as e:
@@ -295,106 +343,19 @@ async def fetch_and_process_image(
         return None
 
 
-def extract_header_images(soup: BeautifulSoup, base_url: str) -> set:
-    """Extract image URLs from header/navigation elements."""
-    header_selectors = [
-        "header", "nav", '[role="banner"]', ".header", ".nav",
-        "#header", "#nav", ".navbar", ".site-header", ".main-header",
-    ]
-    
-    header_images = set()
-    for selector in header_selectors:
-        try:
-            elements = soup.select(selector)
-            for element in elements:
-                for img in element.find_all("img"):
-                    src = img.get("src")
-                    if src:
-                        header_images.add(urljoin(base_url, src))
-                
-                for svg in element.find_all("svg"):
-                    for image in svg.find_all("image"):
-                        href = image.get("href") or image.get("xlink:href")
-                        if href:
-                            header_images.add(urljoin(base_url, href))
-        except Exception:
-            continue
-    
-    return header_images
-
-
-def extract_all_images(soup: BeautifulSoup, base_url: str) -> set:
-    """Extract all image URLs from page."""
-    images = set()
-    
-    # <img> tags
-    for img in soup.find_all("img"):
-        src = img.get("src")
-        if src and not src.startswith("data:"):
-            images.add(urljoin(base_url, src))
-    
-    # SVG <image> elements
-    for svg in soup.find_all("svg"):
-        for image in svg.find_all("image"):
-            href = image.get("href") or image.get("xlink:href")
-            if href and not href.startswith("data:"):
-                images.add(urljoin(base_url, href))
-    
-    # Background images in inline styles
-    for element in soup.find_all(style=True):
-        style = element.get("style", "")
-        matches = re.findall(r"background-image:\s*url\(['\"]?([^'\")\s]+)['\"]?\)", style)
-        for match in matches:
-            if not match.startswith("data:"):
-                images.add(urljoin(base_url, match))
-    
-    return images
-
-
-def extract_meta_images(soup: BeautifulSoup, base_url: str) -> dict:
-    """Extract logo-like images from meta tags (favicon, og:image, etc.)."""
-    meta_images = {
-        "favicon": [],
-        "og_image": [],
-        "twitter_image": [],
-    }
-    
-    # Favicon and icon links
-    for link in soup.find_all("link", rel=True):
-        rel = " ".join(link.get("rel", []))
-        href = link.get("href")
-        if href and any(x in rel.lower() for x in ["icon", "apple-touch-icon"]):
-            meta_images["favicon"].append(urljoin(base_url, href))
-    
-    # og:image meta tag
-    for meta in soup.find_all("meta", property="og:image"):
-        content = meta.get("content")
-        if content:
-            meta_images["og_image"].append(urljoin(base_url, content))
-    
-    # twitter:image meta tag
-    for meta in soup.find_all("meta", attrs={"name": "twitter:image"}):
-        content = meta.get("content")
-        if content:
-            meta_images["twitter_image"].append(urljoin(base_url, content))
-    
-    return meta_images
-
-
 # ==================== Helper Functions ====================
 
-def extract_meta_refresh_url(html: str, base_url: str) -> Optional[str]:
+def extract_meta_refresh_url(page: ParsedPage) -> Optional[str]:
     """Extract redirect URL from meta http-equiv="refresh" tag.
 
     Handles patterns like:
     - <meta http-equiv="refresh" content="0; URL=/de-de/">
     - <meta content="0;url=https://example.com" http-equiv="refresh">
     """
-    soup = BeautifulSoup(html, "html.parser")
-    meta_refresh = soup.find("meta", attrs={"http-equiv": re.compile(r"refresh", re.I)})
+    base_url = page.url
+    content = page.meta.get("refresh")
 
-    if meta_refresh:
-        content = meta_refresh.get("content", "")
+    if content:
         # Parse the content - format is typically "delay; url=redirect_url"
         match = re.search(r"url\s*=\s*([^\s;\"']+)", content, re.IGNORECASE)
         if match:
@@ -418,36 +379,257 @@ async def try_clearbit_logo(domain: str, website_url: str) -> Optional["LogoCraw
     """
     clearbit_url = f"https://logo.clearbit.com/{domain}"
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.head(clearbit_url)
-            if resp.status_code == 200:
-                logo = LogoResult(
-                    url=clearbit_url,
-                    confidence=0.95,
-                    description="Logo from Clearbit API",
-                    page_url=website_url,
-                    image_hash=hashlib.md5(clearbit_url.encode()).hexdigest(),
-                    is_header=True,
-                    rank_score=2.0,
-                )
-                logger.info(f"Clearbit logo found for {domain}: {clearbit_url}")
-                return LogoCrawlResponse(
-                    logos=[logo],
-                    best_logo=logo,
-                    website_url=website_url,
-                    images_analyzed=1,
-                )
+        client = get_http_client("api")
+        resp = await client.head(clearbit_url, timeout=5.0, follow_redirects=False)
+        if resp.status_code == 200:
+            logo = LogoResult(
+                url=clearbit_url,
+                confidence=0.95,
+                description="Logo from Clearbit API",
+                page_url=website_url,
+                image_hash=hashlib.md5(clearbit_url.encode()).hexdigest(),
+                is_header=True,
+                rank_score=2.0,
+            )
+            logger.info(f"Clearbit logo found for {domain}: {clearbit_url}")
+            return LogoCrawlResponse(
+                logos=[logo],
+                best_logo=logo,
+                website_url=website_url,
+                images_analyzed=1,
+            )
     except Exception as e:
         logger.debug(f"Clearbit check failed for {domain}: {e}")
     return None
 
 
+# ==================== Page Fetch ====================
+
+async def fetch_page(client: httpx.AsyncClient, url: str) -> Optional[ParsedPage]:
+    """Fetch the page (following meta refresh stubs) and parse it once.
+
+    Page HTML comes from the shared fetch cache, so a health check or company
+    analysis of the same site moments earlier is not downloaded again.
+    """
+    try:
+        response = await fetch_cached(url, timeout=20.0, client=client)
+        if response.status_code != 200:
+            logger.error(f"Failed to fetch website: {response.status_code}")
+            return None
+        # Use final URL after redirects
+        page = ParsedPage(response.text, response.final_url)
+        logger.info(f"Final URL after redirects: {page.url}")
+
+        # Check for meta refresh redirect (not followed by httpx)
+        # This handles sites like helpify.net that use <meta http-equiv="refresh">
+        if len(page.html) < 500:  # Only check short pages that might be redirect stubs
+            meta_refresh_url = extract_meta_refresh_url(page)
+            if meta_refresh_url:
+                logger.info(f"Found meta refresh redirect to: {meta_refresh_url}")
+                # Follow the meta refresh redirect
+                response = await fetch_cached(meta_refresh_url, timeout=20.0, client=client)
+                if response.status_code == 200:
+                    page = ParsedPage(response.text, response.final_url)
+                    logger.info(f"Followed meta refresh to: {page.url}")
+        return page
+    except httpx.RequestError as e:
+        logger.error(f"Failed to fetch website: {e}")
+        return None
+
+
+# ==================== Candidate Pipeline ====================
+
+# Concurrent image downloads/decodes and vision calls per crawl
+DEFAULT_FETCH_CONCURRENCY = 8
+DEFAULT_VISION_CONCURRENCY = 4
+
+# A header image with "logo" in its URL at this confidence ends the crawl early
+DEFAULT_EARLY_STOP_CONFIDENCE = 0.9
+
+
+async def process_favicon(
+    client: httpx.AsyncClient,
+    favicon_url: str,
+    page_url: str,
+    processed_hashes: set,
+) -> Optional[LogoResult]:
+    """Fetch a favicon and turn it into a high-priority logo result (no vision call)."""
+    try:
+        processed = await fetch_and_process_image(client, favicon_url, page_url, min_size=16)
+        if not processed:
+            return None
+        image_base64, image_hash = processed
+        if image_hash in processed_hashes:
+            return None
+        processed_hashes.add(image_hash)
+        # apple-touch-icon is higher quality than favicon.ico
+        is_apple_touch = "apple-touch" in favicon_url.lower()
+        logger.info(f"Added favicon as logo: {favicon_url} (apple-touch: {is_apple_touch})")
+        return LogoResult(
+            url=favicon_url,
+            confidence=0.92 if is_apple_touch else 0.88,
+            description="Apple Touch Icon (high-res logo)" if is_apple_touch else "Favicon/icon from HTML meta tags",
+            page_url=page_url,
+            image_hash=image_hash,
+            is_header=True,
+            rank_score=1.8 if is_apple_touch else 1.5,  # Highest priority - favicons are actual logos
+        )
+    except Exception as e:
+        logger.debug(f"Error processing favicon {favicon_url}: {e}")
+        return None
+
+
+async def process_og_image(
+    client: httpx.AsyncClient,
+    og_url: str,
+    page_url: str,
+    processed_hashes: set,
+) -> Optional[LogoResult]:
+    """Fetch og:image as a LOW priority fallback - it's usually a social sharing BANNER."""
+    logger.info(f"Processing og:image (low priority fallback): {og_url}")
+    try:
+        processed = await fetch_and_process_image(client, og_url, page_url, min_size=32)
+        if not processed:
+            return None
+        image_base64, image_hash = processed
+        if image_hash in processed_hashes:
+            return None
+        # Check aspect ratio - skip wide banners (social sharing images are typically 1200x630)
+        try:
+            img = Image.open(io.BytesIO(base64.b64decode(image_base64)))
+            width, height = img.size
+            aspect_ratio = width / height if height > 0 else 999
+            if aspect_ratio > 1.8:
+                logger.info(f"Skipping og:image - too wide (aspect ratio: {aspect_ratio:.2f}), likely a social banner")
+                return None
+        except Exception as e:
+            logger.debug(f"Could not check og:image aspect ratio: {e}")
+        
+        processed_hashes.add(image_hash)
+        logger.info(f"Stored og:image as fallback: {og_url}")
+        return LogoResult(
+            url=og_url,
+            confidence=0.60,  # Low confidence - og:image is often NOT the logo
+            description="og:image meta tag (social sharing image - may not be actual logo)",
+            page_url=page_url,
+            image_hash=image_hash,
+            is_header=False,
+            rank_score=0.3,  # LOW priority - only use as last resort
+        )
+    except Exception as e:
+        logger.warning(f"Error processing og:image {og_url}: {type(e).__name__}: {e}")
+        return None
+
+
+async def classify_candidates(
+    client: httpx.AsyncClient,
+    images_to_analyze: List[str],
+    header_images: set,
+    page_url: str,
+    processed_hashes: set,
+    confidence_threshold: float,
+    fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    vision_concurrency: int = DEFAULT_VISION_CONCURRENCY,
+    early_stop_confidence: float = DEFAULT_EARLY_STOP_CONFIDENCE,
+) -> tuple:
+    """Run candidate images through fetch → decode/resize → dedupe → vision classify.
+    
+    Each stage is bounded by its own semaphore so downloads overlap with vision calls.
+    Candidates start in priority order; once a header image with "logo" in its URL
+    classifies at >= early_stop_confidence, remaining work is cancelled.
+    
+    Returns:
+        (results, images_analyzed) - results are unsorted
+    """
+    fetch_semaphore = asyncio.Semaphore(max(1, fetch_concurrency))
+    vision_semaphore = asyncio.Semaphore(max(1, vision_concurrency))
+    api_client = get_http_client("api")  # vision calls use the API profile, not the crawl client
+    found = asyncio.Event()
+    results: List[LogoResult] = []
+    fetched = 0
+    
+    async def process(image_url: str) -> None:
+        nonlocal fetched
+        async with fetch_semaphore:
+            if found.is_set():
+                return
+            processed = await fetch_and_process_image(client, image_url, page_url)
+            fetched += 1
+        if not processed:
+            return
+        
+        image_base64, image_hash = processed
+        
+        # Skip duplicates (first fetch of an image wins)
+        if image_hash in processed_hashes:
+            return
+        processed_hashes.add(image_hash)
+        
+        async with vision_semaphore:
+            if found.is_set():
+                return
+            result = await analyze_image_with_openai(api_client, image_base64, image_url, page_url)
+        
+        if not result or result.confidence < confidence_threshold:
+            return
+        # Filter out non-company logos
+        if not is_company_logo(result.description, image_url):
+            return
+        
+        result.is_header = image_url in header_images
+        has_logo_in_url = "logo" in image_url.lower()
+        
+        # Calculate rank score with boosts
+        rank_multiplier = 1.0
+        if result.is_header:
+            rank_multiplier *= 1.3  # Header images are likely logos
+        if has_logo_in_url:
+            rank_multiplier *= 1.4  # "logo" in URL is strong signal
+        
+        result.rank_score = result.confidence * rank_multiplier
+        results.append(result)
+        logger.info(f"Found logo: {image_url} (confidence: {result.confidence:.2f}, rank: {result.rank_score:.2f}, header: {result.is_header}, logo_url: {has_logo_in_url})")
+        
+        if result.is_header and has_logo_in_url and result.confidence >= early_stop_confidence:
+            found.set()
+    
+    async def guarded(image_url: str) -> None:
+        try:
+            await process(image_url)
+        except Exception as e:
+            logger.debug(f"Error processing {image_url}: {e}")
+    
+    # Tasks are created in priority order, so semaphore slots go to header/"logo" images first
+    tasks = [asyncio.create_task(guarded(image_url)) for image_url in images_to_analyze]
+    if not tasks:
+        return results, 0
+    
+    all_done = asyncio.gather(*tasks, return_exceptions=True)
+    stop = asyncio.create_task(found.wait())
+    try:
+        await asyncio.wait([all_done, stop], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stop.cancel()
+        for task in tasks:
+            task.cancel()
+        await all_done
+    
+    if found.is_set():
+        logger.info(f"Early stop: high-confidence logo found after {fetched}/{len(images_to_analyze)} images")
+    
+    return results, fetched
+
+
 # ==================== Main Function ====================
 
 async def crawl_for_logos(
     website_url: str,
     max_images: int = 20,
     confidence_threshold: float = 0.7,
+    fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    vision_concurrency: int = DEFAULT_VISION_CONCURRENCY,
+    early_stop_confidence: float = DEFAULT_EARLY_STOP_CONFIDENCE,
+    page: Optional[ParsedPage] = None,
 ) -> LogoCrawlResponse:
     """Crawl a website and detect company logos.
     
@@ -455,6 +637,11 @@ async def crawl_for_logos(
         website_url: URL of the website to crawl
         max_images: Maximum number of images to analyze
         confidence_threshold: Minimum confidence score for logo detection
+        fetch_concurrency: Max concurrent image downloads/decodes
+        vision_concurrency: Max concurrent GPT-4o-mini vision calls
+        early_stop_confidence: Stop once a header "logo" image reaches this confidence
+            (set above 1.0 to always analyze every candidate)
+        page: Already fetched/parsed homepage (skips the page fetch and parse)
         
     Returns:
         LogoCrawlResponse with detected logos and best logo
@@ -477,202 +664,106 @@ async def crawl_for_logos(
     
     logger.info(f"Clearbit unavailable for {domain}, falling back to crawler...")
     
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        # Fetch page
-        try:
-            response = await client.get(url, timeout=20.0, headers=BROWSER_HEADERS)
-            if response.status_code != 200:
-                logger.error(f"Failed to fetch website: {response.status_code}")
-                return LogoCrawlResponse(
-                    logos=[],
-                    best_logo=None,
-                    website_url=url,
-                    images_analyzed=0,
-                )
-            html = response.text
-            # Update URL to final redirected URL
-            url = str(response.url)
-            logger.info(f"Final URL after redirects: {url}")
-
-            # Check for meta refresh redirect (not followed by httpx)
-            # This handles sites like helpify.net that use <meta http-equiv="refresh">
-            if len(html) < 500:  # Only check short pages that might be redirect stubs
-                meta_refresh_url = extract_meta_refresh_url(html, url)
-                if meta_refresh_url:
-                    logger.info(f"Found meta refresh redirect to: {meta_refresh_url}")
-                    # Follow the meta refresh redirect
-                    response = await client.get(meta_refresh_url, timeout=20.0, headers=BROWSER_HEADERS)
-                    if response.status_code == 200:
-                        html = response.text
-                        url = str(response.url)
-                        logger.info(f"Followed meta refresh to: {url}")
-        except httpx.RequestError as e:
-            logger.error(f"Failed to fetch website: {e}")
+    client = get_http_client("web")
+    if page is None:
+        page = await fetch_page(client, url)
+        if page is None:
             return LogoCrawlResponse(
                 logos=[],
                 best_logo=None,
                 website_url=url,
                 images_analyzed=0,
             )
+    url = page.url or url
+    logger.info(f"HTML length: {len(page.html)}")
         
-        # Parse HTML
-        soup = BeautifulSoup(html, "html.parser")
-        logger.info(f"HTML length: {len(html)}")
-        
-        # Extract meta images (favicon, og:image, etc.)
-        meta_images = extract_meta_images(soup, url)
-        logger.info(f"Found meta images: {len(meta_images['favicon'])} favicons, {len(meta_images['og_image'])} og:images")
+    # Extract meta images (favicon, og:image, etc.)
+    meta_images = page.meta_images
+    logger.info(f"Found meta images: {len(meta_images['favicon'])} favicons, {len(meta_images['og_image'])} og:images")
         
-        # Get images
-        header_images = extract_header_images(soup, url)
-        all_images = extract_all_images(soup, url)
-        logger.info(f"Found {len(all_images)} total images before filtering")
+    # Get images
+    header_images = page.header_images
+    all_images = set(page.images)
+    logger.info(f"Found {len(all_images)} total images before filtering")
         
-        # Filter to valid image extensions (more permissive for CDN URLs)
-        valid_extensions = (".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico")
-        # Also include images from known image CDNs even without extensions
-        image_cdns = ("framerusercontent.com", "cloudinary.com", "imgix.net", "cloudfront.net", "unsplash.com")
-        all_images = {
-            img for img in all_images 
-            if any(img.lower().endswith(ext) for ext in valid_extensions) 
-            or "/logo" in img.lower()
-            or any(cdn in img.lower() for cdn in image_cdns)
-        }
-        logger.info(f"After filtering: {len(all_images)} images")
+    # Filter to valid image extensions (more permissive for CDN URLs)
+    valid_extensions = (".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico")
+    # Also include images from known image CDNs even without extensions
+    image_cdns = ("framerusercontent.com", "cloudinary.com", "imgix.net", "cloudfront.net", "unsplash.com")
+    all_images = {
+        img for img in all_images 
+        if any(img.lower().endswith(ext) for ext in valid_extensions) 
+        or "/logo" in img.lower()
+        or any(cdn in img.lower() for cdn in image_cdns)
+    }
+    logger.info(f"After filtering: {len(all_images)} images")
         
-        # Prioritize header images and images with "logo" in URL
-        prioritized = []
-        for img in all_images:
-            if img in header_images or "logo" in img.lower():
-                prioritized.insert(0, img)
-            else:
-                prioritized.append(img)
+    # Prioritize header images and images with "logo" in URL
+    prioritized = []
+    for img in all_images:
+        if img in header_images or "logo" in img.lower():
+            prioritized.insert(0, img)
+        else:
+            prioritized.append(img)
         
-        # Limit to max_images
-        images_to_analyze = prioritized[:max_images]
+    # Limit to max_images
+    images_to_analyze = prioritized[:max_images]
         
-        logger.info(f"Found {len(all_images)} images, analyzing {len(images_to_analyze)}...")
+    logger.info(f"Found {len(all_images)} images, analyzing {len(images_to_analyze)}...")
         
-        # Analyze images
-        results = []
-        processed_hashes = set()
+    processed_hashes = set()
         
-        # Add favicon as HIGH-PRIORITY logo (this is always the actual logo icon)
-        for favicon_url in meta_images["favicon"][:2]:  # Check first 2 favicons (often apple-touch-icon is better)
-            try:
-                processed = await fetch_and_process_image(client, favicon_url, url, min_size=16)
-                if processed:
-                    image_base64, image_hash = processed
-                    if image_hash not in processed_hashes:
-                        processed_hashes.add(image_hash)
-                        # apple-touch-icon is higher quality than favicon.ico
-                        is_apple_touch = "apple-touch" in favicon_url.lower()
-                        results.append(LogoResult(
-                            url=favicon_url,
-                            confidence=0.92 if is_apple_touch else 0.88,
-                            description="Apple Touch Icon (high-res logo)" if is_apple_touch else "Favicon/icon from HTML meta tags",
-                            page_url=url,
-                            image_hash=image_hash,
-                            is_header=True,
-                            rank_score=1.8 if is_apple_touch else 1.5,  # Highest priority - favicons are actual logos
-                        ))
-                        logger.info(f"Added favicon as logo: {favicon_url} (apple-touch: {is_apple_touch})")
-            except Exception as e:
-                logger.debug(f"Error processing favicon {favicon_url}: {e}")
-        
-        # og:image is LOW priority - it's usually a social sharing BANNER, not the logo
-        # Only add it as fallback if we don't find better options
-        og_image_fallback = None
-        for og_url in meta_images["og_image"][:1]:
-            logger.info(f"Processing og:image (low priority fallback): {og_url}")
-            try:
-                processed = await fetch_and_process_image(client, og_url, url, min_size=32)
-                if processed:
-                    image_base64, image_hash = processed
-                    if image_hash not in processed_hashes:
-                        # Check aspect ratio - skip wide banners (social sharing images are typically 1200x630)
-                        try:
-                            img_data = base64.b64decode(image_base64)
-                            img = Image.open(io.BytesIO(img_data))
-                            width, height = img.size
-                            aspect_ratio = width / height if height > 0 else 999
-                            
-                            if aspect_ratio > 1.8:
-                                logger.info(f"Skipping og:image - too wide (aspect ratio: {aspect_ratio:.2f}), likely a social banner")
-                                continue
-                        except Exception as e:
-                            logger.debug(f"Could not check og:image aspect ratio: {e}")
-                        
-                        processed_hashes.add(image_hash)
-                        og_image_fallback = LogoResult(
-                            url=og_url,
-                            confidence=0.60,  # Low confidence - og:image is often NOT the logo
-                            description="og:image meta tag (social sharing image - may not be actual logo)",
-                            page_url=url,
-                            image_hash=image_hash,
-                            is_header=False,
-                            rank_score=0.3,  # LOW priority - only use as last resort
-                        )
-                        logger.info(f"Stored og:image as fallback: {og_url}")
-            except Exception as e:
-                logger.warning(f"Error processing og:image {og_url}: {type(e).__name__}: {e}")
+    # Favicons (HIGH priority, no vision call) and og:image (LOW priority fallback)
+    # are fetched in one gather. og:image works on its own hash set and only claims
+    # its hash afterwards, so a favicon with the same image still wins, as before
+    og_hashes = set()
+    *favicon_results, og_image_fallback = await asyncio.gather(
+        *[
+            process_favicon(client, favicon_url, url, processed_hashes)
+            for favicon_url in meta_images["favicon"][:2]  # First 2 favicons (often apple-touch-icon is better)
+        ],
+        process_og_image(client, meta_images["og_image"][0], url, og_hashes)
+        if meta_images["og_image"] else asyncio.sleep(0),
+    )
+    results = [r for r in favicon_results if r]
+    if og_image_fallback:
+        if og_image_fallback.image_hash in processed_hashes:
+            og_image_fallback = None
+        else:
+            processed_hashes.add(og_image_fallback.image_hash)
         
-        # Process regular images
-        for image_url in images_to_analyze:
-            try:
-                # Fetch and process image
-                processed = await fetch_and_process_image(client, image_url, url)
-                if not processed:
-                    continue
-                
-                image_base64, image_hash = processed
-                
-                # Skip duplicates
-                if image_hash in processed_hashes:
-                    continue
-                processed_hashes.add(image_hash)
-                
-                # Analyze with OpenAI
-                result = await analyze_image_with_openai(client, image_base64, image_url, url)
-                if result and result.confidence >= confidence_threshold:
-                    # Filter out non-company logos
-                    if is_company_logo(result.description, image_url):
-                        result.is_header = image_url in header_images
-                        has_logo_in_url = "logo" in image_url.lower()
-                        
-                        # Calculate rank score with boosts
-                        rank_multiplier = 1.0
-                        if result.is_header:
-                            rank_multiplier *= 1.3  # Header images are likely logos
-                        if has_logo_in_url:
-                            rank_multiplier *= 1.4  # "logo" in URL is strong signal
-                        
-                        result.rank_score = result.confidence * rank_multiplier
-                        results.append(result)
-                        logger.info(f"Found logo: {image_url} (confidence: {result.confidence:.2f}, rank: {result.rank_score:.2f}, header: {result.is_header}, logo_url: {has_logo_in_url})")
-            
-            except Exception as e:
-                logger.debug(f"Error processing {image_url}: {e}")
-                continue
+    # Process regular images through the pipeline
+    candidate_results, images_analyzed = await classify_candidates(
+        client,
+        images_to_analyze,
+        header_images,
+        url,
+        processed_hashes,
+        confidence_threshold,
+        fetch_concurrency=fetch_concurrency,
+        vision_concurrency=vision_concurrency,
+        early_stop_confidence=early_stop_confidence,
+    )
+    results.extend(candidate_results)
         
-        # Sort by rank score
-        results.sort(key=lambda x: x.rank_score, reverse=True)
+    # Sort by rank score
+    results.sort(key=lambda x: x.rank_score, reverse=True)
         
-        # Add og:image fallback only if we have no good results
-        if og_image_fallback and (not results or results[0].rank_score < 0.5):
-            results.append(og_image_fallback)
-            logger.info("Added og:image as fallback since no better logos found")
+    # Add og:image fallback only if we have no good results
+    if og_image_fallback and (not results or results[0].rank_score < 0.5):
+        results.append(og_image_fallback)
+        logger.info("Added og:image as fallback since no better logos found")
         
-        # Determine best logo
-        best_logo = results[0] if results else None
+    # Determine best logo
+    best_logo = results[0] if results else None
         
-        logger.info(f"Found {len(results)} logos, best: {best_logo.url if best_logo else 'None'}")
+    logger.info(f"Found {len(results)} logos, best: {best_logo.url if best_logo else 'None'}")
         
-        return LogoCrawlResponse(
-            logos=results,
-            best_logo=best_logo,
-            website_url=url,
-            images_analyzed=len(images_to_analyze),
-        )
+    return LogoCrawlResponse(
+        logos=results,
+        best_logo=best_logo,
+        website_url=url,
+        images_analyzed=images_analyzed,
+    )
 
 
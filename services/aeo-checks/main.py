@@ -9,14 +9,43 @@ All AEO-related services in one Modal app:
 Endpoint: https://clients--aeo-checks-fastapi-app.modal.run
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from browser_pool import get_browser_pool, close_browser_pool
+from cpu_pool import warm_cpu_pool, close_cpu_pool, cpu_pool_stats
+from fetch_cache import fetch_cache_stats
+from http_clients import init_http_clients, close_http_clients, http_client_stats
+from response_archive import purge_archive_periodically
+from response_cache import purge_expired_periodically
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared pooled resources on startup, close them on shutdown."""
+    await init_http_clients()
+    await asyncio.to_thread(warm_cpu_pool)
+    purge_tasks = [
+        asyncio.create_task(purge_expired_periodically()),
+        asyncio.create_task(purge_archive_periodically()),
+    ]
+    yield
+    for task in purge_tasks:
+        task.cancel()
+    await close_http_clients()
+    await close_browser_pool()
+    close_cpu_pool()
+
+
 # Main app
 app = FastAPI(
     title="AEO Services",
     description="Unified API gateway for AEO analysis services",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -41,9 +70,13 @@ async def root():
             "/company/health": "GET - Company analysis service health",
             # Health Check
             "/health/check": "POST - Website AEO health check (30 checks)",
+            "/health/check/batch": "POST - Bulk health check, streamed as NDJSON with a summary",
             "/health/health": "GET - Health check service status",
             # Mentions Check
             "/mentions/check": "POST - AEO mentions check across AI platforms",
+            "/mentions/check/stream": "POST - Streaming mentions check (NDJSON or SSE, ?format=sse)",
+            "/mentions/check-batch": "POST - Batch mentions check for a cohort of companies",
+            "/mentions/rescore": "POST - Re-score archived mentions checks offline",
             "/mentions/health": "GET - Mentions check service status",
             # Gateway
             "/status": "GET - Gateway status with all service health",
@@ -62,7 +95,11 @@ async def gateway_status():
             "company": "operational",
             "health": "operational",
             "mentions": "operational",
-        }
+        },
+        "browser_pool": get_browser_pool().stats(),
+        "http_clients": http_client_stats(),
+        "cpu_pool": cpu_pool_stats(),
+        "fetch_cache": fetch_cache_stats(),
     }
 
 
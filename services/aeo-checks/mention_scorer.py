@@ -0,0 +1,261 @@
+"""Compiled per-company mention scorer.
+
+Built once per mentions check from the company name, its aliases and the competitor
+list, then scores each AI response in one pass:
+
+    scorer = MentionScorer("Acme", aliases=["Acme Corp"], competitors=[{"name": "Globex"}])
+    score = scorer.score(response_text)
+    score.raw_mentions, score.capped_mentions, score.quality_score
+    score.mention_type, score.position, score.competitor_mentions
+
+Compared to re-building and re-compiling f-string regexes per response:
+- company terms are one precompiled, escaped alternation (counts + list position)
+- mention type is decided with substring searches on the lines that contain the company
+  (same semantics as the old `.*` patterns, which never cross a newline), so there is no
+  backtracking across multi-KB responses
+- competitor names are counted in a single Aho-Corasick pass over the lowercased text
+  when pyahocorasick is installed (substring counts otherwise)
+
+Company names are matched literally (the old patterns interpolated the raw name into
+regexes, so names like "C++ Labs" raised or matched the wrong text).
+"""
+
+import re
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Try to import pyahocorasick for single-pass competitor matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Max mentions counted per response
+MENTION_CAP = 3
+
+# Base scores by mention type (how valuable is this type of mention?)
+BASE_SCORES = {
+    'primary_recommendation': 9.0,   # "I recommend X" - highest value
+    'top_option': 7.0,               # "top/leading/best X" - high value
+    'listed_option': 5.0,            # Listed among options - medium value
+    'mentioned_in_context': 3.0,     # Just mentioned - still valuable
+    'none': 0.0,                     # Not mentioned - no value
+}
+
+_RANK_WORDS = ("top", "leading", "best")
+_LIST_MARKER = re.compile(r"\d+\.")
+_NUMBERED_LINE = re.compile(r'^\s*([\d]+)[\.)\s]')
+_BULLET_LINE = re.compile(r'^\s*[\*\-\•]')
+
+
+@dataclass
+class MentionScore:
+    """Scoring result for one response."""
+    raw_mentions: int = 0
+    capped_mentions: int = 0
+    quality_score: float = 0.0
+    mention_type: str = 'none'
+    position: Optional[int] = None
+    competitor_mentions: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _is_primary(line: str, term: str) -> bool:
+    """Old patterns: 'recommend C', 'C is the best', 'best.*C', 'C.*excellent', 'top choice.*C'."""
+    first = line.find(term)
+    if first == -1:
+        return False
+    last = line.rfind(term)
+    if f"recommend {term}" in line or f"{term} is the best" in line:
+        return True
+    best = line.find("best")
+    if best != -1 and last >= best + 4:
+        return True
+    if line.find("excellent", first + len(term)) != -1:
+        return True
+    top_choice = line.find("top choice")
+    return top_choice != -1 and line.find(term, top_choice + 10) != -1
+
+
+def _is_top(line: str, term: str) -> bool:
+    """Old patterns: '(top|leading|best).*C', 'C.*(top|leading|best)', 'among.*C', 'C.*among.*the'."""
+    first = line.find(term)
+    if first == -1:
+        return False
+    last = line.rfind(term)
+    after = first + len(term)
+    for word in _RANK_WORDS:
+        index = line.find(word)
+        if index != -1 and last >= index + len(word):
+            return True
+        if line.find(word, after) != -1:
+            return True
+    among = line.find("among")
+    if among != -1 and last >= among + 5:
+        return True
+    among = line.find("among", after)
+    return among != -1 and line.find("the", among + 5) != -1
+
+
+class MentionScorer:
+    """Scores responses for one company (and counts its competitors)."""
+
+    def __init__(
+        self,
+        company_name: str,
+        aliases: Optional[Iterable[str]] = None,
+        competitors: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.company_name = company_name
+        terms: List[str] = [company_name] if company_name else []
+        for alias in aliases or []:
+            alias = (alias or "").strip()
+            if alias and alias.lower() not in {t.lower() for t in terms}:
+                terms.append(alias)
+        self.terms = terms
+        self._terms_lower = [t.lower() for t in terms]
+        # Longest first so "Acme Corp" wins over "Acme" at the same position
+        self._company_re = (
+            re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+            if terms else None
+        )
+
+        # (display name, lowercased name) in competitor list order
+        self._competitors: List[Tuple[str, str]] = [
+            (c.get("name", ""), c.get("name", "").lower())
+            for c in (competitors or []) if c.get("name", "")
+        ]
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self._competitors:
+            automaton = ahocorasick.Automaton()
+            for _, lowered in self._competitors:
+                automaton.add_word(lowered, lowered)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    # ==================== Scoring ====================
+
+    def score(self, text: str) -> MentionScore:
+        """Score one response."""
+        text = text or ""
+        text_lower = text.lower()
+        competitor_mentions = self.competitor_mentions(text, text_lower)
+
+        matches = list(self._company_re.finditer(text)) if self._company_re else []
+        if not matches:
+            return MentionScore(competitor_mentions=competitor_mentions)
+
+        raw_mentions = len(matches)
+        capped_mentions = min(raw_mentions, MENTION_CAP)
+        mention_type = self._mention_type(text, text_lower)
+        position = self._list_position(text, matches)
+
+        base_score = BASE_SCORES.get(mention_type, 3.0)
+
+        # Position bonus (additive - rewards being listed first)
+        position_bonus = 0.0
+        if position:
+            if position == 1:
+                position_bonus = 2.0   # #1 position is valuable
+            elif position <= 3:
+                position_bonus = 1.0   # Top 3 is good
+            elif position <= 5:
+                position_bonus = 0.5   # Top 5 is okay
+            # 6+ gets no bonus
+
+        # Multiple mentions bonus (small additive bonus for repeated mentions)
+        mention_bonus = min(1.0, (capped_mentions - 1) * 0.5)  # 0, 0.5, or 1.0
+
+        quality_score = min(10.0, base_score + position_bonus + mention_bonus)
+
+        return MentionScore(
+            raw_mentions=raw_mentions,
+            capped_mentions=capped_mentions,
+            quality_score=round(quality_score, 2),
+            mention_type=mention_type,
+            position=position,
+            competitor_mentions=competitor_mentions,
+        )
+
+    def score_many(self, texts: Iterable[str]) -> List[MentionScore]:
+        """Score a batch of responses (same order)."""
+        return [self.score(text) for text in texts]
+
+    # ==================== Components ====================
+
+    def _mention_type(self, text: str, text_lower: str) -> str:
+        terms = [t for t in self._terms_lower if t in text_lower]
+        lines = [line for line in text_lower.split("\n") if any(t in line for t in terms)] if terms else []
+
+        if any(_is_primary(line, t) for line in lines for t in terms):
+            return 'primary_recommendation'
+        if any(_is_top(line, t) for line in lines for t in terms):
+            return 'top_option'
+
+        # Old pattern on the original text: "\d+\.|\*.*<lowercased name>"
+        if _LIST_MARKER.search(text):
+            return 'listed_option'
+        for term in self._terms_lower:
+            if term not in text:
+                continue
+            for line in text.split("\n"):
+                star = line.find("*")
+                if star != -1 and line.find(term, star + 1) != -1:
+                    return 'listed_option'
+
+        if terms:
+            return 'mentioned_in_context'
+        return 'none'
+
+    @staticmethod
+    def _list_position(text: str, matches: List["re.Match"]) -> Optional[int]:
+        """Number of the first numbered line mentioning the company, or line index + 1 for bullets."""
+        line_index = 0
+        scanned_to = 0
+        line_end = -1
+        for match in matches:
+            start = match.start()
+            if start <= line_end:
+                continue  # same line as a previous match
+            line_index += text.count("\n", scanned_to, start)
+            scanned_to = start
+            line_start = text.rfind("\n", 0, start) + 1
+            line_end = text.find("\n", start)
+            if line_end == -1:
+                line_end = len(text)
+            line = text[line_start:line_end]
+
+            numbered = _NUMBERED_LINE.match(line)
+            if numbered:
+                return int(numbered.group(1))
+            if _BULLET_LINE.match(line):
+                return line_index + 1
+        return None
+
+    def competitor_mentions(self, text: str, text_lower: Optional[str] = None) -> List[Dict[str, Any]]:
+        """[{"name", "count"}] for competitors mentioned in the text (competitor list order)."""
+        if not self._competitors:
+            return []
+        if text_lower is None:
+            text_lower = text.lower()
+
+        if self._automaton is not None:
+            counts: Dict[str, int] = {}
+            next_free: Dict[str, int] = {}
+            for end, lowered in self._automaton.iter(text_lower):
+                start = end - len(lowered) + 1
+                # Non-overlapping counts per name, like re.findall
+                if start >= next_free.get(lowered, 0):
+                    counts[lowered] = counts.get(lowered, 0) + 1
+                    next_free[lowered] = end + 1
+        else:
+            counts = {lowered: text_lower.count(lowered) for _, lowered in self._competitors}
+
+        return [
+            {"name": name, "count": counts[lowered]}
+            for name, lowered in self._competitors
+            if counts.get(lowered)
+        ]
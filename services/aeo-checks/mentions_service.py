@@ -10,28 +10,42 @@ Gemini uses native Google SDK with integrated search grounding for better accura
 Other platforms use DataForSEO SERP via scaile-services google_search tool.
 
 Features:
-- Quality-adjusted scoring with mention capping (max 3 per response)
+- Quality-adjusted scoring with mention capping (max 3 per response), compiled once per check
 - Position detection (#1 in list gets boost)
 - Dimension-based query generation (Branded, Service-Specific, etc.)
 - Fast mode (10 queries, Gemini only) vs Full mode (50 queries, all platforms)
+- Adaptive per-platform concurrency (AIMD scheduler, backs off on 429s)
+- Response cache keyed by (platform, model, query, company) - memory LRU + SQLite
+- Streaming variant (/check/stream) emitting per-query results as NDJSON or SSE
+- Cohort batches (/check-batch): identical non-branded queries sent once per platform
+- Full responses archived (zstd/gzip blobs + SQLite index); /rescore recomputes results offline
 
 v4: GPT-4.1 for ChatGPT, DataForSEO SERP for all platforms
 """
 
 import os
 import re
+import json
 import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Optional, List, Dict, Any, Literal, AsyncIterator, Awaitable, Callable
 from datetime import datetime
 
 import httpx
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from ai_client import AIClient
 from gemini_client import get_gemini_client
+from adaptive_sampling import AdaptiveStopper, DEFAULT_MIN_RESPONSES, interleave_by_dimension
+from mention_scorer import MentionScorer
+from platform_scheduler import PlatformScheduler, SchedulerWindow, DEFAULT_MAX_CONCURRENCY
+from response_archive import get_response_archive
+from response_cache import ResponseCache, MemoryLRUBackend, SQLiteBackend, CacheCounters
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -68,27 +82,57 @@ AI_PLATFORMS = {
         "has_search": True,  # Native search built-in
         "needs_tool": False,  # Perplexity has native web search
         "provider": None,
+        "max_concurrency": 8,  # Max in-flight calls (AIMD scheduler backs off on 429s)
+        "cache_ttl_seconds": 12 * 3600,  # Response cache TTL (live web answers - shorter)
     },
     "claude": {
         "model": "anthropic/claude-3.5-sonnet",
         "has_search": True,
         "needs_tool": True,  # Uses google_search tool → DataForSEO
         "provider": None,
+        "max_concurrency": 6,
+        "cache_ttl_seconds": 24 * 3600,
     },
     "chatgpt": {
         "model": "openai/gpt-4.1",  # GPT-4.1 (newer, better reasoning)
         "has_search": True,
         "needs_tool": True,  # Uses google_search tool → DataForSEO
         "provider": "openai",  # Force OpenAI provider (Azure requires BYOK)
+        "max_concurrency": 8,
+        "cache_ttl_seconds": 24 * 3600,
     },
     "gemini": {
         "model": "google/gemini-3-pro-preview",
         "has_search": True,
         "needs_tool": True,  # Uses google_search tool → DataForSEO
         "provider": None,
+        "max_concurrency": 10,
+        "cache_ttl_seconds": 24 * 3600,
     },
 }
 
+# Response cache config (SQLite file shared by all workers on the host)
+RESPONSE_CACHE_DB = os.getenv("MENTIONS_CACHE_DB", "/tmp/aeo_mentions_cache.sqlite")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("MENTIONS_CACHE_MAX_ENTRIES", "2000"))
+
+_response_cache = None
+
+def get_response_cache() -> ResponseCache:
+    """Get shared response cache (lazy initialization, memory-only if SQLite is unavailable)."""
+    global _response_cache
+    if _response_cache is None:
+        backends = [MemoryLRUBackend(max_entries=RESPONSE_CACHE_MAX_ENTRIES)]
+        if RESPONSE_CACHE_DB:
+            try:
+                backends.append(SQLiteBackend(RESPONSE_CACHE_DB))
+            except Exception as e:
+                logger.warning(f"SQLite response cache unavailable ({RESPONSE_CACHE_DB}): {e} - using memory only")
+        _response_cache = ResponseCache(
+            backends=backends,
+            ttl_by_platform={p: c["cache_ttl_seconds"] for p, c in AI_PLATFORMS.items() if "cache_ttl_seconds" in c},
+        )
+    return _response_cache
+
 
 # ==================== Request/Response Models ====================
 
@@ -100,6 +144,10 @@ class CompanyAnalysis(BaseModel):
 
 class MentionsCheckRequest(BaseModel):
     companyName: str
+    companyAliases: List[str] = Field(
+        default_factory=list,
+        description="Other names counted as company mentions (e.g. 'Acme Corp', product brand)"
+    )
     companyAnalysis: CompanyAnalysis = Field(
         ...,  # Required field
         description="Company analysis data (required for targeted query generation)"
@@ -110,6 +158,43 @@ class MentionsCheckRequest(BaseModel):
     mode: str = Field(default="full", description="'full' (50 queries, all platforms) or 'fast' (10 queries, Gemini + ChatGPT only)")
     generateInsights: bool = False
     platforms: Optional[List[str]] = None  # If None, use all platforms
+    cache_policy: Literal["use", "refresh", "bypass"] = Field(
+        default="use",
+        description="'use' (read + write cache), 'refresh' (re-query and overwrite cache) or 'bypass' (no cache)"
+    )
+    archive: bool = Field(default=False, description="Store full platform responses in the local response archive (for offline re-scoring; opt-in)")
+    adaptive: Optional["AdaptiveConfig"] = Field(
+        default=None,
+        description="Opt-in early stopping (POST /check): stop issuing queries once the visibility band is statistically settled or a budget is reached"
+    )
+
+
+class AdaptiveConfig(BaseModel):
+    """Early-stopping settings (numQueries becomes the maximum)."""
+    confidence: float = Field(default=0.95, ge=0.5, lt=1.0, description="Confidence level of the presence-rate interval")
+    min_responses: int = Field(default=DEFAULT_MIN_RESPONSES, ge=1, description="Never stop before this many scored responses")
+    window: int = Field(default=8, ge=1, description="Queries in flight at once (smaller = earlier stop, larger = faster)")
+    max_calls: Optional[int] = Field(default=None, ge=1, description="Live platform call budget (cache hits are free)")
+    max_seconds: Optional[float] = Field(default=None, gt=0, description="Latency budget; in-flight queries are cancelled when reached")
+
+
+class AdaptiveStats(BaseModel):
+    """Outcome of an adaptive mentions check."""
+    stop_reason: str  # band_settled / call_budget / time_budget / exhausted
+    confidence: float
+    queries_planned: int
+    queries_issued: int
+    calls_planned: int
+    calls_made: int  # Live platform calls (cache hits excluded)
+    calls_saved: int  # calls_planned - calls_made (not issued or served from cache)
+    calls_cached: int = 0
+    presence_interval: List[float]  # Pooled presence rate interval (0-100%)
+    visibility_interval: List[float]  # Implied visibility interval (0-100%)
+    band_settled: bool
+    platform_presence_intervals: Dict[str, List[float]] = Field(default_factory=dict)  # 0-1
+
+
+MentionsCheckRequest.model_rebuild()
 
 
 class QueryResult(BaseModel):
@@ -143,6 +228,13 @@ class DimensionStats(BaseModel):
     queries: int
 
 
+class CacheStats(BaseModel):
+    policy: str = "use"
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+
 class TLDRSummary(BaseModel):
     """TL;DR summary with actionable insights and brand confusion detection."""
     visibility_assessment: str
@@ -169,6 +261,70 @@ class MentionsCheckResponse(BaseModel):
     total_tokens: int
     mode: str
     tldr: TLDRSummary
+    cache: CacheStats = Field(default_factory=CacheStats)
+    timing: Dict[str, Any] = Field(default_factory=dict)  # Phase durations + scheduler stats for the check's platforms (counters since the check started)
+    adaptive: Optional[AdaptiveStats] = None  # Only set for adaptive (early-stopping) checks
+    archive_id: Optional[str] = None  # Response archive check id (see /rescore)
+
+
+# ==================== Batch (Cohort) Models ====================
+
+class BatchCompany(BaseModel):
+    """One company of a batch mentions check."""
+    companyName: str
+    companyAliases: List[str] = Field(default_factory=list)
+    companyAnalysis: CompanyAnalysis
+
+
+class MentionsBatchRequest(BaseModel):
+    """Mentions check for a cohort of companies sharing language/country/platforms."""
+    companies: List[BatchCompany] = Field(..., min_length=1)
+    language: str = "english"
+    country: str = "DE"
+    numQueries: int = 50
+    mode: str = "full"
+    platforms: Optional[List[str]] = None
+    cache_policy: Literal["use", "refresh", "bypass"] = "use"
+    max_concurrent_generation: int = Field(default=5, ge=1, description="Companies generating queries at once")
+
+
+class CohortCompanyStats(BaseModel):
+    """A company scored against every unique neutral response of the cohort.
+    
+    Only responses to queries that are non-branded for every cohort company count,
+    and company-specific platforms (native Gemini, whose prompt names one company)
+    are left out: either would bias share of voice toward one company.
+    """
+    responses_scored: int
+    responses_mentioning: int
+    presence_rate: float  # % of all cohort responses mentioning the company
+    mentions: int  # Capped mentions across all cohort responses
+    share_of_voice: float  # % of cohort mentions (all cohort companies) going to this company
+
+
+class CohortCompetitorStats(BaseModel):
+    """A competitor (of any cohort company, not itself in the cohort) counted over the same responses."""
+    responses_mentioning: int
+    mentions: int  # Raw (uncapped) name occurrences
+
+
+class BatchDedupeStats(BaseModel):
+    queries_total: int  # Sum of queries over all companies
+    unique_queries: int
+    shared_queries: int  # Non-branded queries used by 2+ companies
+    calls_without_dedupe: int
+    calls_made: int
+    calls_saved: int
+
+
+class MentionsBatchResponse(BaseModel):
+    results: Dict[str, MentionsCheckResponse]  # By company name
+    errors: Dict[str, Any] = Field(default_factory=dict)  # Companies that failed validation/generation
+    cohort: Dict[str, CohortCompanyStats] = Field(default_factory=dict)
+    cohort_competitors: Dict[str, CohortCompetitorStats] = Field(default_factory=dict)
+    dedupe: BatchDedupeStats
+    cache: CacheStats = Field(default_factory=CacheStats)
+    execution_time_seconds: float
 
 
 # ==================== TL;DR Generation Functions ====================
@@ -341,57 +497,6 @@ def generate_tldr_summary(
 
 # ==================== Quality Scoring Functions ====================
 
-def detect_mention_type(text: str, company_name: str) -> str:
-    """Detect mention quality type."""
-    text_lower = text.lower()
-    company_lower = company_name.lower()
-
-    recommend_patterns = [
-        f"recommend {company_lower}",
-        f"{company_lower} is the best",
-        f"best.*{company_lower}",
-        f"{company_lower}.*excellent",
-        f"top choice.*{company_lower}"
-    ]
-
-    for pattern in recommend_patterns:
-        if re.search(pattern, text_lower):
-            return 'primary_recommendation'
-
-    # Check for top/leading patterns (more flexible)
-    top_patterns = [
-        f"(top|leading|best).*{company_lower}",
-        f"{company_lower}.*(top|leading|best)",
-        f"among.*{company_lower}",
-        f"{company_lower}.*among.*the",
-    ]
-    
-    for pattern in top_patterns:
-        if re.search(pattern, text_lower):
-            return 'top_option'
-
-    if re.search(f"\\d+\\.|\\*.*{company_lower}", text):
-        return 'listed_option'
-
-    if company_lower in text_lower:
-        return 'mentioned_in_context'
-
-    return 'none'
-
-
-def detect_list_position(text: str, company_name: str) -> Optional[int]:
-    """Detect position in numbered/bulleted lists."""
-    lines = text.split('\n')
-    for i, line in enumerate(lines):
-        if re.search(re.escape(company_name), line, re.IGNORECASE):
-            match = re.match(r'^\s*([\d]+)[\.)\s]', line)
-            if match:
-                return int(match.group(1))
-            if re.match(r'^\s*[\*\-\•]', line):
-                return i + 1
-    return None
-
-
 def count_mentions(text: str, company_name: str) -> Dict[str, Any]:
     """Count and cap mentions with quality scoring.
     
@@ -407,68 +512,22 @@ def count_mentions(text: str, company_name: str) -> Dict[str, Any]:
     - Moderate (30-50%): Regularly appears in lists
     - Weak (10-30%): Occasionally mentioned
     - Minimal (<10%): Rarely or never mentioned
-    """
-    raw_mentions = len(re.findall(re.escape(company_name), text, re.IGNORECASE))
     
-    if raw_mentions == 0:
-        return {
-            'raw_mentions': 0,
-            'capped_mentions': 0,
-            'quality_score': 0.0,
-            'mention_type': 'none',
-            'position': None,
-        }
-
-    capped_mentions = min(raw_mentions, 3)  # Cap at 3
-    mention_type = detect_mention_type(text, company_name)
-    position = detect_list_position(text, company_name)
-
-    # Base scores by mention type (how valuable is this type of mention?)
-    # These are the PRIMARY component of the score
-    base_scores = {
-        'primary_recommendation': 9.0,   # "I recommend X" - highest value
-        'top_option': 7.0,               # "top/leading/best X" - high value
-        'listed_option': 5.0,            # Listed among options - medium value
-        'mentioned_in_context': 3.0,     # Just mentioned - still valuable
-        'none': 0.0,                     # Not mentioned - no value
-    }
-    base_score = base_scores.get(mention_type, 3.0)
-
-    # Position bonus (additive - rewards being listed first)
-    position_bonus = 0.0
-    if position:
-        if position == 1:
-            position_bonus = 2.0   # #1 position is valuable
-        elif position <= 3:
-            position_bonus = 1.0   # Top 3 is good
-        elif position <= 5:
-            position_bonus = 0.5   # Top 5 is okay
-        # 6+ gets no bonus
-
-    # Multiple mentions bonus (small additive bonus for repeated mentions)
-    mention_bonus = min(1.0, (capped_mentions - 1) * 0.5)  # 0, 0.5, or 1.0
-
-    quality_score = min(10.0, base_score + position_bonus + mention_bonus)
-
+    For many responses build one MentionScorer and reuse it (this compiles per call).
+    """
+    score = MentionScorer(company_name).score(text)
     return {
-        'raw_mentions': raw_mentions,
-        'capped_mentions': capped_mentions,
-        'quality_score': round(quality_score, 2),
-        'mention_type': mention_type,
-        'position': position,
+        'raw_mentions': score.raw_mentions,
+        'capped_mentions': score.capped_mentions,
+        'quality_score': score.quality_score,
+        'mention_type': score.mention_type,
+        'position': score.position,
     }
 
 
 def extract_competitor_mentions(text: str, competitors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Extract competitor mentions from response."""
-    results = []
-    for comp in competitors:
-        name = comp.get("name", "")
-        if name:
-            count = len(re.findall(re.escape(name), text, re.IGNORECASE))
-            if count > 0:
-                results.append({"name": name, "count": count})
-    return results
+    return MentionScorer("", competitors=competitors).competitor_mentions(text)
 
 
 # ==================== Query Generation Helpers ====================
@@ -737,7 +796,7 @@ Return exactly {num_queries} queries as a JSON array:
         
         from google.genai import types
         
-        response = client.client.models.generate_content(
+        response = await client.client.aio.models.generate_content(
             model="gemini-2.5-flash",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -985,34 +1044,63 @@ async def query_platform_with_company(
     query: str,
     model_config: Dict[str, Any],
     company_name: str,
+    cache_policy: str = "use",
+    cache_counters: Optional[CacheCounters] = None,
+    scheduler: Optional[PlatformScheduler] = None,
 ) -> Dict[str, Any]:
-    """Query Gemini platform with native SDK and company name."""
+    """Query Gemini platform with native SDK and company name (cached per company)."""
+    if platform != "gemini":
+        # Fallback to regular query_platform for non-Gemini
+        return await query_platform(platform, query, model_config, cache_policy, cache_counters, scheduler)
+    
+    return await get_response_cache().get_or_call(
+        platform,
+        model_config["model"],
+        query,
+        company_name,  # Gemini prompt embeds the company name
+        _scheduled(scheduler, platform, partial(_query_gemini_with_company, platform, query, company_name)),
+        policy=cache_policy,
+        counters=cache_counters,
+    )
+
+
+def _scheduled(
+    scheduler: Optional[PlatformScheduler],
+    platform: str,
+    call: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Callable[[], Awaitable[Dict[str, Any]]]:
+    """Route a live platform call through the scheduler (cache hits never take a slot)."""
+    return partial(scheduler.run, platform, call) if scheduler else call
+
+
+async def _query_gemini_with_company(
+    platform: str,
+    query: str,
+    company_name: str,
+) -> Dict[str, Any]:
+    """Uncached native Gemini query with search grounding."""
     try:
-        if platform == "gemini":
-            result = await get_gemini_client().query_mentions_with_search_grounding(query, company_name)
-            
-            if result.get("success"):
-                return {
-                    "platform": platform,
-                    "query": query,
-                    "response": result["response"],
-                    "model": result["model"],
-                    "has_search_grounding": True,
-                    "search_enabled": True,
-                    "provider": "native_gemini"
-                }
-            else:
-                return {
-                    "platform": platform,
-                    "query": query,
-                    "error": result.get("error", "Unknown Gemini error"),
-                    "response": "",
-                    "model": "gemini-3-pro-preview",
-                    "has_search_grounding": True
-                }
+        result = await get_gemini_client().query_mentions_with_search_grounding(query, company_name)
+        
+        if result.get("success"):
+            return {
+                "platform": platform,
+                "query": query,
+                "response": result["response"],
+                "model": result["model"],
+                "has_search_grounding": True,
+                "search_enabled": True,
+                "provider": "native_gemini"
+            }
         else:
-            # Fallback to regular query_platform for non-Gemini
-            return await query_platform(platform, query, model_config)
+            return {
+                "platform": platform,
+                "query": query,
+                "error": result.get("error", "Unknown Gemini error"),
+                "response": "",
+                "model": "gemini-3-pro-preview",
+                "has_search_grounding": True
+            }
             
     except Exception as e:
         logger.error(f"{platform} query error: {e}")
@@ -1023,8 +1111,28 @@ async def query_platform(
     platform: str,
     query: str,
     model_config: Dict[str, Any],
+    cache_policy: str = "use",
+    cache_counters: Optional[CacheCounters] = None,
+    scheduler: Optional[PlatformScheduler] = None,
+) -> Dict[str, Any]:
+    """Query AI platform via OpenRouter (for non-Gemini platforms), served from cache when possible."""
+    return await get_response_cache().get_or_call(
+        platform,
+        model_config["model"],
+        query,
+        "",  # Prompt is the bare query - same answer for every company
+        _scheduled(scheduler, platform, partial(_query_platform_live, platform, query, model_config)),
+        policy=cache_policy,
+        counters=cache_counters,
+    )
+
+
+async def _query_platform_live(
+    platform: str,
+    query: str,
+    model_config: Dict[str, Any],
 ) -> Dict[str, Any]:
-    """Query AI platform via OpenRouter (for non-Gemini platforms)."""
+    """Uncached AI platform query via OpenRouter."""
     model = model_config["model"]
     needs_tool = model_config.get("needs_tool", False)
     provider = model_config.get("provider")
@@ -1047,7 +1155,7 @@ async def query_platform(
         
         # Extract response
         choice = result.get("choices", [{}])[0]
-        content = choice.get("message", {}).get("content", "")
+        content = choice.get("message", {}).get("content") or ""  # null when the last turn was a tool call
         
         return {
             "platform": platform,
@@ -1065,33 +1173,81 @@ async def query_all_platforms(
     query: str,
     platforms: List[str],
     company_name: str = None,
+    scheduler: Optional[PlatformScheduler] = None,
+    cache_policy: str = "use",
+    cache_counters: Optional[CacheCounters] = None,
 ) -> List[Dict[str, Any]]:
-    """Query all platforms in parallel."""
+    """Query all platforms in parallel.
+    
+    If a scheduler is given, each live platform call (not cache hits) waits for
+    a slot on that platform's adaptive limiter (and is retried on rate limits).
+    """
     tasks = []
     for platform in platforms:
         if platform in AI_PLATFORMS:
             if platform == "gemini" and company_name:
                 # Pass company name for native Gemini
-                tasks.append(query_platform_with_company(platform, query, AI_PLATFORMS[platform], company_name))
+                tasks.append(query_platform_with_company(
+                    platform, query, AI_PLATFORMS[platform], company_name, cache_policy, cache_counters, scheduler,
+                ))
             else:
-                tasks.append(query_platform(platform, query, AI_PLATFORMS[platform]))
+                tasks.append(query_platform(
+                    platform, query, AI_PLATFORMS[platform], cache_policy, cache_counters, scheduler,
+                ))
     
     return await asyncio.gather(*tasks, return_exceptions=True)
 
 
-# ==================== API Endpoints ====================
+# Lazy singleton (per event loop: the limiters' conditions can't cross loops)
+_platform_scheduler: Optional[PlatformScheduler] = None
+_platform_scheduler_loop: Optional[asyncio.AbstractEventLoop] = None
 
-@app.post("/check", response_model=MentionsCheckResponse)
-async def check_mentions(request: MentionsCheckRequest):
-    """Run AEO mentions check across AI platforms.
-    
-    Requires companyAnalysis with industry or products data for targeted query generation.
-    Without this data, queries would be too generic to produce meaningful visibility scores.
+
+def get_platform_scheduler() -> PlatformScheduler:
+    """Process-wide adaptive scheduler with AI_PLATFORMS concurrency limits.
+
+    Shared by every mentions check so per-provider limits and 429 backoff apply
+    across concurrent requests, not just within one check.
     """
-    import time
-    start_time = time.time()
-    
-    # Validate companyAnalysis has REAL data from company analysis (not just CSV data)
+    global _platform_scheduler, _platform_scheduler_loop
+    loop = asyncio.get_running_loop()
+    if _platform_scheduler is None or _platform_scheduler_loop is not loop:
+        _platform_scheduler = new_platform_scheduler()
+        _platform_scheduler_loop = loop
+    return _platform_scheduler
+
+
+def new_platform_scheduler() -> PlatformScheduler:
+    """Standalone scheduler with AI_PLATFORMS concurrency limits (offline scoring, no event loop needed)."""
+    return PlatformScheduler({
+        platform: config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+        for platform, config in AI_PLATFORMS.items()
+    })
+
+
+# ==================== Mentions Check Pipeline ====================
+
+@dataclass
+class MentionsCheckRun:
+    """State shared by all queries of one mentions check."""
+    request: MentionsCheckRequest
+    platforms: List[str]
+    queries: List[Dict[str, Any]]
+    scorer: MentionScorer
+    scheduler: PlatformScheduler
+    cache_counters: CacheCounters
+    start_time: float
+    # Scheduler stats since this check started (the scheduler itself is process-wide)
+    scheduler_window: Optional[SchedulerWindow] = None
+
+    def scheduler_stats(self) -> Dict[str, Dict[str, Any]]:
+        if self.scheduler_window is not None:
+            return self.scheduler_window.stats()
+        return self.scheduler.stats(self.platforms)
+
+
+def validate_company_analysis(request: MentionsCheckRequest) -> None:
+    """Raise 400 unless companyAnalysis has REAL data from company analysis (not just CSV data)."""
     # This is STRICT validation - we require products/services from actual analysis
     company_info = request.companyAnalysis.companyInfo if request.companyAnalysis else {}
     
@@ -1104,9 +1260,6 @@ async def check_mentions(request: MentionsCheckRequest):
     # STRICT: Require products OR services (not just industry from CSV)
     has_products_or_services = bool(products) or bool(services)
     
-    # Also check description length - real analysis produces detailed descriptions
-    has_detailed_description = len(description) > 100 if description else False
-    
     # STRICT validation: Must have products/services from real company analysis
     if not has_products_or_services:
         logger.error(f"Missing REAL company analysis data for {request.companyName} - has_products_or_services=False")
@@ -1126,6 +1279,14 @@ async def check_mentions(request: MentionsCheckRequest):
                 "requirement": "At least one product or service from company analysis is required.",
             }
         )
+
+
+async def prepare_mentions_check(request: MentionsCheckRequest) -> MentionsCheckRun:
+    """Validate the request, pick platforms and generate queries."""
+    import time
+    start_time = time.time()
+    
+    validate_company_analysis(request)
     
     logger.info(f"Starting mentions check for {request.companyName} (mode: {request.mode})")
     
@@ -1150,152 +1311,178 @@ async def check_mentions(request: MentionsCheckRequest):
     )
     logger.info(f"Generated {len(queries)} queries")
     
-    # Initialize stats
-    platform_stats = {p: PlatformStats(mentions=0, quality_score=0, responses=0, errors=0) for p in platforms}
-    dimension_stats: Dict[str, DimensionStats] = {}
-    query_results: List[QueryResult] = []
-    total_mentions = 0
-    total_quality = 0.0
-    total_tokens = 0
-    total_cost = 0.0
-    
     # Get competitors for mention detection
     competitors = []
     if request.companyAnalysis:
         competitors = request.companyAnalysis.competitors
     
-    # Initialize dimension stats for all dimensions
-    for query_data in queries:
-        dimension = query_data["dimension"]
-        if dimension not in dimension_stats:
-            dimension_stats[dimension] = DimensionStats(mentions=0, quality_score=0, queries=0)
-        dimension_stats[dimension].queries += 1
+    # Per-platform adaptive concurrency (sliding pool, backs off on 429s)
+    scheduler = get_platform_scheduler()
+    return MentionsCheckRun(
+        request=request,
+        platforms=platforms,
+        queries=queries,
+        # Compiled once, used for every response
+        scorer=MentionScorer(request.companyName, aliases=request.companyAliases, competitors=competitors),
+        scheduler=scheduler,
+        # Response cache hit/miss counters for this check
+        cache_counters=CacheCounters(),
+        start_time=start_time,
+        scheduler_window=scheduler.open_window(platforms),
+    )
+
+
+def score_platform_results(run: MentionsCheckRun, query_data: Dict[str, Any], results: List[Any]) -> List[Dict[str, Any]]:
+    """Score one query's platform results (see run_mentions_query for the entry format)."""
+    query = query_data["query"]
+    dimension = query_data["dimension"]
     
-    # Process ALL queries in PARALLEL (much faster!)
-    async def process_single_query(query_data):
-        """Process a single query across all platforms."""
-        import time
-        query_start = time.time()
+    entries = []
+    for result in results:
+        if isinstance(result, Exception):
+            continue
         
-        query = query_data["query"]
-        dimension = query_data["dimension"]
-        logger.info(f"🔍 [QUERY] Starting: '{query}' ({dimension})")
+        platform = result.get("platform", "unknown")
         
-        platform_start = time.time()
-        results = await query_all_platforms(query, platforms, request.companyName)
-        platform_end = time.time()
-        platform_duration = platform_end - platform_start
+        if "error" in result:
+            entries.append({"platform": platform, "error": result["error"]})
+            continue
         
-        query_end = time.time()
-        total_duration = query_end - query_start
+        response_text = result.get("response", "")
         
-        logger.info(f"✅ [QUERY] Completed '{query[:50]}...' in {total_duration:.2f}s (platforms: {platform_duration:.2f}s)")
+        # Count mentions, mention type, list position and competitors in one pass
+        score = run.scorer.score(response_text)
         
-        return {"query_data": query_data, "results": results, "timing": {"total": total_duration, "platforms": platform_duration}}
+        entries.append({
+            "platform": platform,
+            "query_result": QueryResult(
+                query=query,
+                dimension=dimension,
+                platform=platform,
+                raw_mentions=score.raw_mentions,
+                capped_mentions=score.capped_mentions,
+                quality_score=score.quality_score,
+                mention_type=score.mention_type,
+                position=score.position,
+                competitor_mentions=score.competitor_mentions,
+                response_text=response_text[:500],  # Truncate for storage
+            ),
+            "response": response_text,  # Full text (archived; QueryResult keeps 500 chars)
+            "tokens": result.get("tokens", 0),
+            "cost": result.get("cost", 0.0),
+            "cached": bool(result.get("cached")),
+        })
     
-    parallel_start = time.time()
-    logger.info(f"📊 [PARALLEL] Processing {len(queries)} queries in parallel across {len(platforms)} platforms...")
+    return entries
+
+
+async def run_mentions_query(run: MentionsCheckRun, query_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Query all platforms for one query and score each response.
     
-    # Process queries in batches to avoid resource limits
-    BATCH_SIZE = 5  # Process 5 queries at a time to prevent crashes
-    all_query_results = []
+    Returns {"query_data", "entries", "timing"}; entries follow platform order and are
+    either {"platform", "error"} or {"platform", "query_result", "tokens", "cost", "cached"}.
+    Platform calls that raised are dropped.
+    """
+    import time
+    query_start = time.time()
+    
+    query = query_data["query"]
+    dimension = query_data["dimension"]
+    logger.info(f"🔍 [QUERY] Starting: '{query}' ({dimension})")
+    
+    platform_start = time.time()
+    results = await query_all_platforms(
+        query,
+        run.platforms,
+        run.request.companyName,
+        scheduler=run.scheduler,
+        cache_policy=run.request.cache_policy,
+        cache_counters=run.cache_counters,
+    )
+    platform_end = time.time()
+    platform_duration = platform_end - platform_start
     
-    for i in range(0, len(queries), BATCH_SIZE):
-        batch = queries[i:i + BATCH_SIZE]
-        batch_num = (i // BATCH_SIZE) + 1
-        total_batches = (len(queries) + BATCH_SIZE - 1) // BATCH_SIZE
-        
-        logger.info(f"🔄 [BATCH {batch_num}/{total_batches}] Processing {len(batch)} queries...")
-        
-        batch_results = await asyncio.gather(
-            *[process_single_query(q) for q in batch],
-            return_exceptions=True
-        )
-        
-        all_query_results.extend(batch_results)
-        logger.info(f"✅ [BATCH {batch_num}/{total_batches}] Completed")
-        
-        # Brief pause between batches to avoid overwhelming the system
-        if i + BATCH_SIZE < len(queries):
-            logger.info(f"⏱️  [BATCH] Brief pause before next batch...")
-            await asyncio.sleep(2)  # 2 second pause between batches
+    entries = score_platform_results(run, query_data, results)
     
-    parallel_end = time.time()
-    parallel_duration = parallel_end - parallel_start
-    logger.info(f"✅ [PARALLEL] All {len(queries)} queries completed in {parallel_duration:.2f}s using batched processing")
+    query_end = time.time()
+    total_duration = query_end - query_start
     
-    # Log timing breakdown
-    successful_queries = [r for r in all_query_results if not isinstance(r, Exception)]
-    if successful_queries:
-        avg_query_time = sum(r.get("timing", {}).get("total", 0) for r in successful_queries) / len(successful_queries)
-        logger.info(f"📈 [TIMING] Average per query: {avg_query_time:.2f}s, Parallel efficiency: {(avg_query_time * len(queries)) / parallel_duration:.1f}x")
+    logger.info(f"✅ [QUERY] Completed '{query[:50]}...' in {total_duration:.2f}s (platforms: {platform_duration:.2f}s)")
     
-    # Process results from all parallel queries
-    for query_result in all_query_results:
-        if isinstance(query_result, Exception):
-            logger.error(f"Query failed: {query_result}")
-            continue
-        
-        query_data = query_result["query_data"]
-        results = query_result["results"]
-        query = query_data["query"]
+    return {"query_data": query_data, "entries": entries, "timing": {"total": total_duration, "platforms": platform_duration}}
+
+
+def accumulate_query_results(run: MentionsCheckRun, scored_queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum per-platform/per-dimension stats over scored queries (in the given order).
+    
+    Quality scores in platform/dimension stats are sums here; averages are taken when
+    the response is built.
+    """
+    platform_stats = {p: PlatformStats(mentions=0, quality_score=0, responses=0, errors=0) for p in run.platforms}
+    dimension_stats: Dict[str, DimensionStats] = {}
+    query_results: List[QueryResult] = []
+    totals = {"mentions": 0, "quality": 0.0, "tokens": 0, "cost": 0.0}
+    
+    # Initialize dimension stats for all dimensions
+    for query_data in run.queries:
         dimension = query_data["dimension"]
-        
-        for result in results:
-            if isinstance(result, Exception):
-                continue
-            
-            platform = result.get("platform", "unknown")
+        if dimension not in dimension_stats:
+            dimension_stats[dimension] = DimensionStats(mentions=0, quality_score=0, queries=0)
+        dimension_stats[dimension].queries += 1
+    
+    for scored in scored_queries:
+        dimension = scored["query_data"]["dimension"]
+        for entry in scored["entries"]:
+            platform = entry["platform"]
             
-            if "error" in result:
+            if "error" in entry:
                 platform_stats[platform].errors += 1
                 continue
             
-            response_text = result.get("response", "")
-            tokens = result.get("tokens", 0)
-            cost = result.get("cost", 0.0)
-            
-            # Count mentions
-            mention_data = count_mentions(response_text, request.companyName)
-            
-            # Extract competitor mentions
-            comp_mentions = extract_competitor_mentions(response_text, competitors)
-            
-            # Create query result
-            qr = QueryResult(
-                query=query,
-                dimension=dimension,
-                platform=platform,
-                raw_mentions=mention_data["raw_mentions"],
-                capped_mentions=mention_data["capped_mentions"],
-                quality_score=mention_data["quality_score"],
-                mention_type=mention_data["mention_type"],
-                position=mention_data["position"],
-                competitor_mentions=comp_mentions,
-                response_text=response_text[:500],  # Truncate for storage
-            )
+            qr = entry["query_result"]
+            tokens = entry["tokens"]
+            cost = entry["cost"]
             query_results.append(qr)
             
             # Update stats
-            platform_stats[platform].mentions += mention_data["capped_mentions"]
-            platform_stats[platform].quality_score += mention_data["quality_score"]
+            platform_stats[platform].mentions += qr.capped_mentions
+            platform_stats[platform].quality_score += qr.quality_score
             platform_stats[platform].responses += 1
             platform_stats[platform].total_tokens += tokens
             platform_stats[platform].cost += cost
             
-            dimension_stats[dimension].mentions += mention_data["capped_mentions"]
-            dimension_stats[dimension].quality_score += mention_data["quality_score"]
+            dimension_stats[dimension].mentions += qr.capped_mentions
+            dimension_stats[dimension].quality_score += qr.quality_score
             
-            total_mentions += mention_data["capped_mentions"]
-            total_quality += mention_data["quality_score"]
-            total_tokens += tokens
-            total_cost += cost
-    
-    # Calculate visibility using presence-based formula
-    # Visibility = "How often does AI mention this company?" (with quality boost)
-    total_responses = sum(s.responses for s in platform_stats.values())
-    max_quality = total_responses * 10.0
+            totals["mentions"] += qr.capped_mentions
+            totals["quality"] += qr.quality_score
+            totals["tokens"] += tokens
+            totals["cost"] += cost
     
+    return {
+        "platform_stats": platform_stats,
+        "dimension_stats": dimension_stats,
+        "query_results": query_results,
+        "totals": totals,
+    }
+
+
+def visibility_band(visibility: float) -> str:
+    """Dominant/Strong/Moderate/Weak/Minimal for a visibility percentage."""
+    if visibility >= 80:
+        return "Dominant"
+    elif visibility >= 60:
+        return "Strong"
+    elif visibility >= 40:
+        return "Moderate"
+    elif visibility >= 20:
+        return "Weak"
+    else:
+        return "Minimal"
+
+
+def compute_visibility(total_quality: float, query_results: List[QueryResult], total_responses: int) -> Dict[str, Any]:
+    """Presence-based visibility, band, presence rate and average quality when mentioned."""
     # Count responses where company was actually mentioned
     responses_with_mentions = sum(1 for qr in query_results if qr.mention_type != 'none')
     
@@ -1316,59 +1503,658 @@ async def check_mentions(request: MentionsCheckRequest):
     # Ensure visibility never exceeds 100 (double-check for floating point issues)
     visibility = min(100.0, round(visibility, 1))
     
-    # Determine visibility band
-    if visibility >= 80:
-        band = "Dominant"
-    elif visibility >= 60:
-        band = "Strong"
-    elif visibility >= 40:
-        band = "Moderate"
-    elif visibility >= 20:
-        band = "Weak"
-    else:
-        band = "Minimal"
-    
-    # Calculate average quality scores
-    for platform in platforms:
+    return {
+        "visibility": visibility,
+        "band": visibility_band(visibility),
+        "presence_rate": presence_rate,
+        "avg_quality_when_mentioned": avg_quality_when_mentioned,
+    }
+
+
+def _average_stats(platform_stats: Dict[str, PlatformStats], dimension_stats: Dict[str, DimensionStats]) -> None:
+    """Turn summed quality scores into averages (in place)."""
+    for platform in platform_stats:
         if platform_stats[platform].responses > 0:
             platform_stats[platform].quality_score /= platform_stats[platform].responses
     
     for dimension in dimension_stats:
         if dimension_stats[dimension].queries > 0:
             dimension_stats[dimension].quality_score /= dimension_stats[dimension].queries
+
+
+def build_mentions_response(
+    run: MentionsCheckRun,
+    scored_queries: List[Dict[str, Any]],
+    parallel_duration: float,
+) -> MentionsCheckResponse:
+    """Final aggregate of a mentions check (scored_queries in query order)."""
+    import time
+    request = run.request
     
-    execution_time = time.time() - start_time
+    acc = accumulate_query_results(run, scored_queries)
+    platform_stats = acc["platform_stats"]
+    dimension_stats = acc["dimension_stats"]
+    query_results = acc["query_results"]
+    totals = acc["totals"]
+    
+    # Calculate visibility using presence-based formula
+    # Visibility = "How often does AI mention this company?" (with quality boost)
+    total_responses = sum(s.responses for s in platform_stats.values())
+    max_quality = total_responses * 10.0
+    vis = compute_visibility(totals["quality"], query_results, total_responses)
+    
+    # Calculate average quality scores
+    _average_stats(platform_stats, dimension_stats)
+    
+    execution_time = time.time() - run.start_time
     
     # Generate TL;DR summary
     tldr_summary = generate_tldr_summary(
         company_name=request.companyName,
-        visibility=visibility,
-        band=band,
+        visibility=vis["visibility"],
+        band=vis["band"],
         platform_stats=platform_stats,
         dimension_stats=dimension_stats,
         query_results=query_results
     )
     
-    logger.info(f"Mentions check complete: visibility={visibility:.1f}% (presence={presence_rate*100:.1f}%), band={band}, mentions={total_mentions}")
+    cache_counters = run.cache_counters
+    logger.info(f"💾 [CACHE] policy={request.cache_policy}, hits={cache_counters.hits}, misses={cache_counters.misses}")
+    logger.info(
+        f"Mentions check complete: visibility={vis['visibility']:.1f}% (presence={vis['presence_rate']*100:.1f}%), "
+        f"band={vis['band']}, mentions={totals['mentions']}"
+    )
     
     return MentionsCheckResponse(
         companyName=request.companyName,
-        visibility=round(visibility, 1),
-        band=band,
-        mentions=total_mentions,
-        presence_rate=round(presence_rate * 100, 1),  # As percentage (0-100)
-        quality_score=round(avg_quality_when_mentioned, 2),  # Avg when mentioned (0-10)
+        visibility=round(vis["visibility"], 1),
+        band=vis["band"],
+        mentions=totals["mentions"],
+        presence_rate=round(vis["presence_rate"] * 100, 1),  # As percentage (0-100)
+        quality_score=round(vis["avg_quality_when_mentioned"], 2),  # Avg when mentioned (0-10)
         max_quality=max_quality,
         platform_stats=platform_stats,
         dimension_stats=dimension_stats,
         query_results=query_results,
-        actualQueriesProcessed=len(queries),
+        actualQueriesProcessed=len(run.queries),
         execution_time_seconds=round(execution_time, 2),
-        total_cost=round(total_cost, 4),
-        total_tokens=total_tokens,
+        total_cost=round(totals["cost"], 4),
+        total_tokens=totals["tokens"],
         mode=request.mode,
         tldr=tldr_summary,
+        cache=CacheStats(policy=request.cache_policy, **cache_counters.to_dict()),
+        timing={
+            "queries_seconds": round(parallel_duration, 2),
+            "scheduler": run.scheduler_stats(),
+        },
+    )
+
+
+def _archive_mentions_check(run: MentionsCheckRun, scored_queries: List[Dict[str, Any]], response: MentionsCheckResponse) -> Optional[str]:
+    """Store the full platform responses of a check (blocking - run in a thread)."""
+    archive = get_response_archive()
+    if archive is None:
+        return None
+    query_index = {id(q): i for i, q in enumerate(run.queries)}
+    responses = []
+    for scored in scored_queries:
+        index = query_index[id(scored["query_data"])]
+        for entry in scored["entries"]:
+            responses.append({"query_index": index, **{k: v for k, v in entry.items() if k != "query_result"}})
+    return archive.record_check(
+        company=run.request.companyName,
+        request=run.request.model_dump(),
+        queries=run.queries,
+        platforms=run.platforms,
+        responses=responses,
+        summary={
+            "visibility": response.visibility,
+            "band": response.band,
+            "presence_rate": response.presence_rate,
+            "quality_score": response.quality_score,
+            "mentions": response.mentions,
+        },
+    )
+
+
+async def finalize_mentions_response(
+    run: MentionsCheckRun,
+    scored_queries: List[Dict[str, Any]],
+    parallel_duration: float,
+) -> MentionsCheckResponse:
+    """Build the final response and archive the full responses (if enabled)."""
+    response = build_mentions_response(run, scored_queries, parallel_duration)
+    if run.request.archive:
+        try:
+            response.archive_id = await asyncio.to_thread(_archive_mentions_check, run, scored_queries, response)
+        except Exception as e:
+            logger.warning(f"Archiving mentions check for {run.request.companyName} failed: {e}")
+    return response
+
+
+def mentions_progress(run: MentionsCheckRun, scored_queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Running aggregates over the queries completed so far."""
+    acc = accumulate_query_results(run, scored_queries)
+    platform_stats = acc["platform_stats"]
+    dimension_stats = acc["dimension_stats"]
+    total_responses = sum(s.responses for s in platform_stats.values())
+    vis = compute_visibility(acc["totals"]["quality"], acc["query_results"], total_responses)
+    _average_stats(platform_stats, dimension_stats)
+    
+    return {
+        "completed_queries": len(scored_queries),
+        "total_queries": len(run.queries),
+        "visibility": round(vis["visibility"], 1),
+        "band": vis["band"],
+        "presence_rate": round(vis["presence_rate"] * 100, 1),
+        "quality_score": round(vis["avg_quality_when_mentioned"], 2),
+        "mentions": acc["totals"]["mentions"],
+        "total_cost": round(acc["totals"]["cost"], 4),
+        "total_tokens": acc["totals"]["tokens"],
+        "platform_stats": {p: s.model_dump() for p, s in platform_stats.items()},
+        "dimension_stats": {d: s.model_dump() for d, s in dimension_stats.items()},
+    }
+
+
+def _log_scheduler_stats(run: MentionsCheckRun, parallel_duration: float) -> None:
+    logger.info(f"✅ [PARALLEL] All {len(run.queries)} queries completed in {parallel_duration:.2f}s using adaptive scheduling")
+    for platform, stats in run.scheduler_stats().items():
+        logger.info(
+            f"📈 [SCHEDULER] {platform}: limit={stats['limit']}/{stats['max_limit']}, "
+            f"peak_in_flight={stats['peak_in_flight']}, max_queue={stats['max_queue_depth']}, "
+            f"rate_limited={stats['rate_limited']}"
+        )
+
+
+# ==================== Batch (Cohort) Mentions Checks ====================
+
+def normalize_query_text(query: str) -> str:
+    """Case/whitespace-insensitive form of a query (dedupe key)."""
+    return " ".join(query.lower().split())
+
+
+def is_branded_query(query: str, run: MentionsCheckRun) -> bool:
+    """True if the query names the company (or one of its aliases)."""
+    query_lower = query.lower()
+    return any(term.lower() in query_lower for term in run.scorer.terms)
+
+
+def _is_company_specific(platform: str) -> bool:
+    # Native Gemini embeds the company name in its prompt (see query_all_platforms)
+    return platform == "gemini"
+
+
+async def check_mentions_batch(request: MentionsBatchRequest) -> MentionsBatchResponse:
+    """Mentions check for a cohort of companies with shared non-branded queries.
+    
+    Queries are generated per company; non-branded queries that are identical across
+    companies (after normalization) are sent to each platform once. Platforms whose
+    prompt embeds the company name (native Gemini) are still queried per company.
+    Each company's result is built exactly like POST /check from its own queries;
+    additionally every unique response to a query that is non-branded for the whole
+    cohort is scored against every company in the cohort and counted for every
+    competitor they list. Company names must be unique (results are keyed by name).
+    """
+    import time
+    start_time = time.time()
+    
+    seen_names: Dict[str, str] = {}
+    for company in request.companies:
+        name_key = company.companyName.strip().lower()
+        if name_key in seen_names:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Duplicate company in cohort: '{company.companyName}' (also given as '{seen_names[name_key]}')",
+            )
+        seen_names[name_key] = company.companyName
+    
+    platforms = request.platforms
+    if not platforms:
+        platforms = ["gemini"] if request.mode == "fast" else list(AI_PLATFORMS.keys())
+    active_platforms = [p for p in platforms if p in AI_PLATFORMS]
+    
+    scheduler = get_platform_scheduler()
+    cache_counters = CacheCounters()
+    errors: Dict[str, Any] = {}
+    
+    # Phase 1: validate + generate queries per company (bounded)
+    generation_slots = asyncio.Semaphore(request.max_concurrent_generation)
+    
+    async def prepare(company: BatchCompany) -> Optional[MentionsCheckRun]:
+        company_request = MentionsCheckRequest(
+            companyName=company.companyName,
+            companyAliases=company.companyAliases,
+            companyAnalysis=company.companyAnalysis,
+            language=request.language,
+            country=request.country,
+            numQueries=request.numQueries,
+            mode=request.mode,
+            platforms=platforms,
+            cache_policy=request.cache_policy,
+        )
+        try:
+            async with generation_slots:
+                run = await prepare_mentions_check(company_request)
+        except HTTPException as e:
+            errors[company.companyName] = e.detail
+            return None
+        except Exception as e:
+            logger.error(f"Batch: preparing {company.companyName} failed: {e}")
+            errors[company.companyName] = str(e)
+            return None
+        # One cache counter set for the whole cohort (the scheduler is process-wide)
+        return replace(run, scheduler=scheduler, cache_counters=cache_counters)
+    
+    runs = [r for r in await asyncio.gather(*[prepare(c) for c in request.companies]) if r is not None]
+    
+    # Phase 2: unique platform calls - (platform, normalized query, company or "" if shared)
+    calls: Dict[tuple, Dict[str, Any]] = {}
+    query_users: Dict[str, set] = {}
+    queries_total = 0
+    
+    def call_key(platform: str, query: str, run: MentionsCheckRun) -> tuple:
+        # Other platforms get the bare query, so identical text means an identical call
+        company = run.request.companyName if _is_company_specific(platform) else ""
+        return (platform, normalize_query_text(query), company)
+    
+    for run in runs:
+        queries_total += len(run.queries)
+        for query_data in run.queries:
+            query = query_data["query"]
+            if not is_branded_query(query, run):
+                query_users.setdefault(normalize_query_text(query), set()).add(run.request.companyName)
+            for platform in active_platforms:
+                key = call_key(platform, query, run)
+                if key not in calls:
+                    calls[key] = {"platform": platform, "query": query, "company": run.request.companyName}
+    
+    calls_without_dedupe = queries_total * len(active_platforms)
+    shared_queries = sum(1 for users in query_users.values() if len(users) > 1)
+    logger.info(
+        f"📦 [BATCH] {len(runs)} companies, {queries_total} queries → {len(calls)} platform calls "
+        f"(without dedupe: {calls_without_dedupe}, shared non-branded queries: {shared_queries})"
+    )
+    
+    async def execute(key: tuple) -> Dict[str, Any]:
+        spec = calls[key]
+        platform = spec["platform"]
+        if _is_company_specific(platform):
+            return await query_platform_with_company(
+                platform, spec["query"], AI_PLATFORMS[platform], spec["company"],
+                request.cache_policy, cache_counters, scheduler,
+            )
+        return await query_platform(
+            platform, spec["query"], AI_PLATFORMS[platform], request.cache_policy, cache_counters, scheduler,
+        )
+    
+    parallel_start = time.time()
+    keys = list(calls)
+    outcomes = await asyncio.gather(*[execute(k) for k in keys], return_exceptions=True)
+    responses = dict(zip(keys, outcomes))
+    parallel_duration = time.time() - parallel_start
+    
+    # Phase 3: per-company results, built like a single check from the company's own queries
+    results: Dict[str, MentionsCheckResponse] = {}
+    for run in runs:
+        scored_queries = []
+        for query_data in run.queries:
+            platform_results = [responses[call_key(p, query_data["query"], run)] for p in active_platforms]
+            scored_queries.append({
+                "query_data": query_data,
+                "entries": score_platform_results(run, query_data, platform_results),
+            })
+        results[run.request.companyName] = await finalize_mentions_response(run, scored_queries, parallel_duration)
+    
+    # Phase 4: every unique neutral response scored against every company of the cohort.
+    # Excluded: company-specific platforms (their prompt favours one company) and queries
+    # branded for any cohort company ("Acme reviews" would inflate Acme's share of voice)
+    neutral_queries = {
+        normalized for normalized in {key[1] for key in calls}
+        if not any(is_branded_query(normalized, run) for run in runs)
+    }
+    texts = [
+        r.get("response", "")
+        for (platform, normalized, _), r in responses.items()
+        if not _is_company_specific(platform) and normalized in neutral_queries
+        and isinstance(r, dict) and "error" not in r
+    ]
+    cohort_mentions: Dict[str, tuple] = {}
+    for run in runs:
+        scores = run.scorer.score_many(texts)
+        cohort_mentions[run.request.companyName] = (
+            sum(1 for s in scores if s.mention_type != 'none'),
+            sum(s.capped_mentions for s in scores),
+        )
+    all_mentions = sum(m for _, m in cohort_mentions.values())
+    cohort = {
+        name: CohortCompanyStats(
+            responses_scored=len(texts),
+            responses_mentioning=mentioning,
+            presence_rate=round(mentioning / len(texts) * 100, 1) if texts else 0.0,
+            mentions=mentions,
+            share_of_voice=round(mentions / all_mentions * 100, 1) if all_mentions else 0.0,
+        )
+        for name, (mentioning, mentions) in cohort_mentions.items()
+    }
+    
+    cohort_names = {run.request.companyName.lower() for run in runs}
+    competitor_list: Dict[str, Dict[str, Any]] = {}
+    for run in runs:
+        for competitor in (run.request.companyAnalysis.competitors if run.request.companyAnalysis else []):
+            name = (competitor.get("name") or "").strip()
+            if name and name.lower() not in cohort_names:
+                competitor_list.setdefault(name.lower(), {"name": name})
+    competitor_counts: Dict[str, List[int]] = {c["name"]: [0, 0] for c in competitor_list.values()}
+    competitor_scorer = MentionScorer("", competitors=list(competitor_list.values()))
+    for text in texts:
+        for mention in competitor_scorer.competitor_mentions(text):
+            competitor_counts[mention["name"]][0] += 1
+            competitor_counts[mention["name"]][1] += mention["count"]
+    cohort_competitors = {
+        name: CohortCompetitorStats(responses_mentioning=mentioning, mentions=mentions)
+        for name, (mentioning, mentions) in competitor_counts.items()
+    }
+    
+    execution_time = time.time() - start_time
+    logger.info(f"📦 [BATCH] Completed {len(runs)} companies in {execution_time:.1f}s ({len(errors)} failed)")
+    
+    return MentionsBatchResponse(
+        results=results,
+        errors=errors,
+        cohort=cohort,
+        cohort_competitors=cohort_competitors,
+        dedupe=BatchDedupeStats(
+            queries_total=queries_total,
+            unique_queries=len({normalize_query_text(q["query"]) for run in runs for q in run.queries}),
+            shared_queries=shared_queries,
+            calls_without_dedupe=calls_without_dedupe,
+            calls_made=len(calls),
+            calls_saved=calls_without_dedupe - len(calls),
+        ),
+        cache=CacheStats(policy=request.cache_policy, **cache_counters.to_dict()),
+        execution_time_seconds=round(execution_time, 2),
+    )
+
+
+# ==================== API Endpoints ====================
+
+@app.post("/check", response_model=MentionsCheckResponse)
+async def check_mentions(request: MentionsCheckRequest):
+    """Run AEO mentions check across AI platforms.
+    
+    Requires companyAnalysis with industry or products data for targeted query generation.
+    Without this data, queries would be too generic to produce meaningful visibility scores.
+    """
+    import time
+    run = await prepare_mentions_check(request)
+    queries = run.queries
+    
+    if request.adaptive is not None:
+        return await run_adaptive_mentions_check(run, request.adaptive)
+    
+    parallel_start = time.time()
+    logger.info(f"📊 [PARALLEL] Processing {len(queries)} queries in parallel across {len(run.platforms)} platforms...")
+    
+    # All queries are submitted at once - the scheduler bounds in-flight calls per platform,
+    # so each provider stays saturated up to its own limit without lock-step batches
+    all_query_results = await asyncio.gather(
+        *[run_mentions_query(run, q) for q in queries],
+        return_exceptions=True
+    )
+    
+    parallel_end = time.time()
+    parallel_duration = parallel_end - parallel_start
+    _log_scheduler_stats(run, parallel_duration)
+    
+    # Log timing breakdown
+    successful_queries = [r for r in all_query_results if not isinstance(r, Exception)]
+    for query_result in all_query_results:
+        if isinstance(query_result, Exception):
+            logger.error(f"Query failed: {query_result}")
+    if successful_queries:
+        avg_query_time = sum(r.get("timing", {}).get("total", 0) for r in successful_queries) / len(successful_queries)
+        logger.info(f"📈 [TIMING] Average per query: {avg_query_time:.2f}s, Parallel efficiency: {(avg_query_time * len(queries)) / parallel_duration:.1f}x")
+    
+    return await finalize_mentions_response(run, successful_queries, parallel_duration)
+
+
+async def run_adaptive_mentions_check(run: MentionsCheckRun, config: AdaptiveConfig) -> MentionsCheckResponse:
+    """Issue queries incrementally and stop once the band is settled or a budget is hit.
+    
+    Queries are interleaved across dimensions and issued through a sliding window;
+    after each completed query the presence-rate interval is updated. Queries already in
+    flight when sampling stops are still scored (they are paid for), except on the
+    latency budget, where they are cancelled.
+    """
+    import time
+    queries = interleave_by_dimension(run.queries)
+    calls_per_query = len([p for p in run.platforms if p in AI_PLATFORMS])
+    stopper = AdaptiveStopper(
+        band_for=visibility_band,
+        confidence=config.confidence,
+        min_responses=config.min_responses,
+        max_calls=config.max_calls,
+        max_seconds=config.max_seconds,
     )
+    
+    parallel_start = time.time()
+    logger.info(f"🎯 [ADAPTIVE] Up to {len(queries)} queries, window={config.window}, confidence={config.confidence}")
+    
+    completed: Dict[int, Dict[str, Any]] = {}
+    in_flight: Dict[asyncio.Task, int] = {}
+    next_index = 0
+    stop_reason: Optional[str] = None
+    
+    try:
+        while True:
+            # Issue new queries while sampling continues (calls in flight count against the call budget)
+            while stop_reason is None and next_index < len(queries) and len(in_flight) < config.window:
+                projected = stopper.calls + len(in_flight) * calls_per_query
+                if config.max_calls is not None and projected + calls_per_query > config.max_calls:
+                    # Another query would overshoot the budget; with nothing left in
+                    # flight to free room, sampling is over
+                    if not in_flight:
+                        stop_reason = "call_budget"
+                    break
+                task = asyncio.create_task(run_mentions_query(run, queries[next_index]))
+                in_flight[task] = next_index
+                next_index += 1
+            
+            if not in_flight:
+                break
+            
+            timeout = None
+            if config.max_seconds is not None:
+                timeout = max(0.0, config.max_seconds - (time.time() - stopper.started_at))
+            done, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                index = in_flight.pop(task)
+                if task.exception() is not None:
+                    logger.error(f"Query failed: {task.exception()}")
+                    continue
+                scored = task.result()
+                completed[index] = scored
+                for entry in scored["entries"]:
+                    if "error" in entry:
+                        stopper.record(entry["platform"], None)
+                    else:
+                        qr = entry["query_result"]
+                        stopper.record(
+                            entry["platform"], qr.mention_type != 'none', qr.quality_score, live=not entry["cached"],
+                        )
+            
+            if stop_reason is None:
+                stop_reason = stopper.stop_reason()
+                if stop_reason:
+                    low, high = stopper.visibility_interval()
+                    logger.info(
+                        f"🎯 [ADAPTIVE] Stopping after {next_index}/{len(queries)} queries ({stop_reason}): "
+                        f"visibility in [{low}, {high}]%"
+                    )
+            if stop_reason == "time_budget":
+                break
+    finally:
+        for task in in_flight:
+            task.cancel()
+    
+    if stop_reason is None:
+        stop_reason = "band_settled" if stopper.band_settled() else "exhausted"
+    
+    parallel_duration = time.time() - parallel_start
+    _log_scheduler_stats(run, parallel_duration)
+    
+    issued = queries[:next_index]
+    response = await finalize_mentions_response(
+        replace(run, queries=issued),
+        [completed[i] for i in sorted(completed)],
+        parallel_duration,
+    )
+    
+    presence_low, presence_high = stopper.presence_interval()
+    calls_planned = len(queries) * calls_per_query
+    response.adaptive = AdaptiveStats(
+        stop_reason=stop_reason,
+        confidence=config.confidence,
+        queries_planned=len(queries),
+        queries_issued=len(issued),
+        calls_planned=calls_planned,
+        calls_made=stopper.calls,
+        calls_saved=max(0, calls_planned - stopper.calls),
+        calls_cached=stopper.cached_calls,
+        presence_interval=[round(presence_low * 100, 1), round(presence_high * 100, 1)],
+        visibility_interval=list(stopper.visibility_interval()),
+        band_settled=stopper.band_settled(),
+        platform_presence_intervals=stopper.platform_intervals(),
+    )
+    logger.info(
+        f"🎯 [ADAPTIVE] {response.band} ({stop_reason}), calls {stopper.calls}/{calls_planned} "
+        f"({response.adaptive.calls_saved} saved)"
+    )
+    return response
+
+
+async def stream_mentions_check(request: MentionsCheckRequest) -> AsyncIterator[Dict[str, Any]]:
+    """Run a mentions check and yield events as results arrive.
+    
+    Events (dicts with a "type" key):
+    - "start": platforms and generated queries
+    - "query_result": one scored QueryResult (or "platform_error" for a failed call)
+    - "progress": running platform/dimension aggregates after each completed query
+    - "final": the full MentionsCheckResponse - identical aggregate to POST /check
+    - "error": the check failed
+    """
+    import time
+    try:
+        run = await prepare_mentions_check(request)
+    except HTTPException as e:
+        yield {"type": "error", "status_code": e.status_code, "error": e.detail}
+        return
+    except Exception as e:
+        logger.error(f"Mentions stream failed before querying: {e}")
+        yield {"type": "error", "error": str(e)}
+        return
+    
+    yield {
+        "type": "start",
+        "companyName": request.companyName,
+        "platforms": run.platforms,
+        "queries": run.queries,
+    }
+    
+    parallel_start = time.time()
+    
+    async def indexed(index: int, query_data: Dict[str, Any]):
+        return index, await run_mentions_query(run, query_data)
+    
+    tasks = [asyncio.create_task(indexed(i, q)) for i, q in enumerate(run.queries)]
+    # Completed queries by original index - the final aggregate is built in query order
+    completed: Dict[int, Dict[str, Any]] = {}
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                index, scored = await next_done
+            except Exception as e:
+                logger.error(f"Query failed: {e}")
+                continue
+            completed[index] = scored
+            
+            for entry in scored["entries"]:
+                if "error" in entry:
+                    yield {"type": "platform_error", "query_index": index, "platform": entry["platform"], "error": entry["error"]}
+                else:
+                    yield {"type": "query_result", "query_index": index, "result": entry["query_result"].model_dump()}
+            
+            yield {"type": "progress", **mentions_progress(run, [completed[i] for i in sorted(completed)])}
+    finally:
+        # Client disconnected (generator closed) - don't leave platform calls running
+        for task in tasks:
+            task.cancel()
+    
+    parallel_duration = time.time() - parallel_start
+    _log_scheduler_stats(run, parallel_duration)
+    
+    response = await finalize_mentions_response(run, [completed[i] for i in sorted(completed)], parallel_duration)
+    yield {"type": "final", "result": response.model_dump()}
+
+
+def _encode_stream_event(event: Dict[str, Any], fmt: str) -> str:
+    data = json.dumps(event, default=str)
+    if fmt == "sse":
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+@app.post("/check/stream")
+async def check_mentions_stream(request: MentionsCheckRequest, format: Literal["ndjson", "sse"] = "ndjson"):
+    """Streaming mentions check: per-query results, running aggregates, then the final result.
+    
+    format=ndjson (default) emits one JSON event per line; format=sse emits Server-Sent Events.
+    The "final" event carries the same aggregate as POST /check.
+    """
+    validate_company_analysis(request)
+    
+    async def body():
+        async for event in stream_mentions_check(request):
+            yield _encode_stream_event(event, format)
+    
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/check-batch", response_model=MentionsBatchResponse)
+async def check_mentions_batch_endpoint(request: MentionsBatchRequest):
+    """Mentions check for a cohort of companies (non-branded queries shared across companies)."""
+    return await check_mentions_batch(request)
+
+
+class RescoreRequest(BaseModel):
+    """Re-score archived checks with the current scoring code (no platform calls)."""
+    check_ids: Optional[List[str]] = Field(default=None, description="Archive check ids (default: newest checks matching the filters)")
+    company: Optional[str] = None
+    since: Optional[float] = Field(default=None, description="Unix timestamp; only checks archived at/after it")
+    limit: int = Field(default=1000, ge=1, le=100000)
+    workers: Optional[int] = Field(default=None, ge=1, le=64, description="Worker processes (default: CPU count)")
+
+
+@app.post("/rescore")
+async def rescore_endpoint(request: RescoreRequest):
+    """Recompute MentionsCheckResponse for archived checks across a process pool."""
+    import rescore_mentions
+    
+    archive = get_response_archive()
+    if archive is None:
+        raise HTTPException(status_code=503, detail="Response archive is not available")
+    
+    if request.check_ids:
+        check_ids = request.check_ids
+    else:
+        checks = await asyncio.to_thread(
+            archive.list_checks, company=request.company, since=request.since, limit=request.limit
+        )
+        check_ids = [c["check_id"] for c in checks]
+    results = await asyncio.to_thread(rescore_mentions.rescore_checks, check_ids, archive.root, request.workers)
+    return {"count": len(results), "results": results}
 
 
 @app.get("/health")
@@ -1394,6 +2180,9 @@ async def root():
         "version": "4.2.0",
         "endpoints": {
             "/check": "POST - Run mentions check",
+            "/check/stream": "POST - Run mentions check, streaming per-query results (NDJSON or SSE)",
+            "/check-batch": "POST - Mentions check for a cohort of companies with shared non-branded queries",
+            "/rescore": "POST - Re-score archived checks offline (no platform calls)",
             "/health": "GET - Service health",
         },
         "platforms": list(AI_PLATFORMS.keys()),
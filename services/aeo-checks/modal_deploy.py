@@ -40,10 +40,14 @@ image = (
         "fastapi>=0.104.0",
         "uvicorn>=0.24.0",
         "pydantic>=2.5.0",
-        "httpx>=0.25.0",
+        "httpx[http2]>=0.25.0",
         # HTML parsing
         "beautifulsoup4>=4.12.0",
         "lxml>=4.9.0",
+        # Single-pass tech signature matching (optional, falls back to substring search)
+        "pyahocorasick>=2.0.0",
+        # Response archive blobs (optional, falls back to gzip)
+        "zstandard>=0.22.0",
         # Image processing
         "Pillow>=10.0.0",
         "cairosvg>=2.7.0",
@@ -68,11 +72,17 @@ image = (
     .add_local_python_source("mentions_service")
     # Shared modules
     .add_local_python_source("tech_detector")
+    .add_local_python_source("signature_engine")
     # logo_detector removed - now using openlogo package
     .add_local_python_source("fetcher")
+    .add_local_python_source("parsed_page")
+    .add_local_python_source("http_clients")
+    .add_local_python_source("fetch_cache")
+    .add_local_python_source("cpu_pool")
     .add_local_python_source("scoring")
     # Local OpenPull implementation
     .add_local_python_source("openpull")
+    .add_local_python_source("browser_pool")
     # New Local Services
     .add_local_python_source("ai_client")
     .add_local_python_source("openrouter_client")
@@ -80,6 +90,13 @@ image = (
     .add_local_python_source("url_extractor")
     .add_local_python_source("serp_types")
     .add_local_python_source("serp_dataforseo")
+    .add_local_python_source("serp_cache")
+    .add_local_python_source("platform_scheduler")
+    .add_local_python_source("response_cache")
+    .add_local_python_source("mention_scorer")
+    .add_local_python_source("adaptive_sampling")
+    .add_local_python_source("response_archive")
+    .add_local_python_source("rescore_mentions")
     # Health check modules
     .add_local_dir(local_dir / "checks", remote_path="/root/checks")
 )
@@ -6,7 +6,9 @@ Uses Playwright for JS-rendered pages and OpenRouter for AI extraction.
 import asyncio
 import logging
 from typing import Optional, Dict, Any
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+from browser_pool import get_browser_pool
 
 logger = logging.getLogger(__name__)
 
@@ -101,36 +103,28 @@ class FlexibleScraper:
         """
         Fetch page using Playwright for JS rendering support.
         
+        Runs on the shared browser pool; images/fonts/media are blocked since
+        only HTML and text are extracted.
+        
         Returns:
             Tuple of (html_content, markdown_content)
         """
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    viewport={"width": 1280, "height": 720},
-                    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-                )
-                page = await context.new_page()
-                
+            async with get_browser_pool().page(
+                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+                viewport={"width": 1280, "height": 720},
+                block_resources=True,
+            ) as page:
                 try:
                     await page.goto(url, timeout=timeout * 1000, wait_until="networkidle")
                     await asyncio.sleep(1)  # Let JS finish rendering
-                    
-                    html = await page.content()
-                    text = await page.evaluate("() => document.body.innerText")
-                    
-                    await browser.close()
-                    
-                    return html, text
-                    
                 except PlaywrightTimeout:
                     logger.warning(f"Playwright timeout for {url}, trying without networkidle...")
                     await page.goto(url, timeout=timeout * 1000, wait_until="domcontentloaded")
-                    html = await page.content()
-                    text = await page.evaluate("() => document.body.innerText")
-                    await browser.close()
-                    return html, text
+                
+                html = await page.content()
+                text = await page.evaluate("() => document.body.innerText")
+                return html, text
                     
         except Exception as e:
             logger.error(f"Playwright fetch failed: {e}")
@@ -14,12 +14,15 @@ Features:
 - Automatic tool call handling with multi-iteration support
 - Integration with scaile-services internal endpoints (SERP, URL extraction)
 - Provider routing support (e.g., force openai instead of azure for gpt-4.1)
+- Parallel tool calls within one assistant turn (per-tool concurrency limit, per-iteration deadline)
 - 5 minute timeout for long-running operations (blog generation)
 """
 
+import asyncio
 import os
 import json
 import logging
+import time
 import httpx
 from typing import Dict, Any, Optional, List
 
@@ -33,6 +36,16 @@ from tool_executor import ToolExecutor
 # Initialize tool executor (will be set in __init__)
 _tool_executor = None
 
+# Max concurrent executions per tool within one assistant turn
+TOOL_CONCURRENCY_LIMITS: Dict[str, int] = {
+    "google_search": int(os.getenv("TOOL_CONCURRENCY_GOOGLE_SEARCH", "5")),
+    "url_context": int(os.getenv("TOOL_CONCURRENCY_URL_CONTEXT", "4")),
+}
+DEFAULT_TOOL_CONCURRENCY = 4
+
+# Wall-clock budget for all tool calls of one iteration; unfinished calls return an error result
+TOOL_ITERATION_DEADLINE_SECONDS = float(os.getenv("TOOL_ITERATION_DEADLINE_SECONDS", "90"))
+
 class OpenRouterClient:
     """OpenRouter client using OpenAI SDK - proven working implementation"""
     
@@ -267,12 +280,97 @@ class OpenRouterClient:
         # Use local tool executor (lazy initialization)
         return await self._get_tool_executor().execute(tool_name, args)
     
+    async def _execute_tool_calls(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        first_index: int = 0,
+        iteration: int = 1,
+        deadline: Optional[float] = None,
+    ) -> List[tuple]:
+        """Execute the tool calls of one assistant turn concurrently.
+        
+        Each tool name is limited to TOOL_CONCURRENCY_LIMITS concurrent executions and the
+        whole batch shares one deadline; calls still running at the deadline are cancelled
+        and get an error result so the model can continue without them.
+        
+        Returns:
+            [(execution_metadata, tool_result), ...] in the original tool_calls order
+        """
+        if deadline is None:
+            deadline = TOOL_ITERATION_DEADLINE_SECONDS
+        
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        batch_start = time.perf_counter()
+        timings: List[Dict[str, Any]] = [{} for _ in tool_calls]
+        
+        async def run(index: int, tool_call: Dict[str, Any]) -> str:
+            tool_name = tool_call.get("function", {}).get("name") or ""
+            semaphore = semaphores.get(tool_name)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(TOOL_CONCURRENCY_LIMITS.get(tool_name, DEFAULT_TOOL_CONCURRENCY))
+                semaphores[tool_name] = semaphore
+            
+            async with semaphore:
+                started = time.perf_counter()
+                timings[index]["started_ms"] = int((started - batch_start) * 1000)
+                try:
+                    return await self._execute_tool(tool_call)
+                finally:
+                    timings[index]["duration_ms"] = int((time.perf_counter() - started) * 1000)
+        
+        tasks = [asyncio.create_task(run(i, tool_call)) for i, tool_call in enumerate(tool_calls)]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=deadline)
+        finally:
+            # Past the deadline, or the caller was cancelled (latency budget, client
+            # disconnect): don't leave searches running against semaphores and quota
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+        if pending:
+            logger.warning(f"{len(pending)}/{len(tasks)} tool calls exceeded the {deadline:.0f}s iteration deadline")
+        
+        results = []
+        for i, (tool_call, task) in enumerate(zip(tool_calls, tasks)):
+            function = tool_call.get("function", {})
+            status = "ok"
+            if task in pending:
+                status = "timeout"
+                tool_result = json.dumps({"error": f"Tool call timed out after {deadline:.0f}s"})
+            elif task.exception() is not None:
+                status = "error"
+                tool_result = json.dumps({"error": str(task.exception())})
+                logger.error(f"Tool call {function.get('name')} failed: {task.exception()}")
+            else:
+                tool_result = task.result()
+            
+            timing = timings[i]
+            results.append(({
+                "tool_id": tool_call.get("id", f"call_{first_index + i}"),
+                "tool_name": function.get("name"),
+                "arguments": function.get("arguments"),
+                "result_preview": tool_result[:200] + "..." if len(tool_result) > 200 else tool_result,
+                "iteration": iteration,
+                "status": status,
+                "started_ms": timing.get("started_ms"),
+                "duration_ms": timing.get("duration_ms"),
+            }, tool_result))
+        
+        logger.info(
+            f"Executed {len(tool_calls)} tool calls in {int((time.perf_counter() - batch_start) * 1000)}ms "
+            f"(sum of durations: {sum(r[0]['duration_ms'] or 0 for r in results)}ms)"
+        )
+        return results
+    
     async def complete_with_tools(
         self,
         messages: List[Dict[str, Any]],
         model: str = "google/gemini-3-pro-preview",
         tools: Optional[List[str]] = None,
         max_iterations: int = 5,
+        tool_deadline: Optional[float] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -280,7 +378,7 @@ class OpenRouterClient:
         
         This method handles the complete tool calling cycle:
         1. Send request to model with tool definitions
-        2. If model requests tool calls, execute them
+        2. If model requests tool calls, execute them (concurrently, see _execute_tool_calls)
         3. Send tool results back to model
         4. Repeat until model returns final response or max iterations reached
         
@@ -289,6 +387,8 @@ class OpenRouterClient:
             model: Model name (e.g., 'google/gemini-3-pro-preview')
             tools: List of tools to enable ('google_search', 'url_context')
             max_iterations: Maximum number of tool execution iterations
+            tool_deadline: Seconds allowed for all tool calls of one iteration
+                (default TOOL_ITERATION_DEADLINE_SECONDS)
             **kwargs: Additional OpenAI-compatible parameters (max_tokens, reasoning_effort, etc.)
             
         Returns:
@@ -368,24 +468,20 @@ class OpenRouterClient:
             
             working_messages.append(assistant_msg)
             
-            for tool_call in tool_calls:
-                tool_id = tool_call.get("id", f"call_{len(tool_executions)}")
-                
-                # Execute the tool
-                tool_result = await self._execute_tool(tool_call)
-                
-                # Track execution
-                tool_executions.append({
-                    "tool_id": tool_id,
-                    "tool_name": tool_call.get("function", {}).get("name"),
-                    "arguments": tool_call.get("function", {}).get("arguments"),
-                    "result_preview": tool_result[:200] + "..." if len(tool_result) > 200 else tool_result
-                })
+            # Execute all tool calls of this turn concurrently; results keep the model's order
+            executions = await self._execute_tool_calls(
+                tool_calls,
+                first_index=len(tool_executions),
+                iteration=iteration + 1,
+                deadline=tool_deadline,
+            )
+            for execution, tool_result in executions:
+                tool_executions.append(execution)
                 
                 # Append tool result to conversation
                 working_messages.append({
                     "role": "tool",
-                    "tool_call_id": tool_id,
+                    "tool_call_id": execution["tool_id"],
                     "content": tool_result
                 })
         
@@ -419,8 +515,6 @@ class OpenRouterClient:
         Returns:
             Dict with 'content', 'model', 'usage', and tool execution metadata
         """
-        import asyncio
-        
         messages = [{"role": "user", "content": prompt}]
         last_result = None
         last_error = None
@@ -0,0 +1,216 @@
+"""Single-parse HTML analysis context.
+
+A ParsedPage parses a page once (lxml) and lazily memoizes derived views, so health
+checks, tech detection, SPA detection and logo extraction share one parse per page:
+
+    page = ParsedPage(html, url)
+    page.soup           # BeautifulSoup tree (parsed on first access)
+    page.text           # visible text (script/style excluded)
+    page.word_count
+    page.json_ld        # parsed JSON-LD blocks
+    page.links          # absolute <a href> URLs
+    page.images         # absolute image URLs (<img>, SVG <image>, inline backgrounds)
+    page.header_images  # images inside header/nav elements
+    page.meta_images    # favicon / og:image / twitter:image URLs
+    page.meta           # <meta name|property|http-equiv> -> content
+    page.title, page.canonical_url
+
+Consumers must treat the soup as read-only (it is shared).
+"""
+
+import json
+import re
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, FeatureNotFound, NavigableString
+from bs4.element import Comment, Declaration, Doctype, ProcessingInstruction
+
+# Text inside these tags is not visible page text
+NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+_SKIPPED_STRING_TYPES = (Comment, Declaration, Doctype, ProcessingInstruction)
+
+HEADER_SELECTORS = [
+    "header", "nav", '[role="banner"]', ".header", ".nav",
+    "#header", "#nav", ".navbar", ".site-header", ".main-header",
+]
+
+_BACKGROUND_IMAGE_PATTERN = re.compile(r"background-image:\s*url\(['\"]?([^'\")\s]+)['\"]?\)")
+
+
+class ParsedPage:
+    """One parsed HTML page with lazily computed, memoized views."""
+
+    def __init__(self, html: str, url: str = "", parser: str = "lxml"):
+        self.html = html or ""
+        self.url = url
+        self.parser = parser
+
+    @cached_property
+    def html_lower(self) -> str:
+        return self.html.lower()
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        try:
+            return BeautifulSoup(self.html, self.parser)
+        except FeatureNotFound:
+            # lxml not installed - fall back to the stdlib parser
+            return BeautifulSoup(self.html, "html.parser")
+
+    # ==================== Text ====================
+
+    @cached_property
+    def text(self) -> str:
+        """Visible text, whitespace-normalized (script/style/template excluded)."""
+        parts = []
+        for string in self.soup.find_all(string=True):
+            if isinstance(string, _SKIPPED_STRING_TYPES) or not isinstance(string, NavigableString):
+                continue
+            if string.parent is not None and string.parent.name in NON_TEXT_TAGS:
+                continue
+            parts.append(string)
+        return " ".join(" ".join(parts).split())
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.text.split()) if self.text else 0
+
+    # ==================== Structured data ====================
+
+    @cached_property
+    def json_ld(self) -> List[Any]:
+        """Parsed JSON-LD blocks (invalid blocks are skipped)."""
+        blocks = []
+        for script in self.soup.find_all("script", attrs={"type": re.compile(r"application/ld\+json", re.I)}):
+            raw = script.string if script.string is not None else script.get_text()
+            if not raw or not raw.strip():
+                continue
+            try:
+                blocks.append(json.loads(raw.strip()))
+            except (json.JSONDecodeError, TypeError):
+                continue
+        return blocks
+
+    # ==================== Meta tags ====================
+
+    @cached_property
+    def meta(self) -> Dict[str, str]:
+        """<meta> name/property/http-equiv (lowercased) -> content; first occurrence wins."""
+        meta: Dict[str, str] = {}
+        for tag in self.soup.find_all("meta"):
+            content = tag.get("content")
+            if content is None:
+                continue
+            for attr in ("name", "property", "http-equiv"):
+                key = tag.get(attr)
+                if key:
+                    meta.setdefault(key.strip().lower(), content.strip())
+        return meta
+
+    @cached_property
+    def title(self) -> Optional[str]:
+        tag = self.soup.find("title")
+        if tag is None:
+            return None
+        text = tag.get_text().strip()
+        return text or None
+
+    @cached_property
+    def canonical_url(self) -> Optional[str]:
+        for link in self.soup.find_all("link", rel=True, href=True):
+            if "canonical" in [r.lower() for r in link.get("rel", [])]:
+                return link["href"].strip()
+        return None
+
+    # ==================== Links & images ====================
+
+    @cached_property
+    def links(self) -> List[str]:
+        """Absolute <a href> URLs in document order (deduplicated)."""
+        links = {}
+        for a in self.soup.find_all("a", href=True):
+            href = a["href"].strip()
+            if href and not href.startswith("#"):
+                links.setdefault(urljoin(self.url, href), None)
+        return list(links)
+
+    @cached_property
+    def images(self) -> Set[str]:
+        """All image URLs on the page (data: URIs excluded)."""
+        images = set()
+
+        # <img> tags
+        for img in self.soup.find_all("img"):
+            src = img.get("src")
+            if src and not src.startswith("data:"):
+                images.add(urljoin(self.url, src))
+
+        # SVG <image> elements
+        for svg in self.soup.find_all("svg"):
+            for image in svg.find_all("image"):
+                href = image.get("href") or image.get("xlink:href")
+                if href and not href.startswith("data:"):
+                    images.add(urljoin(self.url, href))
+
+        # Background images in inline styles
+        for element in self.soup.find_all(style=True):
+            for match in _BACKGROUND_IMAGE_PATTERN.findall(element.get("style", "")):
+                if not match.startswith("data:"):
+                    images.add(urljoin(self.url, match))
+
+        return images
+
+    @cached_property
+    def header_images(self) -> Set[str]:
+        """Image URLs inside header/navigation elements."""
+        header_images = set()
+        for selector in HEADER_SELECTORS:
+            try:
+                elements = self.soup.select(selector)
+            except Exception:
+                continue
+            for element in elements:
+                for img in element.find_all("img"):
+                    src = img.get("src")
+                    if src:
+                        header_images.add(urljoin(self.url, src))
+
+                for svg in element.find_all("svg"):
+                    for image in svg.find_all("image"):
+                        href = image.get("href") or image.get("xlink:href")
+                        if href:
+                            header_images.add(urljoin(self.url, href))
+        return header_images
+
+    @cached_property
+    def meta_images(self) -> Dict[str, List[str]]:
+        """Logo-like images from meta tags: favicon, og:image, twitter:image."""
+        meta_images: Dict[str, List[str]] = {
+            "favicon": [],
+            "og_image": [],
+            "twitter_image": [],
+        }
+
+        # Favicon and icon links
+        for link in self.soup.find_all("link", rel=True):
+            rel = " ".join(link.get("rel", []))
+            href = link.get("href")
+            if href and any(x in rel.lower() for x in ["icon", "apple-touch-icon"]):
+                meta_images["favicon"].append(urljoin(self.url, href))
+
+        # og:image meta tag
+        for meta in self.soup.find_all("meta", property="og:image"):
+            content = meta.get("content")
+            if content:
+                meta_images["og_image"].append(urljoin(self.url, content))
+
+        # twitter:image meta tag
+        for meta in self.soup.find_all("meta", attrs={"name": "twitter:image"}):
+            content = meta.get("content")
+            if content:
+                meta_images["twitter_image"].append(urljoin(self.url, content))
+
+        return meta_images
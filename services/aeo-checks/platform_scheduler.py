@@ -0,0 +1,282 @@
+"""Adaptive per-platform concurrency for AI platform queries.
+
+Replaces lock-step query batches with a sliding pool per platform:
+- Each platform gets an AIMD limiter (additive increase, multiplicative decrease)
+- Calls start as soon as a slot frees up on *that* platform (no head-of-line blocking)
+- 429 / rate-limit responses halve the platform's limit, pause it briefly and retry
+- Successful calls grow the limit back by 1 per window, up to the platform maximum
+
+Stats (limits, peak in-flight, queue depth, rate limits) are exposed for response
+timing metadata. The limiters live for the whole process, so a check reports a
+SchedulerWindow (counters since the check started) rather than lifetime totals.
+
+Provider rate limits are per API key, not per request, so the service uses one
+process-wide scheduler (see mentions_service.get_platform_scheduler): concurrent
+checks share each platform's limit and its backoff.
+"""
+
+import asyncio
+import time
+import logging
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default max concurrent calls per platform when not configured
+DEFAULT_MAX_CONCURRENCY = 5
+
+# Substrings that identify provider rate limiting in errors/exceptions
+RATE_LIMIT_MARKERS = (
+    "429",
+    "rate limit",
+    "rate_limit",
+    "ratelimit",
+    "too many requests",
+    "resource_exhausted",
+    "resource exhausted",
+    "quota exceeded",
+)
+
+
+def is_rate_limited(result: Any) -> bool:
+    """Check if a platform result (error dict or exception) signals rate limiting."""
+    if isinstance(result, BaseException):
+        status = getattr(result, "status_code", None) or getattr(result, "code", None)
+        if status == 429:
+            return True
+        error = str(result)
+    elif isinstance(result, dict):
+        error = result.get("error")
+        if not error:
+            return False
+        error = str(error)
+    else:
+        return False
+
+    error_lower = error.lower()
+    return any(marker in error_lower for marker in RATE_LIMIT_MARKERS)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter for a single platform."""
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        backoff_seconds: float = 2.0,
+    ):
+        self.name = name
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = max(self.min_limit, min(initial_limit or self.max_limit, self.max_limit))
+        self.backoff_seconds = backoff_seconds
+
+        self.in_flight = 0
+        self.queued = 0
+
+        # Stats
+        self.peak_in_flight = 0
+        self.max_queue_depth = 0
+        self.min_observed_limit = self.limit
+        self.calls = 0
+        self.rate_limited = 0
+        self.total_wait_seconds = 0.0
+
+        self._successes_since_change = 0
+        self._cooldown_until = 0.0
+        self._cond = asyncio.Condition()
+        # Open per-check windows (dropped when their check is garbage collected)
+        self._windows: "weakref.WeakSet[LimiterWindow]" = weakref.WeakSet()
+
+    def _observe(self) -> None:
+        """Update high-water marks of the open windows."""
+        for window in self._windows:
+            window.peak_in_flight = max(window.peak_in_flight, self.in_flight)
+            window.max_queue_depth = max(window.max_queue_depth, self.queued)
+            window.min_observed_limit = min(window.min_observed_limit, self.limit)
+
+    def _blocked(self) -> bool:
+        return self.in_flight >= self.limit or time.monotonic() < self._cooldown_until
+
+    async def acquire(self) -> None:
+        """Wait for a free slot on this platform."""
+        wait_start = time.monotonic()
+        async with self._cond:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+            self._observe()
+            try:
+                while self._blocked():
+                    cooldown = self._cooldown_until - time.monotonic()
+                    if cooldown > 0:
+                        # Sleep out the backoff window (or until woken by a release)
+                        try:
+                            await asyncio.wait_for(self._cond.wait(), timeout=cooldown)
+                        except asyncio.TimeoutError:
+                            pass
+                    else:
+                        await self._cond.wait()
+            finally:
+                self.queued -= 1
+
+            self.in_flight += 1
+            self.calls += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self._observe()
+        self.total_wait_seconds += time.monotonic() - wait_start
+
+    async def release(self, rate_limited: bool = False) -> None:
+        """Free a slot and adjust the limit based on the call outcome."""
+        async with self._cond:
+            self.in_flight -= 1
+
+            if rate_limited:
+                # Multiplicative decrease + short pause for the whole platform
+                self.rate_limited += 1
+                self.limit = max(self.min_limit, self.limit // 2)
+                self.min_observed_limit = min(self.min_observed_limit, self.limit)
+                self._observe()
+                self._cooldown_until = time.monotonic() + self.backoff_seconds
+                self._successes_since_change = 0
+                logger.warning(
+                    f"⚠️  [SCHEDULER] {self.name} rate limited - limit reduced to {self.limit}, "
+                    f"pausing {self.backoff_seconds:.1f}s"
+                )
+            else:
+                # Additive increase: +1 after a full window of successes
+                self._successes_since_change += 1
+                if self._successes_since_change >= self.limit and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._successes_since_change = 0
+
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of limiter state for response metadata."""
+        return {
+            "limit": self.limit,
+            "max_limit": self.max_limit,
+            "min_observed_limit": self.min_observed_limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "peak_in_flight": self.peak_in_flight,
+            "max_queue_depth": self.max_queue_depth,
+            "calls": self.calls,
+            "rate_limited": self.rate_limited,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.calls, 3) if self.calls else 0.0,
+        }
+
+
+class LimiterWindow:
+    """One limiter's counters since the window was opened."""
+
+    def __init__(self, limiter: AdaptiveLimiter):
+        self.limiter = limiter
+        self.start_calls = limiter.calls
+        self.start_rate_limited = limiter.rate_limited
+        self.start_wait_seconds = limiter.total_wait_seconds
+        self.peak_in_flight = limiter.in_flight
+        self.max_queue_depth = limiter.queued
+        self.min_observed_limit = limiter.limit
+        limiter._windows.add(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """Like AdaptiveLimiter.stats(); current limit/in_flight/queue_depth, the rest since opening."""
+        limiter = self.limiter
+        calls = limiter.calls - self.start_calls
+        wait_seconds = limiter.total_wait_seconds - self.start_wait_seconds
+        return {
+            **limiter.stats(),
+            "min_observed_limit": self.min_observed_limit,
+            "peak_in_flight": self.peak_in_flight,
+            "max_queue_depth": self.max_queue_depth,
+            "calls": calls,
+            "rate_limited": limiter.rate_limited - self.start_rate_limited,
+            "avg_wait_seconds": round(wait_seconds / calls, 3) if calls else 0.0,
+        }
+
+
+class SchedulerWindow:
+    """Per-check view of a shared scheduler's platform stats."""
+
+    def __init__(self, windows: Dict[str, LimiterWindow]):
+        self.windows = windows
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {platform: window.stats() for platform, window in self.windows.items()}
+
+
+class PlatformScheduler:
+    """Runs platform calls through per-platform adaptive limiters."""
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        max_retries: int = 2,
+        backoff_seconds: float = 2.0,
+    ):
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.limiters: Dict[str, AdaptiveLimiter] = {
+            platform: AdaptiveLimiter(platform, limit, backoff_seconds=backoff_seconds)
+            for platform, limit in limits.items()
+        }
+
+    def _get_limiter(self, platform: str) -> AdaptiveLimiter:
+        if platform not in self.limiters:
+            self.limiters[platform] = AdaptiveLimiter(
+                platform, DEFAULT_MAX_CONCURRENCY, backoff_seconds=self.backoff_seconds
+            )
+        return self.limiters[platform]
+
+    async def run(self, platform: str, call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Run a platform call once a slot is free, retrying on rate limits.
+
+        Args:
+            platform: Platform name (limiter key)
+            call: Zero-argument coroutine factory (called once per attempt)
+
+        Returns:
+            The platform result dict (last attempt's result if all were rate limited)
+        """
+        limiter = self._get_limiter(platform)
+
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            result: Any = None
+            error: Optional[BaseException] = None
+            rate_limited = False
+            try:
+                try:
+                    result = await call()
+                except Exception as e:
+                    error = e
+                rate_limited = is_rate_limited(error if error is not None else result)
+            finally:
+                # Also on cancellation - a leaked slot would stall the platform for good
+                await limiter.release(rate_limited=rate_limited)
+
+            if not rate_limited or attempt == self.max_retries:
+                if error is not None:
+                    raise error
+                return result
+
+            logger.info(f"🔁 [SCHEDULER] Retrying {platform} call (attempt {attempt + 2}/{self.max_retries + 1})")
+
+        return result
+
+    def open_window(self, platforms: List[str]) -> SchedulerWindow:
+        """Start counting the given platforms' stats from now (for one check)."""
+        return SchedulerWindow({platform: LimiterWindow(self._get_limiter(platform)) for platform in platforms})
+
+    def stats(self, platforms: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-platform limiter stats since process start (all platforms, or only the given ones)."""
+        return {
+            platform: limiter.stats()
+            for platform, limiter in self.limiters.items()
+            if platforms is None or platform in platforms
+        }
@@ -0,0 +1,525 @@
+"""Record/replay harness for AI platform and SERP calls.
+
+Lets check_mentions, company analysis and the modal-processor row pipeline run
+without Gemini/OpenRouter/DataForSEO keys, so throughput and tail latency can be
+benchmarked offline (see benchmark_replay.py).
+
+Interception points (the lowest SDK seam each client uses):
+    gemini      google.genai.Client -> models.generate_content / aio.models.generate_content
+                (GeminiCompanyAnalysisClient, generate_queries, modal-processor _process_single_row)
+    openrouter  openrouter_client.AsyncOpenAI -> chat.completions.create
+    dataforseo  DataForSeoProvider._search_live (the SERP cache above it still applies)
+
+Recording:
+    with recording("trace.jsonl"):
+        await check_mentions(request)          # live calls, appended to the trace
+
+Replaying:
+    trace = Trace.load("trace.jsonl")
+    with replaying(trace, profiles={"gemini": LatencyProfile.parse("p50=2500,p99=9000,burst=0.02x6")}) as replayer:
+        await check_mentions(request)
+    replayer.summary()
+
+Replay is deterministic for a given seed: each call's latency and injected fault are
+drawn from an RNG seeded with (seed, service, request key, occurrence), and 429 bursts
+follow a per-service call-sequence schedule. Requests whose exact key was not recorded
+are served from records of the same route (service + model + response format + tools)
+unless strict=True.
+
+Note: replay replaces the whole SDK client, so SDK-internal retries (AsyncOpenAI
+max_retries) do not run - injected 429s reach the calling code directly.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SERVICES = ("gemini", "openrouter", "dataforseo")
+
+# z-score of the 99th percentile (lognormal p99 = p50 * exp(Z_99 * sigma))
+_Z_99 = 2.3263
+
+# Module-level client singletons that must not outlive a record/replay session
+_CLIENT_SINGLETONS = (
+    ("gemini_client", "_gemini_client"),
+    ("openrouter_client", "_client"),
+    ("openrouter_client", "_tool_executor"),
+    ("mentions_service", "_ai_client"),
+    ("company_service", "_ai_client"),
+)
+
+
+# ==================== Latency / fault profiles ====================
+
+@dataclass
+class LatencyProfile:
+    """Injected latency (lognormal from p50/p99) and faults for one service."""
+    p50_ms: float = 1000.0
+    p99_ms: float = 5000.0
+    error_rate: float = 0.0     # probability of a 5xx per call
+    burst_rate: float = 0.0     # probability a call opens a 429 burst
+    burst_length: int = 5       # consecutive calls rejected per burst
+    recorded: bool = False      # replay recorded latencies instead of p50/p99
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyProfile":
+        """Parse "p50=800,p99=4000,errors=0.01,burst=0.02x6" (or "recorded")."""
+        profile = cls()
+        for part in (p.strip() for p in spec.split(",") if p.strip()):
+            if part == "recorded":
+                profile.recorded = True
+                continue
+            name, _, value = part.partition("=")
+            if name == "p50":
+                profile.p50_ms = float(value)
+            elif name == "p99":
+                profile.p99_ms = float(value)
+            elif name == "errors":
+                profile.error_rate = float(value)
+            elif name == "burst":
+                rate, _, length = value.partition("x")
+                profile.burst_rate = float(rate)
+                if length:
+                    profile.burst_length = int(length)
+            else:
+                raise ValueError(f"Unknown latency profile field: {name!r}")
+        return profile
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.p99_ms <= self.p50_ms:
+            return self.p50_ms
+        sigma = math.log(self.p99_ms / self.p50_ms) / _Z_99
+        return rng.lognormvariate(math.log(self.p50_ms), sigma)
+
+
+# Ballpark production latencies (search-grounded calls)
+DEFAULT_PROFILES: Dict[str, LatencyProfile] = {
+    "gemini": LatencyProfile(p50_ms=2500, p99_ms=9000),
+    "openrouter": LatencyProfile(p50_ms=3000, p99_ms=12000),
+    "dataforseo": LatencyProfile(p50_ms=1200, p99_ms=4000),
+}
+
+
+# ==================== Trace ====================
+
+def _jsonable(value: Any) -> Any:
+    """JSON-safe, deterministic form of SDK request/response objects."""
+    if hasattr(value, "model_dump"):
+        return _jsonable(value.model_dump(mode="json", exclude_none=True))
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def request_key(service: str, payload: Dict[str, Any]) -> str:
+    raw = json.dumps([service, _jsonable(payload)], sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def route_for(service: str, payload: Dict[str, Any]) -> str:
+    """Coarse request class used when the exact request was not recorded."""
+    payload = _jsonable(payload)
+    if service == "gemini":
+        config = payload.get("config") or {}
+        tools = sorted(name for tool in config.get("tools") or [] for name in tool)
+        return f"{payload.get('model')}|{config.get('response_mime_type', 'text')}|{'+'.join(tools)}"
+    if service == "openrouter":
+        return f"{payload.get('model')}|{'tools' if payload.get('tools') else 'plain'}"
+    return service
+
+
+def _preview(payload: Dict[str, Any]) -> str:
+    payload = _jsonable(payload)
+    text = payload.get("contents") or payload.get("query") or ""
+    messages = payload.get("messages")
+    if messages:
+        text = messages[-1].get("content") or ""
+    return str(text)[:160]
+
+
+@dataclass
+class TraceRecord:
+    service: str
+    key: str
+    route: str
+    request: str                          # prompt/query preview (readability only)
+    response: Optional[Dict[str, Any]]    # serialized SDK response (None for errors)
+    latency_ms: float
+    error: Optional[Dict[str, Any]] = None  # {"status", "message"}
+
+
+class Trace:
+    """Recorded calls, looked up by exact request key, then by route."""
+
+    def __init__(self, records: Optional[List[TraceRecord]] = None):
+        self.records: List[TraceRecord] = []
+        self._by_key: Dict[Tuple[str, str], List[TraceRecord]] = {}
+        self._by_route: Dict[Tuple[str, str], List[TraceRecord]] = {}
+        self._by_service: Dict[str, List[TraceRecord]] = {}
+        for record in records or []:
+            self.add(record)
+
+    def add(self, record: TraceRecord) -> None:
+        self.records.append(record)
+        self._by_key.setdefault((record.service, record.key), []).append(record)
+        self._by_route.setdefault((record.service, record.route), []).append(record)
+        self._by_service.setdefault(record.service, []).append(record)
+
+    @classmethod
+    def load(cls, path: str) -> "Trace":
+        with open(path) as f:
+            return cls([TraceRecord(**json.loads(line)) for line in f if line.strip()])
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            for record in self.records:
+                f.write(json.dumps(asdict(record)) + "\n")
+
+    def lookup(self, service: str, key: str, route: str, occurrence: int, strict: bool = False) -> Tuple[TraceRecord, bool]:
+        """(record, exact) for the occurrence-th call with this key."""
+        exact = self._by_key.get((service, key))
+        if exact:
+            return exact[occurrence % len(exact)], True
+        pool = None if strict else (self._by_route.get((service, route)) or self._by_service.get(service))
+        if not pool:
+            raise LookupError(f"No recorded {service} response for route {route!r} (key {key[:12]})")
+        return pool[(int(key[:8], 16) + occurrence) % len(pool)], False
+
+
+# ==================== Per-service codecs ====================
+
+def _dump_response(service: str, response: Any) -> Dict[str, Any]:
+    if service == "dataforseo":
+        return response.to_dict()
+    return response.model_dump(mode="json", exclude_none=True)
+
+
+def _load_response(service: str, data: Dict[str, Any]) -> Any:
+    if service == "gemini":
+        from google.genai import types
+        return types.GenerateContentResponse.model_validate(data)
+    if service == "openrouter":
+        from openai.types.chat import ChatCompletion
+        return ChatCompletion.model_validate(data)
+    from serp_types import SerpResponse
+    return SerpResponse.from_dict(data)
+
+
+def _error_status(exc: BaseException) -> Optional[int]:
+    for attr in ("code", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _fault(service: str, status: int, message: str, query: str = "") -> Any:
+    """Exception (or failed SerpResponse) the real client produces for an HTTP status."""
+    if service == "gemini":
+        from google.genai import errors
+        error_cls = errors.ClientError if status < 500 else errors.ServerError
+        reason = "RESOURCE_EXHAUSTED" if status == 429 else ("UNAVAILABLE" if status >= 500 else "FAILED_PRECONDITION")
+        return error_cls(status, {"error": {"code": status, "message": message, "status": reason}})
+    if service == "openrouter":
+        import httpx
+        import openai
+        response = httpx.Response(status, request=httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions"))
+        if status == 429:
+            return openai.RateLimitError(message, response=response, body=None)
+        if status >= 500:
+            return openai.InternalServerError(message, response=response, body=None)
+        return openai.APIStatusError(message, response=response, body=None)
+    from serp_types import SerpResponse
+    # Same shape as DataForSeoProvider._search_live's HTTPStatusError branch
+    return SerpResponse(success=False, query=query, results=[], provider="dataforseo", error=f"HTTP error: {status}")
+
+
+# ==================== Stats ====================
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+@dataclass
+class ServiceStats:
+    calls: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    inexact: int = 0            # served from the route pool instead of the exact request
+    latencies_ms: List[float] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "inexact": self.inexact,
+            "p50_ms": round(percentile(self.latencies_ms, 0.50), 1),
+            "p95_ms": round(percentile(self.latencies_ms, 0.95), 1),
+            "p99_ms": round(percentile(self.latencies_ms, 0.99), 1),
+        }
+
+
+# ==================== Record / replay handlers ====================
+
+class Recorder:
+    """Runs live calls and appends each one to a JSONL trace file."""
+
+    live_clients = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self.trace = Trace()
+        self._lock = threading.Lock()
+
+    def _write(self, record: TraceRecord) -> None:
+        with self._lock:
+            self.trace.add(record)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(asdict(record)) + "\n")
+
+    def _record(self, service: str, payload: Dict[str, Any], started: float, response: Any = None, error: BaseException = None) -> None:
+        self._write(TraceRecord(
+            service=service,
+            key=request_key(service, payload),
+            route=route_for(service, payload),
+            request=_preview(payload),
+            response=_dump_response(service, response) if error is None else None,
+            latency_ms=round((time.perf_counter() - started) * 1000, 1),
+            error=None if error is None else {"status": _error_status(error), "message": str(error)[:500]},
+        ))
+
+    async def call_async(self, service: str, payload: Dict[str, Any], live: Callable) -> Any:
+        started = time.perf_counter()
+        try:
+            response = await live()
+        except Exception as e:
+            self._record(service, payload, started, error=e)
+            raise
+        self._record(service, payload, started, response=response)
+        return response
+
+    def call_sync(self, service: str, payload: Dict[str, Any], live: Callable) -> Any:
+        started = time.perf_counter()
+        try:
+            response = live()
+        except Exception as e:
+            self._record(service, payload, started, error=e)
+            raise
+        self._record(service, payload, started, response=response)
+        return response
+
+
+class Replayer:
+    """Serves recorded responses with injected latency, 5xx errors and 429 bursts."""
+
+    live_clients = False
+
+    def __init__(
+        self,
+        trace: Trace,
+        profiles: Optional[Dict[str, LatencyProfile]] = None,
+        seed: int = 0,
+        strict: bool = False,
+        time_scale: float = 1.0,
+    ):
+        self.trace = trace
+        self.profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+        self.seed = seed
+        self.strict = strict
+        self.time_scale = time_scale
+        self.stats: Dict[str, ServiceStats] = {s: ServiceStats() for s in SERVICES}
+        self._lock = threading.Lock()
+        self._occurrences: Dict[Tuple[str, str], int] = {}
+        self._sequence: Dict[str, int] = {}
+        self._burst_left: Dict[str, int] = {}
+
+    def _plan(self, service: str, payload: Dict[str, Any]) -> Tuple[TraceRecord, float, Optional[int]]:
+        """(record, latency seconds, injected status or None) for the next call."""
+        key = request_key(service, payload)
+        profile = self.profiles[service]
+        with self._lock:
+            occurrence = self._occurrences.get((service, key), 0)
+            self._occurrences[(service, key)] = occurrence + 1
+            sequence = self._sequence.get(service, 0)
+            self._sequence[service] = sequence + 1
+
+            # 429 bursts follow the service's call sequence (a burst hits whoever calls next)
+            status = None
+            burst_rng = random.Random(f"{self.seed}:{service}:burst:{sequence}")
+            if self._burst_left.get(service, 0) > 0:
+                self._burst_left[service] -= 1
+                status = 429
+            elif burst_rng.random() < profile.burst_rate:
+                self._burst_left[service] = profile.burst_length - 1
+                status = 429
+
+        record, exact = self.trace.lookup(service, key, route_for(service, payload), occurrence, self.strict)
+        rng = random.Random(f"{self.seed}:{service}:{key}:{occurrence}")
+        latency_ms = record.latency_ms if profile.recorded else profile.sample_ms(rng)
+        if status is None and rng.random() < profile.error_rate:
+            status = 503
+        if status is None and record.error is not None:
+            status = record.error.get("status") or 500
+        if status == 429:
+            latency_ms *= 0.1  # rejections come back fast
+
+        with self._lock:
+            stats = self.stats[service]
+            stats.calls += 1
+            stats.inexact += 0 if exact else 1
+            stats.latencies_ms.append(latency_ms)
+            if status == 429:
+                stats.rate_limited += 1
+            elif status is not None:
+                stats.errors += 1
+        return record, latency_ms / 1000 * self.time_scale, status
+
+    def _result(self, service: str, payload: Dict[str, Any], record: TraceRecord, status: Optional[int]) -> Any:
+        if status is None:
+            return _load_response(service, record.response)
+        message = (record.error or {}).get("message") or ("Resource exhausted" if status == 429 else "Service unavailable")
+        fault = _fault(service, status, message, query=payload.get("query", ""))
+        if isinstance(fault, BaseException):
+            raise fault
+        return fault
+
+    async def call_async(self, service: str, payload: Dict[str, Any], live: Callable = None) -> Any:
+        record, delay, status = self._plan(service, payload)
+        await asyncio.sleep(delay)
+        return self._result(service, payload, record, status)
+
+    def call_sync(self, service: str, payload: Dict[str, Any], live: Callable = None) -> Any:
+        record, delay, status = self._plan(service, payload)
+        time.sleep(delay)
+        return self._result(service, payload, record, status)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {service: stats.to_dict() for service, stats in self.stats.items() if stats.calls}
+
+
+# ==================== SDK proxies ====================
+
+class _GenaiModels:
+    def __init__(self, handler, real_models, is_async: bool):
+        self._handler = handler
+        self._real = real_models
+        self._is_async = is_async
+
+    def generate_content(self, *, model, contents, config=None, **kwargs):
+        payload = {"model": model, "contents": contents, "config": config}
+        live = (lambda: self._real.generate_content(model=model, contents=contents, config=config, **kwargs)) if self._real else None
+        if self._is_async:
+            return self._handler.call_async("gemini", payload, live)
+        return self._handler.call_sync("gemini", payload, live)
+
+
+class _GenaiClient:
+    """Stands in for google.genai.Client (wraps a real client while recording)."""
+
+    def __init__(self, handler, real_client_cls, *args, **kwargs):
+        real = real_client_cls(*args, **kwargs) if handler.live_clients else None
+        self._real = real
+        self.models = _GenaiModels(handler, real.models if real else None, is_async=False)
+        self.aio = SimpleNamespace(models=_GenaiModels(handler, real.aio.models if real else None, is_async=True))
+
+    def __getattr__(self, name):
+        if self._real is None:
+            raise AttributeError(f"genai.Client.{name} is not available during replay")
+        return getattr(self._real, name)
+
+
+class _ChatCompletions:
+    def __init__(self, handler, real_completions):
+        self._handler = handler
+        self._real = real_completions
+
+    async def create(self, **params):
+        live = (lambda: self._real.create(**params)) if self._real else None
+        return await self._handler.call_async("openrouter", params, live)
+
+
+class _OpenAIClient:
+    """Stands in for openai.AsyncOpenAI inside openrouter_client."""
+
+    def __init__(self, handler, real_client_cls, *args, **kwargs):
+        real = real_client_cls(*args, **kwargs) if handler.live_clients else None
+        self.chat = SimpleNamespace(completions=_ChatCompletions(handler, real.chat.completions if real else None))
+
+
+def _reset_client_singletons() -> None:
+    for module_name, attr in _CLIENT_SINGLETONS:
+        module = sys.modules.get(module_name)
+        if module is not None and hasattr(module, attr):
+            setattr(module, attr, None)
+
+
+@contextmanager
+def _intercepting(handler) -> Iterator[None]:
+    from google import genai
+    import openrouter_client
+    from serp_dataforseo import DataForSeoProvider
+
+    real_genai_client = genai.Client
+    real_openai_client = openrouter_client.AsyncOpenAI
+    real_search_live = DataForSeoProvider._search_live
+
+    async def search_live(provider, query, num_results, language, location_code):
+        from serp_cache import normalize_query
+        payload = {"query": normalize_query(query), "num_results": num_results, "language": language, "location_code": location_code}
+        live = lambda: real_search_live(provider, query, num_results, language, location_code)
+        return await handler.call_async("dataforseo", payload, live)
+
+    genai.Client = lambda *args, **kwargs: _GenaiClient(handler, real_genai_client, *args, **kwargs)
+    openrouter_client.AsyncOpenAI = lambda *args, **kwargs: _OpenAIClient(handler, real_openai_client, *args, **kwargs)
+    DataForSeoProvider._search_live = search_live
+    _reset_client_singletons()
+    try:
+        yield
+    finally:
+        genai.Client = real_genai_client
+        openrouter_client.AsyncOpenAI = real_openai_client
+        DataForSeoProvider._search_live = real_search_live
+        _reset_client_singletons()
+
+
+@contextmanager
+def recording(path: str) -> Iterator[Recorder]:
+    """Run live calls and append them to a JSONL trace."""
+    recorder = Recorder(path)
+    with _intercepting(recorder):
+        yield recorder
+    logger.info(f"📼 [REPLAY] Recorded {len(recorder.trace.records)} calls to {path}")
+
+
+@contextmanager
+def replaying(
+    trace: Trace,
+    profiles: Optional[Dict[str, LatencyProfile]] = None,
+    seed: int = 0,
+    strict: bool = False,
+    time_scale: float = 1.0,
+) -> Iterator[Replayer]:
+    """Serve all intercepted calls from a trace (no network, no API keys needed)."""
+    replayer = Replayer(trace, profiles, seed, strict, time_scale)
+    with _intercepting(replayer):
+        yield replayer
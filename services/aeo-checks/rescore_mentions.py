@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Offline re-scoring of archived mentions checks.
+
+Recomputes MentionsCheckResponse for checks stored in the response archive
+(see response_archive.py) with the current scoring/visibility code - no platform,
+SERP or Gemini calls. Checks are spread over a process pool since scoring is
+CPU-bound (regex + Aho-Corasick over full responses); workers are started with
+forkserver (not fork) since /rescore runs inside the threaded service process.
+
+Usage:
+    python rescore_mentions.py --company "Acme" --limit 500 --workers 8 --out rescored.jsonl
+    python rescore_mentions.py --check-id <id> [--check-id <id> ...]
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from response_archive import MENTIONS_ARCHIVE_DIR, ResponseArchive
+
+logger = logging.getLogger(__name__)
+
+# Checks per worker task (amortizes process round-trips)
+RESCORE_CHUNK_SIZE = 25
+
+
+def rescore_check(archive: ResponseArchive, check_id: str) -> Dict[str, Any]:
+    """Re-score one archived check: {"check_id", "company", "created_at", "previous", "result"} or {"check_id", "error"}."""
+    # Imported here so the archive module stays usable without the service's dependencies
+    from mentions_service import (
+        MentionsCheckRequest, MentionsCheckRun, MentionScorer, CacheCounters,
+        new_platform_scheduler, score_platform_results, build_mentions_response,
+    )
+
+    data = archive.load_check(check_id)
+    if data is None:
+        return {"check_id": check_id, "error": "not found"}
+
+    request = MentionsCheckRequest(**data["request"])
+    competitors = request.companyAnalysis.competitors if request.companyAnalysis else []
+    run = MentionsCheckRun(
+        request=request,
+        platforms=data["platforms"],
+        queries=data["queries"],
+        scorer=MentionScorer(request.companyName, aliases=request.companyAliases, competitors=competitors),
+        scheduler=new_platform_scheduler(),
+        cache_counters=CacheCounters(),
+        start_time=time.time(),
+    )
+    scored_queries = [
+        {"query_data": query_data, "entries": score_platform_results(run, query_data, data["responses"].get(i, []))}
+        for i, query_data in enumerate(run.queries)
+    ]
+    response = build_mentions_response(run, scored_queries, 0.0)
+    response.archive_id = check_id
+    return {
+        "check_id": check_id,
+        "company": data["company"],
+        "created_at": data["created_at"],
+        "previous": data["summary"],
+        "result": response.model_dump(),
+    }
+
+
+def _rescore_chunk(check_ids: List[str], archive_dir: str) -> List[Dict[str, Any]]:
+    """Worker entry point: re-score a chunk of checks."""
+    # mentions_service logs every check at INFO - too chatty for thousands of re-scores
+    logging.getLogger("mentions_service").setLevel(logging.WARNING)
+    archive = ResponseArchive(archive_dir)
+    results = []
+    for check_id in check_ids:
+        try:
+            results.append(rescore_check(archive, check_id))
+        except Exception as e:
+            results.append({"check_id": check_id, "error": str(e)})
+    return results
+
+
+def rescore_checks(
+    check_ids: List[str],
+    archive_dir: str = MENTIONS_ARCHIVE_DIR,
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Re-score many archived checks across processes (results in check_ids order)."""
+    if not check_ids:
+        return []
+    workers = workers or os.cpu_count() or 1
+    chunks = [check_ids[i:i + RESCORE_CHUNK_SIZE] for i in range(0, len(check_ids), RESCORE_CHUNK_SIZE)]
+    if workers == 1 or len(chunks) == 1:
+        return [r for chunk in chunks for r in _rescore_chunk(chunk, archive_dir)]
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=context) as pool:
+        results = pool.map(_rescore_chunk, chunks, [archive_dir] * len(chunks))
+        return [r for chunk_results in results for r in chunk_results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score archived mentions checks (no network calls)")
+    parser.add_argument("--archive-dir", default=MENTIONS_ARCHIVE_DIR)
+    parser.add_argument("--check-id", action="append", default=[], help="Check id (repeatable)")
+    parser.add_argument("--company", help="Only checks for this company")
+    parser.add_argument("--since", type=float, help="Only checks archived at/after this unix timestamp")
+    parser.add_argument("--limit", type=int, help="Newest N checks")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--out", help="Write one JSON result per line to this file (default: stdout)")
+    args = parser.parse_args()
+
+    archive = ResponseArchive(args.archive_dir)
+    check_ids = args.check_id or [
+        c["check_id"] for c in archive.list_checks(company=args.company, since=args.since, limit=args.limit)
+    ]
+
+    start = time.time()
+    results = rescore_checks(check_ids, args.archive_dir, args.workers)
+    duration = time.time() - start
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    try:
+        for result in results:
+            out.write(json.dumps(result, default=str) + "\n")
+    finally:
+        if args.out:
+            out.close()
+
+    changed = sum(
+        1 for r in results
+        if r.get("previous") and "result" in r and r["previous"].get("visibility") != r["result"]["visibility"]
+    )
+    errors = sum(1 for r in results if "error" in r)
+    print(
+        f"🔁 Re-scored {len(results)} checks in {duration:.1f}s "
+        f"({changed} visibility changes, {errors} errors)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Raw response archive for mentions checks.
+
+QueryResult.response_text is truncated to 500 chars; the archive keeps every full
+platform answer so scoring/visibility formula changes can be re-applied offline
+(see rescore_mentions.py) instead of re-querying every platform.
+
+Layout (under MENTIONS_ARCHIVE_DIR):
+    blobs/ab/<sha256>.zst|.gz   compressed response text, content-addressed
+                                (identical answers - e.g. cache hits - are stored once)
+    index.sqlite                checks (request snapshot + queries) and responses
+                                (company, platform, query, timestamp -> blob hash)
+
+zstd is used when the `zstandard` package is installed, gzip otherwise; each blob's
+codec is recorded in the index so both can be read back.
+
+Archiving is opt-in per check (MentionsCheckRequest.archive). Checks older than
+MENTIONS_ARCHIVE_RETENTION_DAYS are deleted by purge_archive_periodically(), along
+with blobs no other check references (0 keeps everything).
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Try to import zstandard for faster/smaller blobs (gzip fallback)
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MENTIONS_ARCHIVE_DIR = os.getenv("MENTIONS_ARCHIVE_DIR", "/tmp/aeo_mentions_archive")
+MENTIONS_ARCHIVE_RETENTION_DAYS = float(os.getenv("MENTIONS_ARCHIVE_RETENTION_DAYS", "30"))
+
+# How often the retention sweep runs (seconds)
+ARCHIVE_PURGE_INTERVAL_SECONDS = 6 * 3600
+
+
+def _compress(data: bytes) -> tuple:
+    if ZSTD_AVAILABLE:
+        return "zst", zstandard.ZstdCompressor(level=6).compress(data)
+    return "gz", gzip.compress(data, compresslevel=6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zst":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd blob in archive but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class ResponseArchive:
+    """Content-addressed blob store + SQLite index (one connection per operation, thread/process-safe)."""
+
+    def __init__(self, root: str = MENTIONS_ARCHIVE_DIR):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.index_path = os.path.join(root, "index.sqlite")
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS checks (
+                    check_id TEXT PRIMARY KEY,
+                    company TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    request TEXT NOT NULL,
+                    queries TEXT NOT NULL,
+                    platforms TEXT NOT NULL,
+                    summary TEXT
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    check_id TEXT NOT NULL,
+                    query_index INTEGER NOT NULL,
+                    company TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    blob TEXT,
+                    codec TEXT,
+                    tokens INTEGER NOT NULL DEFAULT 0,
+                    cost REAL NOT NULL DEFAULT 0,
+                    error TEXT,
+                    PRIMARY KEY (check_id, query_index, platform)
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_checks_company ON checks(company, created_at)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_lookup ON responses(company, platform, query, created_at)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_checks_created ON checks(created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_blob ON responses(blob)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # sqlite3's own context manager only commits - close the connection as well
+        conn = sqlite3.connect(self.index_path, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ==================== Blobs ====================
+
+    def _blob_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.{codec}")
+
+    def put_blob(self, text: str) -> tuple:
+        """Store text, returns (sha256, codec). Existing blobs are not rewritten."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        for codec in ("zst", "gz"):
+            path = self._blob_path(digest, codec)
+            if os.path.exists(path):
+                try:
+                    # Refresh mtime so a concurrent purge doesn't drop a blob that is being re-referenced
+                    os.utime(path)
+                except FileNotFoundError:
+                    continue
+                return digest, codec
+
+        codec, compressed = _compress(data)
+        path = self._blob_path(digest, codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so concurrent writers/readers never see a partial blob
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        return digest, codec
+
+    def get_blob(self, digest: str, codec: str) -> str:
+        with open(self._blob_path(digest, codec), "rb") as f:
+            return _decompress(codec, f.read()).decode("utf-8")
+
+    # ==================== Checks ====================
+
+    def record_check(
+        self,
+        company: str,
+        request: Dict[str, Any],
+        queries: List[Dict[str, Any]],
+        platforms: List[str],
+        responses: Iterable[Dict[str, Any]],
+        summary: Optional[Dict[str, Any]] = None,
+        check_id: Optional[str] = None,
+    ) -> str:
+        """Archive one mentions check.
+
+        responses: dicts with query_index, platform and either response (full text),
+        tokens, cost - or error.
+        summary: headline numbers as originally scored (visibility, band, ...), kept so
+        re-scoring can report what changed.
+        """
+        check_id = check_id or uuid.uuid4().hex
+        created_at = time.time()
+
+        rows = []
+        for r in responses:
+            blob = codec = None
+            if r.get("error") is None:
+                blob, codec = self.put_blob(r.get("response") or "")
+            rows.append((
+                check_id,
+                r["query_index"],
+                company,
+                r["platform"],
+                queries[r["query_index"]]["query"],
+                created_at,
+                blob,
+                codec,
+                int(r.get("tokens") or 0),
+                float(r.get("cost") or 0.0),
+                None if r.get("error") is None else str(r["error"]),
+            ))
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checks (check_id, company, created_at, request, queries, platforms, summary) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    check_id, company, created_at, json.dumps(request, default=str), json.dumps(queries),
+                    json.dumps(platforms), json.dumps(summary) if summary is not None else None,
+                ),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO responses (check_id, query_index, company, platform, query, created_at, blob, codec, tokens, cost, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return check_id
+
+    def list_checks(
+        self,
+        company: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Archived checks (newest first): check_id, company, created_at."""
+        sql = "SELECT check_id, company, created_at FROM checks WHERE 1=1"
+        params: List[Any] = []
+        if company:
+            sql += " AND company = ?"
+            params.append(company)
+        if since is not None:
+            sql += " AND created_at >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND created_at < ?"
+            params.append(until)
+        sql += " ORDER BY created_at DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [{"check_id": r[0], "company": r[1], "created_at": r[2]} for r in rows]
+
+    def load_check(self, check_id: str) -> Optional[Dict[str, Any]]:
+        """Request snapshot, queries, platforms, original summary and full responses of an archived check.
+
+        responses: {query_index: [{"platform", "response", "tokens", "cost"} or {"platform", "error"}]}
+        """
+        with self._connect() as conn:
+            check = conn.execute(
+                "SELECT company, created_at, request, queries, platforms, summary FROM checks WHERE check_id = ?", (check_id,)
+            ).fetchone()
+            if check is None:
+                return None
+            rows = conn.execute(
+                "SELECT query_index, platform, blob, codec, tokens, cost, error FROM responses WHERE check_id = ?",
+                (check_id,),
+            ).fetchall()
+
+        platforms = json.loads(check[4])
+        platform_order = {p: i for i, p in enumerate(platforms)}
+        responses: Dict[int, List[Dict[str, Any]]] = {}
+        for query_index, platform, blob, codec, tokens, cost, error in sorted(
+            rows, key=lambda r: (r[0], platform_order.get(r[1], len(platform_order)))
+        ):
+            if error is not None:
+                entry = {"platform": platform, "error": error}
+            else:
+                entry = {"platform": platform, "response": self.get_blob(blob, codec), "tokens": tokens, "cost": cost}
+            responses.setdefault(query_index, []).append(entry)
+
+        return {
+            "check_id": check_id,
+            "company": check[0],
+            "created_at": check[1],
+            "request": json.loads(check[2]),
+            "queries": json.loads(check[3]),
+            "platforms": platforms,
+            "summary": json.loads(check[5]) if check[5] else None,
+            "responses": responses,
+        }
+
+    # ==================== Retention ====================
+
+    def purge_older_than(self, cutoff: float) -> Dict[str, int]:
+        """Delete checks archived before cutoff and blobs no remaining response references.
+
+        Blobs touched at/after cutoff are kept: put_blob refreshes the mtime of reused
+        blobs, so a check being recorded concurrently never loses its blob.
+        """
+        with self._connect() as conn:
+            digests = {
+                (blob, codec) for blob, codec in conn.execute(
+                    "SELECT DISTINCT r.blob, r.codec FROM responses r JOIN checks c ON c.check_id = r.check_id "
+                    "WHERE c.created_at < ? AND r.blob IS NOT NULL",
+                    (cutoff,),
+                )
+            }
+            conn.execute(
+                "DELETE FROM responses WHERE check_id IN (SELECT check_id FROM checks WHERE created_at < ?)", (cutoff,)
+            )
+            checks = conn.execute("DELETE FROM checks WHERE created_at < ?", (cutoff,)).rowcount
+            orphaned = [
+                (blob, codec) for blob, codec in digests
+                if conn.execute("SELECT 1 FROM responses WHERE blob = ? LIMIT 1", (blob,)).fetchone() is None
+            ]
+
+        blobs = 0
+        for blob, codec in orphaned:
+            path = self._blob_path(blob, codec)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    blobs += 1
+            except FileNotFoundError:
+                pass
+        return {"checks": checks, "blobs": blobs}
+
+
+async def purge_archive_periodically(interval_seconds: float = ARCHIVE_PURGE_INTERVAL_SECONDS) -> None:
+    """Apply MENTIONS_ARCHIVE_RETENTION_DAYS to the archive, forever (run as a task).
+
+    Only sweeps an archive that already exists on disk - never creates one.
+    """
+    if MENTIONS_ARCHIVE_RETENTION_DAYS <= 0 or not MENTIONS_ARCHIVE_DIR:
+        return
+    while True:
+        if os.path.exists(os.path.join(MENTIONS_ARCHIVE_DIR, "index.sqlite")):
+            archive = get_response_archive()
+            if archive is not None:
+                cutoff = time.time() - MENTIONS_ARCHIVE_RETENTION_DAYS * 86400
+                try:
+                    removed = await asyncio.to_thread(archive.purge_older_than, cutoff)
+                    if removed["checks"] or removed["blobs"]:
+                        logger.info(
+                            f"🧹 [ARCHIVE] Purged {removed['checks']} checks and {removed['blobs']} blobs "
+                            f"older than {MENTIONS_ARCHIVE_RETENTION_DAYS:g} days"
+                        )
+                except Exception as e:
+                    logger.warning(f"Archive purge failed ({MENTIONS_ARCHIVE_DIR}): {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+# Lazy singleton
+_archive: Optional[ResponseArchive] = None
+
+
+def get_response_archive() -> Optional[ResponseArchive]:
+    """Shared archive, or None if MENTIONS_ARCHIVE_DIR is empty/unwritable (archiving disabled)."""
+    global _archive
+    if _archive is None and MENTIONS_ARCHIVE_DIR:
+        try:
+            _archive = ResponseArchive(MENTIONS_ARCHIVE_DIR)
+        except Exception as e:
+            logger.warning(f"Response archive unavailable ({MENTIONS_ARCHIVE_DIR}): {e} - not archiving")
+            return None
+    return _archive
@@ -0,0 +1,275 @@
+"""Response cache for AI platform queries.
+
+Keyed by (platform, model, query, company) so repeated mentions checks for the same
+company (UI re-runs, scheduled runs, batch scripts) don't re-pay for identical prompts.
+
+Pluggable tiered backends:
+- MemoryLRUBackend - per-process LRU (fast, lost on restart)
+- SQLiteBackend - on-disk, shared across processes on the same host/volume
+
+Lookups go through the backends in order; a hit in a slower tier is promoted to the
+faster ones (keeping its original expiry). TTL is configurable per platform.
+Expired SQLite rows are deleted by purge_expired_periodically() (gateway lifespan).
+
+Cache policies (per request):
+- "use"     - read from cache, write on miss (default)
+- "refresh" - skip the read, always call the platform, overwrite the cache
+- "bypass"  - no reads, no writes
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_POLICIES = ("use", "refresh", "bypass")
+
+# Default TTL when a platform has no explicit TTL (24 hours)
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+# How often expired SQLite rows are deleted (seconds)
+CACHE_PURGE_INTERVAL_SECONDS = 3600
+
+
+def make_cache_key(platform: str, model: str, query: str, company: str = "") -> str:
+    """Stable cache key for a platform prompt (query is whitespace/case normalized)."""
+    normalized_query = " ".join(query.lower().split())
+    raw = json.dumps([platform, model, normalized_query, (company or "").lower().strip()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheCounters:
+    """Hit/miss counters for one mentions check."""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+# ==================== Backends ====================
+
+class CacheBackend:
+    """Backend interface: get/set JSON-serializable dicts with absolute expiry."""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.get_entry(key)
+        return entry[1] if entry else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """(expires_at, value) for a live key."""
+        raise NotImplementedError
+
+    def set(self, key: str, platform: str, value: Dict[str, Any], expires_at: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryLRUBackend(CacheBackend):
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get_entry(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, platform: str, value: Dict[str, Any], expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+# Live SQLite backends, for the periodic purge
+_sqlite_backends: "weakref.WeakSet[SQLiteBackend]" = weakref.WeakSet()
+
+
+class SQLiteBackend(CacheBackend):
+    """On-disk cache in a single SQLite table (one connection per operation, thread-safe)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        _sqlite_backends.add(self)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    platform TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # sqlite3's own context manager only commits - close the connection as well
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_entry(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        value, expires_at = row
+        if expires_at <= time.time():
+            self.delete(key)
+            return None
+        return expires_at, json.loads(value)
+
+    def set(self, key: str, platform: str, value: Dict[str, Any], expires_at: float) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, platform, value, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, platform, json.dumps(value), time.time(), expires_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """Delete expired rows, returns number removed."""
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            return cursor.rowcount
+
+
+async def purge_expired_periodically(interval_seconds: float = CACHE_PURGE_INTERVAL_SECONDS) -> None:
+    """Delete expired rows from every SQLite cache in this process, forever (run as a task)."""
+    while True:
+        for backend in list(_sqlite_backends):
+            try:
+                removed = await asyncio.to_thread(backend.purge_expired)
+                if removed:
+                    logger.info(f"🧹 [CACHE] Purged {removed} expired rows from {backend.path}")
+            except Exception as e:
+                logger.warning(f"Cache purge failed ({backend.path}): {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+# ==================== Tiered Cache ====================
+
+class ResponseCache:
+    """Tiered response cache in front of AI platform calls."""
+
+    def __init__(
+        self,
+        backends: List[CacheBackend],
+        ttl_by_platform: Optional[Dict[str, int]] = None,
+        default_ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        self.backends = backends
+        self.ttl_by_platform = ttl_by_platform or {}
+        self.default_ttl_seconds = default_ttl_seconds
+
+    def ttl_for(self, platform: str) -> int:
+        return self.ttl_by_platform.get(platform, self.default_ttl_seconds)
+
+    @staticmethod
+    async def _run(backend: CacheBackend, method: str, *args):
+        # Disk backends do blocking I/O - keep them off the event loop
+        if isinstance(backend, MemoryLRUBackend):
+            return getattr(backend, method)(*args)
+        return await asyncio.to_thread(getattr(backend, method), *args)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a key through all tiers, promoting hits to faster tiers."""
+        for i, backend in enumerate(self.backends):
+            try:
+                entry = await self._run(backend, "get_entry", key)
+            except Exception as e:
+                logger.warning(f"Response cache read failed ({type(backend).__name__}): {e}")
+                continue
+            if entry is not None:
+                expires_at, value = entry
+                # Promote with the stored expiry - a promotion must not extend the TTL
+                for faster in self.backends[:i]:
+                    try:
+                        await self._run(faster, "set", key, value.get("platform", ""), value, expires_at)
+                    except Exception:
+                        pass
+                return value
+        return None
+
+    async def set(self, key: str, platform: str, value: Dict[str, Any]) -> None:
+        """Write a value to all tiers."""
+        expires_at = time.time() + self.ttl_for(platform)
+        for backend in self.backends:
+            try:
+                await self._run(backend, "set", key, platform, value, expires_at)
+            except Exception as e:
+                logger.warning(f"Response cache write failed ({type(backend).__name__}): {e}")
+
+    async def get_or_call(
+        self,
+        platform: str,
+        model: str,
+        query: str,
+        company: str,
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+        policy: str = "use",
+        counters: Optional[CacheCounters] = None,
+    ) -> Dict[str, Any]:
+        """Serve a platform result from cache, or call the platform and cache the result.
+
+        Only successful results (no "error", non-empty "response") are cached.
+        Cache hits are marked "cached": True and report zero tokens/cost (nothing was spent).
+        """
+        if policy == "bypass":
+            return await call()
+
+        key = make_cache_key(platform, model, query, company)
+
+        if policy == "use":
+            cached = await self.get(key)
+            if cached is not None:
+                if counters:
+                    counters.hits += 1
+                logger.info(f"💾 [CACHE] Hit for {platform}: '{query[:50]}'")
+                return {**cached, "cached": True, "tokens": 0, "cost": 0.0}
+
+        if counters:
+            counters.misses += 1
+        result = await call()
+
+        if isinstance(result, dict) and "error" not in result and result.get("response"):
+            await self.set(key, platform, result)
+            if counters:
+                counters.writes += 1
+
+        return result
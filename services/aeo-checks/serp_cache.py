@@ -0,0 +1,183 @@
+# ABOUTME: SERP result cache with in-flight request coalescing for DataForSEO searches
+# ABOUTME: Normalized-query keys, TTL, memory + SQLite tiers, larger cached depth serves smaller requests
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from response_cache import CacheBackend, MemoryLRUBackend, SQLiteBackend
+from serp_types import SerpResponse
+
+logger = logging.getLogger(__name__)
+
+SERP_CACHE_DB = os.getenv("SERP_CACHE_DB", "/tmp/aeo_serp_cache.sqlite")
+SERP_CACHE_TTL_SECONDS = int(os.getenv("SERP_CACHE_TTL_SECONDS", str(6 * 3600)))
+SERP_CACHE_MAX_ENTRIES = int(os.getenv("SERP_CACHE_MAX_ENTRIES", "5000"))
+
+
+def normalize_query(query: str) -> str:
+    """Case/whitespace-insensitive form of a search query."""
+    return " ".join(query.lower().split())
+
+
+def make_serp_key(query: str, location_code: int, language: str) -> str:
+    """Cache key for a search; depth is stored in the entry so deeper results can be reused."""
+    raw = json.dumps(["serp", normalize_query(query), location_code, language.lower()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SerpCacheStats:
+    """Cache counters (lifetime of the process)."""
+    requests: int = 0
+    hits: int = 0
+    depth_hits: int = 0      # hits served by truncating a deeper cached result
+    coalesced: int = 0       # requests that shared another request's in-flight HTTP call
+    misses: int = 0
+    writes: int = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        served = self.hits + self.coalesced
+        data["hit_rate"] = round(served / self.requests, 3) if self.requests else 0.0
+        return data
+
+
+def _truncate(response: SerpResponse, num_results: int) -> SerpResponse:
+    results = response.results[:num_results]
+    return SerpResponse(
+        success=response.success,
+        query=response.query,
+        results=results,
+        provider=response.provider,
+        cost=response.cost,
+        cached=response.cached,
+        error=response.error,
+        featured_snippet=response.featured_snippet,
+        people_also_ask=response.people_also_ask,
+        related_searches=response.related_searches,
+        total_results=len(results),
+        timestamp=response.timestamp,
+    )
+
+
+class SerpCache:
+    """Cache + in-flight coalescing in front of a SERP provider's live search."""
+
+    def __init__(self, backends: List[CacheBackend], ttl_seconds: int = SERP_CACHE_TTL_SECONDS):
+        self.backends = backends
+        self.ttl_seconds = ttl_seconds
+        self.stats = SerpCacheStats()
+        # key -> (depth, future) for searches currently being fetched
+        self._inflight: Dict[str, Tuple[int, "asyncio.Future"]] = {}
+
+    @staticmethod
+    async def _run(backend: CacheBackend, method: str, *args):
+        # Disk backends do blocking I/O - keep them off the event loop
+        if isinstance(backend, MemoryLRUBackend):
+            return getattr(backend, method)(*args)
+        return await asyncio.to_thread(getattr(backend, method), *args)
+
+    async def _get(self, key: str) -> Optional[Dict]:
+        for i, backend in enumerate(self.backends):
+            try:
+                value = await self._run(backend, "get", key)
+            except Exception as e:
+                logger.warning(f"SERP cache read failed ({type(backend).__name__}): {e}")
+                continue
+            if value is not None:
+                # Promote to faster tiers with the entry's original expiry
+                for faster in self.backends[:i]:
+                    try:
+                        await self._run(faster, "set", key, "serp", value, value["expires_at"])
+                    except Exception:
+                        pass
+                return value
+        return None
+
+    async def _set(self, key: str, depth: int, response: SerpResponse) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        value = {"depth": depth, "expires_at": expires_at, "response": response.to_dict()}
+        for backend in self.backends:
+            try:
+                await self._run(backend, "set", key, "serp", value, expires_at)
+            except Exception as e:
+                logger.warning(f"SERP cache write failed ({type(backend).__name__}): {e}")
+        self.stats.writes += 1
+
+    async def get_or_fetch(
+        self,
+        query: str,
+        location_code: int,
+        language: str,
+        num_results: int,
+        fetch: Callable[[], Awaitable[SerpResponse]],
+    ) -> SerpResponse:
+        """Serve a search from cache, an identical in-flight search, or fetch it.
+
+        A cached/in-flight result fetched with depth >= num_results is reused (truncated).
+        Only successful responses are cached. Cache hits report cost 0.0 and cached=True.
+        """
+        self.stats.requests += 1
+        key = make_serp_key(query, location_code, language)
+
+        cached = await self._get(key)
+        if cached is not None and cached["depth"] >= num_results:
+            self.stats.hits += 1
+            if cached["depth"] > num_results:
+                self.stats.depth_hits += 1
+            logger.info(f"💾 [SERP-CACHE] Hit: '{query[:50]}' (depth {cached['depth']})")
+            response = SerpResponse.from_dict(cached["response"])
+            response.cached = True
+            response.cost = 0.0
+            return _truncate(response, num_results)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] >= num_results:
+            response = await asyncio.shield(inflight[1])
+            if response is not None:
+                self.stats.coalesced += 1
+                logger.info(f"🔗 [SERP-CACHE] Coalesced with in-flight search: '{query[:50]}'")
+                shared = _truncate(response, num_results)
+                shared.cost = 0.0
+                return shared
+            # The shared fetch was cancelled or raised - fetch on our own
+
+        self.stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (num_results, future)
+        try:
+            response = await fetch()
+            future.set_result(response)
+            if response.success:
+                # Write before leaving in-flight so there is no window where a new request refetches
+                await self._set(key, num_results, response)
+            return response
+        finally:
+            if not future.done():
+                future.set_result(None)
+            if self._inflight.get(key, (None, None))[1] is future:
+                del self._inflight[key]
+
+
+# Lazy singleton
+_serp_cache: Optional[SerpCache] = None
+
+
+def get_serp_cache() -> SerpCache:
+    """Shared SERP cache (memory LRU + SQLite when SERP_CACHE_DB is writable)."""
+    global _serp_cache
+    if _serp_cache is None:
+        backends: List[CacheBackend] = [MemoryLRUBackend(max_entries=SERP_CACHE_MAX_ENTRIES)]
+        if SERP_CACHE_DB:
+            try:
+                backends.append(SQLiteBackend(SERP_CACHE_DB))
+            except Exception as e:
+                logger.warning(f"SQLite SERP cache unavailable ({SERP_CACHE_DB}): {e} - using memory only")
+        _serp_cache = SerpCache(backends)
+    return _serp_cache
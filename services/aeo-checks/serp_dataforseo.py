@@ -1,12 +1,15 @@
 # ABOUTME: DataForSEO provider for premium SERP data with rich features
 # ABOUTME: Paid service at $0.50/1K queries - includes featured snippets, PAA, related searches
+# ABOUTME: Searches go through a shared SERP cache with in-flight coalescing (serp_cache.py)
 
 import base64
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import httpx
 
+from http_clients import get_http_client
+from serp_cache import SerpCache, get_serp_cache
 from serp_types import (
     SearchResult,
     SerpResponse,
@@ -52,22 +55,31 @@ class DataForSeoProvider:
     - Related searches
 
     Cost: $0.50 per 1,000 queries
-    Latency: ~200-800ms
+    Latency: ~200-800ms (cache hits and coalesced searches: free, no HTTP call)
     """
 
     BASE_URL = "https://api.dataforseo.com/v3/serp/google/organic/live/advanced"
 
-    def __init__(self, api_login: str, api_password: str):
+    def __init__(self, api_login: str, api_password: str, cache: Optional[SerpCache] = None, use_cache: bool = True):
         """Initialize DataForSEO provider.
 
         Args:
             api_login: DataForSEO API login (email)
             api_password: DataForSEO API password
+            cache: SERP cache to use (default: shared process-wide cache)
+            use_cache: Set False to always hit the live endpoint
         """
         self.name = "dataforseo"
         self.cost_per_1k = 0.50
         self.api_login = api_login
         self.api_password = api_password
+        self.cache = (cache or get_serp_cache()) if use_cache else None
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics of the SERP cache (shared across providers using the same cache)."""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats.to_dict()}
 
     def is_configured(self) -> bool:
         """Check if provider is properly configured."""
@@ -120,85 +132,103 @@ class DataForSeoProvider:
 
         # Cap at 100 (DataForSEO max)
         num_results = min(num_results, 100)
+        location_code = LOCATION_CODES.get(country.lower(), 2840)
+
+        if self.cache is None:
+            return await self._search_live(query, num_results, language, location_code)
+        return await self.cache.get_or_fetch(
+            query,
+            location_code,
+            language,
+            num_results,
+            lambda: self._search_live(query, num_results, language, location_code),
+        )
 
+    async def _search_live(
+        self,
+        query: str,
+        num_results: int,
+        language: str,
+        location_code: int,
+    ) -> SerpResponse:
+        """Call the DataForSEO live endpoint (no caching)."""
         try:
             # Create HTTP Basic Auth header
             credentials = f"{self.api_login}:{self.api_password}"
             encoded_credentials = base64.b64encode(credentials.encode()).decode()
             auth_header = f"Basic {encoded_credentials}"
 
-            location_code = LOCATION_CODES.get(country.lower(), 2840)
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.BASE_URL,
-                    json=[
-                        {
-                            "keyword": query,
-                            "location_code": location_code,
-                            "language_code": language,
-                            "depth": num_results,
-                            "calculate_rectangles": False,
-                        }
-                    ],
-                    headers={
-                        "Authorization": auth_header,
-                        "Content-Type": "application/json",
-                    },
+            client = get_http_client("api")
+            response = await client.post(
+                self.BASE_URL,
+                json=[
+                    {
+                        "keyword": query,
+                        "location_code": location_code,
+                        "language_code": language,
+                        "depth": num_results,
+                        "calculate_rectangles": False,
+                    }
+                ],
+                headers={
+                    "Authorization": auth_header,
+                    "Content-Type": "application/json",
+                },
+                timeout=30.0,
+            )
+
+            if response.status_code in (401, 403):
+                return SerpResponse(
+                    success=False,
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    error="DataForSEO authentication failed",
+                )
+            elif response.status_code == 400:
+                return SerpResponse(
+                    success=False,
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    error=f"Invalid request: {response.text}",
+                )
+
+            response.raise_for_status()
+            data = response.json()
+
+            # DataForSEO returns tasks array
+            if not data or "tasks" not in data or not data["tasks"]:
+                return SerpResponse(
+                    success=False,
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    error="Invalid response structure",
+                )
+
+            task_result = data["tasks"][0]
+            if task_result.get("status_code") != 20000:
+                error_msg = task_result.get("status_message", "Unknown error")
+                return SerpResponse(
+                    success=False,
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    error=f"Task failed: {error_msg}",
+                )
+
+            result_data = task_result.get("result", [])
+            if not result_data:
+                return SerpResponse(
+                    success=False,
+                    query=query,
+                    results=[],
+                    provider=self.name,
+                    error="No results in response",
                 )
 
-                if response.status_code in (401, 403):
-                    return SerpResponse(
-                        success=False,
-                        query=query,
-                        results=[],
-                        provider=self.name,
-                        error="DataForSEO authentication failed",
-                    )
-                elif response.status_code == 400:
-                    return SerpResponse(
-                        success=False,
-                        query=query,
-                        results=[],
-                        provider=self.name,
-                        error=f"Invalid request: {response.text}",
-                    )
-
-                response.raise_for_status()
-                data = response.json()
-
-                # DataForSEO returns tasks array
-                if not data or "tasks" not in data or not data["tasks"]:
-                    return SerpResponse(
-                        success=False,
-                        query=query,
-                        results=[],
-                        provider=self.name,
-                        error="Invalid response structure",
-                    )
-
-                task_result = data["tasks"][0]
-                if task_result.get("status_code") != 20000:
-                    error_msg = task_result.get("status_message", "Unknown error")
-                    return SerpResponse(
-                        success=False,
-                        query=query,
-                        results=[],
-                        provider=self.name,
-                        error=f"Task failed: {error_msg}",
-                    )
-
-                result_data = task_result.get("result", [])
-                if not result_data:
-                    return SerpResponse(
-                        success=False,
-                        query=query,
-                        results=[],
-                        provider=self.name,
-                        error="No results in response",
-                    )
-
-                return self._parse_response(result_data[0], query)
+            return self._parse_response(result_data[0], query)
 
         except httpx.TimeoutException:
             return SerpResponse(
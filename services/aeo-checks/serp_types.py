@@ -72,6 +72,24 @@ class SerpResponse:
             "timestamp": self.timestamp,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SerpResponse":
+        """Rebuild a response from to_dict() output (e.g. from a cache)."""
+        return cls(
+            success=data["success"],
+            query=data["query"],
+            results=[SearchResult(**r) for r in data.get("results", [])],
+            provider=data["provider"],
+            cost=data.get("cost", 0.0),
+            cached=data.get("cached", False),
+            error=data.get("error"),
+            featured_snippet=data.get("featured_snippet"),
+            people_also_ask=data.get("people_also_ask") or [],
+            related_searches=data.get("related_searches") or [],
+            total_results=data.get("total_results", 0),
+            timestamp=data.get("timestamp") or datetime.utcnow().isoformat(),
+        )
+
 
 @dataclass
 class ProviderConfig:
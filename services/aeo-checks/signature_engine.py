@@ -0,0 +1,182 @@
+"""Precompiled signature engine for technology detection.
+
+Compiles all (pattern, description) signatures once and scans a document for every
+signature in a single pass, returning each hit with its category and tech name.
+
+- Literal signatures (the vast majority, e.g. "cdn\\.shopify\\.com") are matched
+  case-insensitively against the lowercased document: one Aho-Corasick pass when
+  pyahocorasick is installed, otherwise a C-level substring search per literal.
+- Regex signatures keep re semantics (IGNORECASE) but are only run when their
+  literal prefix occurs in the document.
+
+A single combined regex alternation was measured ~10x slower than per-pattern
+re.search in CPython's re, so it is deliberately not used.
+
+Signature packs (JSON) can add categories/techs:
+    {"cms": {"my-cms": [["my-cms\\\\.io", "my-cms reference"]]}, ...}
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Try to import pyahocorasick for single-pass literal matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# category -> tech -> [(pattern, description), ...]
+SignatureSet = Dict[str, Dict[str, List[Tuple[str, str]]]]
+
+_REGEX_META = set(".^$*+?{}[]|()")
+
+
+@dataclass(frozen=True)
+class SignatureHit:
+    """One matched signature."""
+    category: str
+    tech: str
+    description: str
+    pattern: str
+
+
+def _literal_value(pattern: str) -> Optional[str]:
+    """Return the literal string a pattern matches, or None if it uses regex syntax."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                return None  # \d, \s, \b ... are classes/anchors, not literals
+            out.append(pattern[i + 1])
+            i += 2
+            continue
+        if char in _REGEX_META:
+            return None
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Longest literal prefix of a regex (used as a cheap prefilter)."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break
+            out.append(pattern[i + 1])
+            i += 2
+            continue
+        if char in _REGEX_META:
+            # A quantifier applies to the previous char - it's not part of the prefix
+            if char in "*?{" and out:
+                out.pop()
+            break
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def load_signature_pack(path: str) -> SignatureSet:
+    """Load a JSON signature pack: {category: {tech: [[pattern, description], ...]}}."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    pack: SignatureSet = {}
+    for category, techs in data.items():
+        pack[category] = {
+            tech: [(str(sig[0]), str(sig[1]) if len(sig) > 1 else str(sig[0])) for sig in signatures]
+            for tech, signatures in techs.items()
+        }
+    return pack
+
+
+def merge_signature_sets(base: SignatureSet, extra: SignatureSet) -> SignatureSet:
+    """Merge signature sets; extra techs are appended, extra signatures extend existing techs."""
+    merged: SignatureSet = {category: {tech: list(sigs) for tech, sigs in techs.items()} for category, techs in base.items()}
+    for category, techs in extra.items():
+        target = merged.setdefault(category, {})
+        for tech, signatures in techs.items():
+            existing = target.setdefault(tech, [])
+            for signature in signatures:
+                if signature not in existing:
+                    existing.append(signature)
+    return merged
+
+
+class SignatureEngine:
+    """Scans HTML for all signatures at once."""
+
+    def __init__(self, signatures: SignatureSet):
+        self.signatures = signatures
+        self._entries: List[SignatureHit] = []
+        # lowercased literal -> entry indexes
+        self._literals: Dict[str, List[int]] = {}
+        # (lowercased literal prefix, compiled regex, entry index)
+        self._regexes: List[Tuple[str, "re.Pattern", int]] = []
+
+        for category, techs in signatures.items():
+            for tech, tech_signatures in techs.items():
+                for pattern, description in tech_signatures:
+                    index = len(self._entries)
+                    self._entries.append(SignatureHit(category, tech, description, pattern))
+                    literal = _literal_value(pattern)
+                    if literal:
+                        self._literals.setdefault(literal.lower(), []).append(index)
+                    else:
+                        self._regexes.append((_literal_prefix(pattern).lower(), re.compile(pattern, re.IGNORECASE), index))
+
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self._literals:
+            automaton = ahocorasick.Automaton()
+            for literal in self._literals:
+                automaton.add_word(literal, literal)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def _matched_literals(self, html_lower: str) -> set:
+        if self._automaton is not None:
+            found = set()
+            total = len(self._literals)
+            for _, literal in self._automaton.iter(html_lower):
+                found.add(literal)
+                if len(found) == total:
+                    break
+            return found
+        return {literal for literal in self._literals if literal in html_lower}
+
+    def scan(self, html: str, html_lower: Optional[str] = None) -> List[SignatureHit]:
+        """Return every matched signature, in signature definition order.
+
+        Args:
+            html_lower: Precomputed html.lower() (e.g. from a ParsedPage)
+        """
+        if not html:
+            return []
+        if html_lower is None:
+            html_lower = html.lower()
+
+        matched = set()
+        for literal in self._matched_literals(html_lower):
+            matched.update(self._literals[literal])
+        for prefix, compiled, index in self._regexes:
+            if prefix and prefix not in html_lower:
+                continue
+            if compiled.search(html):
+                matched.add(index)
+
+        return [self._entries[index] for index in sorted(matched)]
@@ -1,13 +1,24 @@
 """Website Technology Detection Module
 
 Deterministic detection of CMS, tech stack, social links, and metadata from HTML.
+
+CMS/tech signatures are compiled once into a SignatureEngine and matched in a single
+scan per document. Extra signature packs (JSON) can be loaded via TECH_SIGNATURE_PACKS
+(comma-separated paths) or register_signature_pack().
 """
 
+import os
 import re
 import json
+import logging
 from typing import Optional, Dict, List, Tuple, Any
 from urllib.parse import urljoin, urlparse
 
+from parsed_page import ParsedPage
+from signature_engine import SignatureEngine, SignatureHit, load_signature_pack, merge_signature_sets
+
+logger = logging.getLogger(__name__)
+
 
 # ==================== CMS Detection ====================
 
@@ -80,19 +91,23 @@ CMS_SIGNATURES = {
 }
 
 
-def detect_cms(html: str, url: str = "") -> Tuple[Optional[str], Optional[str]]:
+def detect_cms(html: str, url: str = "", hits: Optional[List[SignatureHit]] = None) -> Tuple[Optional[str], Optional[str]]:
     """
     Detect CMS/platform from HTML content.
     
+    Args:
+        hits: Precomputed scan_signatures(html) result (avoids rescanning)
+    
     Returns:
         Tuple of (cms_name, detection_method) or (None, None) if not detected
     """
-    html_lower = html.lower()
+    if hits is None:
+        hits = scan_signatures(html)
     
-    for cms, signatures in CMS_SIGNATURES.items():
-        for pattern, description in signatures:
-            if re.search(pattern, html, re.IGNORECASE):
-                return (cms, f"detected via {description}")
+    # Hits are in signature order: first CMS, first matching signature
+    for hit in hits:
+        if hit.category == "cms":
+            return (hit.tech, f"detected via {hit.description}")
     
     return (None, None)
 
@@ -279,13 +294,60 @@ COOKIE_CONSENT_SIGNATURES = {
 }
 
 
-def detect_tech_stack(html: str) -> Dict[str, List[str]]:
+# ==================== Signature Engine ====================
+
+# Engine category -> signature dict (order = detection priority)
+SIGNATURE_CATEGORIES = {
+    "cms": CMS_SIGNATURES,
+    "frameworks": FRAMEWORK_SIGNATURES,
+    "analytics": ANALYTICS_SIGNATURES,
+    "marketing": MARKETING_SIGNATURES,
+    "payments": PAYMENT_SIGNATURES,
+    "cookie_consent": COOKIE_CONSENT_SIGNATURES,
+}
+
+
+def _build_engine() -> SignatureEngine:
+    signatures = SIGNATURE_CATEGORIES
+    for path in filter(None, (p.strip() for p in os.getenv("TECH_SIGNATURE_PACKS", "").split(","))):
+        try:
+            signatures = merge_signature_sets(signatures, load_signature_pack(path))
+            logger.info(f"Loaded tech signature pack: {path}")
+        except Exception as e:
+            logger.error(f"Failed to load tech signature pack {path}: {e}")
+    return SignatureEngine(signatures)
+
+
+# Compiled once at import
+_signature_engine = _build_engine()
+
+
+def register_signature_pack(path: str) -> None:
+    """Load a JSON signature pack and recompile the engine with it."""
+    global _signature_engine
+    _signature_engine = SignatureEngine(
+        merge_signature_sets(_signature_engine.signatures, load_signature_pack(path))
+    )
+
+
+def scan_signatures(html: str, html_lower: Optional[str] = None) -> List[SignatureHit]:
+    """Scan HTML once for all CMS/tech signatures (hits in signature order)."""
+    return _signature_engine.scan(html, html_lower=html_lower)
+
+
+def detect_tech_stack(html: str, hits: Optional[List[SignatureHit]] = None) -> Dict[str, List[str]]:
     """
     Detect technology stack from HTML content.
     
+    Args:
+        hits: Precomputed scan_signatures(html) result (avoids rescanning)
+    
     Returns:
         Dict with keys: frameworks, analytics, marketing, payments, cookie_consent
     """
+    if hits is None:
+        hits = scan_signatures(html)
+    
     result = {
         "frameworks": [],
         "analytics": [],
@@ -294,46 +356,14 @@ def detect_tech_stack(html: str) -> Dict[str, List[str]]:
         "cookie_consent": None,
     }
     
-    # Detect frameworks
-    for tech, signatures in FRAMEWORK_SIGNATURES.items():
-        for pattern, _ in signatures:
-            if re.search(pattern, html, re.IGNORECASE):
-                if tech not in result["frameworks"]:
-                    result["frameworks"].append(tech)
-                break
-    
-    # Detect analytics
-    for tech, signatures in ANALYTICS_SIGNATURES.items():
-        for pattern, _ in signatures:
-            if re.search(pattern, html, re.IGNORECASE):
-                if tech not in result["analytics"]:
-                    result["analytics"].append(tech)
-                break
-    
-    # Detect marketing tools
-    for tech, signatures in MARKETING_SIGNATURES.items():
-        for pattern, _ in signatures:
-            if re.search(pattern, html, re.IGNORECASE):
-                if tech not in result["marketing"]:
-                    result["marketing"].append(tech)
-                break
-    
-    # Detect payment providers
-    for tech, signatures in PAYMENT_SIGNATURES.items():
-        for pattern, _ in signatures:
-            if re.search(pattern, html, re.IGNORECASE):
-                if tech not in result["payments"]:
-                    result["payments"].append(tech)
-                break
-    
-    # Detect cookie consent
-    for tech, signatures in COOKIE_CONSENT_SIGNATURES.items():
-        for pattern, _ in signatures:
-            if re.search(pattern, html, re.IGNORECASE):
-                result["cookie_consent"] = tech
-                break
-        if result["cookie_consent"]:
-            break
+    for hit in hits:
+        if hit.category == "cookie_consent":
+            # First consent manager wins
+            if result["cookie_consent"] is None:
+                result["cookie_consent"] = hit.tech
+        elif hit.category in result and hit.category != "cms":
+            if hit.tech not in result[hit.category]:
+                result[hit.category].append(hit.tech)
     
     return result
 
@@ -373,6 +403,37 @@ SOCIAL_PATTERNS = {
     ],
 }
 
+# Compiled once; each pattern only runs if one of its domain hints is in the page
+_SOCIAL_DOMAIN_HINTS = {
+    "linkedin": ("linkedin.com",),
+    "twitter": ("twitter.com", "x.com"),
+    "facebook": ("facebook.com",),
+    "instagram": ("instagram.com",),
+    "youtube": ("youtube.com",),
+    "tiktok": ("tiktok.com",),
+    "github": ("github.com",),
+    "discord": ("discord.",),
+    "slack": (".slack.com",),
+}
+
+# Social patterns are all lowercase, so they can also run case-sensitively on the
+# lowercased page (much faster than IGNORECASE); captures are sliced from the original
+_SOCIAL_COMPILED = {
+    platform: [(pattern, re.compile(pattern, re.IGNORECASE), re.compile(pattern)) for pattern in patterns]
+    for platform, patterns in SOCIAL_PATTERNS.items()
+}
+
+
+def _iter_social_matches(compiled: "re.Pattern", compiled_lower: "re.Pattern", html: str, html_lower: str):
+    """Yield group(1) of each match, lazily (callers stop at the first usable one)."""
+    if len(html_lower) == len(html):
+        for match in compiled_lower.finditer(html_lower):
+            yield html[match.start(1):match.end(1)]
+    else:
+        # Lowercasing changed offsets (rare non-ASCII case) - match the original
+        for match in compiled.finditer(html):
+            yield match.group(1)
+
 # Exclude common non-profile patterns
 SOCIAL_EXCLUDES = {
     "linkedin": ["share", "shareArticle", "login", "signup", "help", "legal", "policy", "learning", "jobs"],
@@ -394,10 +455,14 @@ def extract_social_links(html: str, base_url: str = "") -> Dict[str, str]:
         Dict mapping platform name to URL
     """
     social_links = {}
+    html_lower = html.lower()
     
-    for platform, patterns in SOCIAL_PATTERNS.items():
-        for pattern in patterns:
-            matches = re.findall(pattern, html, re.IGNORECASE)
+    for platform, patterns in _SOCIAL_COMPILED.items():
+        hints = _SOCIAL_DOMAIN_HINTS.get(platform)
+        if hints and not any(hint in html_lower for hint in hints):
+            continue
+        for pattern, compiled, compiled_lower in patterns:
+            matches = _iter_social_matches(compiled, compiled_lower, html, html_lower)
             for match in matches:
                 # Skip excluded patterns
                 if match.lower() in SOCIAL_EXCLUDES.get(platform, []):
@@ -434,24 +499,24 @@ def extract_social_links(html: str, base_url: str = "") -> Dict[str, str]:
 
 # ==================== Schema.org / JSON-LD Extraction ====================
 
-def extract_schema_data(html: str) -> Tuple[List[str], Optional[Dict[str, Any]]]:
+def extract_schema_data(html: str, page: Optional[ParsedPage] = None) -> Tuple[List[str], Optional[Dict[str, Any]]]:
     """
     Extract Schema.org JSON-LD structured data from HTML.
     
+    Args:
+        page: ParsedPage for this html (reuses its parsed JSON-LD blocks)
+    
     Returns:
         Tuple of (list of schema types, combined schema data dict)
     """
     schema_types = []
     schema_data = None
     
-    # Find all JSON-LD script tags
-    jsonld_pattern = r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>'
-    matches = re.findall(jsonld_pattern, html, re.DOTALL | re.IGNORECASE)
+    if page is None:
+        page = ParsedPage(html)
     
-    for match in matches:
+    for data in page.json_ld:
         try:
-            data = json.loads(match.strip())
-            
             # Handle @graph structure
             if isinstance(data, dict) and "@graph" in data:
                 items = data["@graph"]
@@ -483,39 +548,26 @@ def extract_schema_data(html: str) -> Tuple[List[str], Optional[Dict[str, Any]]]
 
 # ==================== Meta Tags Extraction ====================
 
-def extract_meta_tags(html: str) -> Dict[str, Optional[str]]:
+def extract_meta_tags(html: str, page: Optional[ParsedPage] = None) -> Dict[str, Optional[str]]:
     """
     Extract SEO meta tags from HTML.
     
+    Args:
+        page: ParsedPage for this html (reuses its parsed meta tags)
+    
     Returns:
         Dict with meta_title, meta_description, canonical_url, sitemap_url
     """
+    if page is None:
+        page = ParsedPage(html)
+    
     result = {
-        "meta_title": None,
-        "meta_description": None,
-        "canonical_url": None,
+        "meta_title": page.title,
+        "meta_description": page.meta.get("description") or None,
+        "canonical_url": page.canonical_url,
         "sitemap_url": None,
     }
     
-    # Title tag
-    title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
-    if title_match:
-        result["meta_title"] = title_match.group(1).strip()
-    
-    # Meta description
-    desc_match = re.search(r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']+)["\']', html, re.IGNORECASE)
-    if not desc_match:
-        desc_match = re.search(r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*name=["\']description["\']', html, re.IGNORECASE)
-    if desc_match:
-        result["meta_description"] = desc_match.group(1).strip()
-    
-    # Canonical URL
-    canonical_match = re.search(r'<link[^>]*rel=["\']canonical["\'][^>]*href=["\']([^"\']+)["\']', html, re.IGNORECASE)
-    if not canonical_match:
-        canonical_match = re.search(r'<link[^>]*href=["\']([^"\']+)["\'][^>]*rel=["\']canonical["\']', html, re.IGNORECASE)
-    if canonical_match:
-        result["canonical_url"] = canonical_match.group(1).strip()
-    
     # Sitemap URL (check robots.txt reference or common patterns)
     sitemap_match = re.search(r'href=["\']([^"\']*sitemap[^"\']*\.xml)["\']', html, re.IGNORECASE)
     if sitemap_match:
@@ -652,31 +704,38 @@ def extract_contact_info(html: str) -> Tuple[List[str], List[str]]:
 
 # ==================== Main Detection Function ====================
 
-def analyze_website_tech(html: str, url: str) -> Dict[str, Any]:
+def analyze_website_tech(html: str, url: str, page: Optional[ParsedPage] = None) -> Dict[str, Any]:
     """
     Perform comprehensive website technology analysis.
     
     Args:
         html: Raw HTML content
         url: Website URL (for resolving relative URLs)
+        page: ParsedPage for this html (shared parse); created if not given
     
     Returns:
         Dict containing all detected technology information
     """
+    if page is None:
+        page = ParsedPage(html, url)
+    
+    # One signature scan for CMS + tech stack
+    hits = scan_signatures(html, html_lower=page.html_lower)
+    
     # CMS Detection
-    cms, cms_confidence = detect_cms(html, url)
+    cms, cms_confidence = detect_cms(html, url, hits=hits)
     
     # Tech Stack Detection
-    tech_stack = detect_tech_stack(html)
+    tech_stack = detect_tech_stack(html, hits=hits)
     
     # Social Media Links
     social_links = extract_social_links(html, url)
     
     # Schema.org Data
-    schema_types, schema_data = extract_schema_data(html)
+    schema_types, schema_data = extract_schema_data(html, page=page)
     
     # Meta Tags
-    meta_tags = extract_meta_tags(html)
+    meta_tags = extract_meta_tags(html, page=page)
     
     # Language Detection
     primary_lang, available_langs = detect_languages(html)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""pytest-benchmark suite over the replay harness (no API keys needed).
+
+Runs the same suites as benchmark_replay.py (check_mentions, company analysis and
+the raw Gemini / OpenRouter / DataForSEO clients) against the synthetic trace, so
+regressions show up in `pytest --benchmark-compare`.
+
+Usage:
+    pip install pytest pytest-benchmark
+    pytest test_benchmark_replay.py --benchmark-autosave
+    pytest test_benchmark_replay.py --benchmark-compare
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# No disk caches/archives: every run must reach the (replayed) clients
+for _name in ("MENTIONS_CACHE_DB", "SERP_CACHE_DB", "MENTIONS_ARCHIVE_DIR"):
+    os.environ[_name] = ""
+for _name in ("GEMINI_API_KEY", "OPENROUTER_API_KEY", "DATAFORSEO_LOGIN", "DATAFORSEO_PASSWORD"):
+    os.environ.setdefault(_name, "replay")
+
+from benchmark_replay import SUITES, _run_ops, build_suites, synthetic_trace
+from replay_harness import LatencyProfile, replaying
+
+TIME_SCALE = 0.01  # 1s of nominal latency sleeps 10ms
+RUNS = 10
+CONCURRENCY = 5
+QUERIES = 5
+
+# Nominal latencies close to production; no injected errors so results are comparable
+PROFILES = {
+    "gemini": LatencyProfile(p50_ms=2500, p99_ms=9000),
+    "openrouter": LatencyProfile(p50_ms=1500, p99_ms=6000),
+    "dataforseo": LatencyProfile(p50_ms=800, p99_ms=3000),
+}
+
+
+@pytest.fixture(scope="module")
+def suites():
+    return build_suites(QUERIES)
+
+
+@pytest.fixture(scope="module")
+def loop():
+    # One loop for the whole module: pooled HTTP clients are bound to the loop they were created on
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.parametrize("suite", SUITES)
+def test_replay_suite(benchmark, suites, loop, suite):
+    if suite not in suites:
+        pytest.skip(f"{suite} suite not available in this environment")
+    op = suites[suite]
+
+    with replaying(synthetic_trace(), PROFILES, seed=0, time_scale=TIME_SCALE) as replayer:
+        try:
+            loop.run_until_complete(op(-1))  # warm-up (lazy imports, client construction)
+        except Exception:
+            pass
+        result = benchmark.pedantic(
+            lambda: loop.run_until_complete(_run_ops(op, RUNS, CONCURRENCY)),
+            rounds=3,
+            iterations=1,
+        )
+
+    benchmark.extra_info["time_scale"] = TIME_SCALE
+    benchmark.extra_info["replayed"] = replayer.summary()
+    assert result["failed"] == 0
+    assert result["ops"] == RUNS
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Archive -> rescore round trip on a replayed mentions check (no API keys needed).
+
+Runs check_mentions with archive=True against the replay harness's synthetic trace,
+then re-scores the archived check offline and compares it with the original result.
+
+Usage:
+    pytest test_rescore_mentions.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Fresh archive, no response/SERP caches; must be set before the service modules are imported
+ARCHIVE_DIR = tempfile.mkdtemp(prefix="aeo_archive_test_")
+os.environ["MENTIONS_ARCHIVE_DIR"] = ARCHIVE_DIR
+for _name in ("MENTIONS_CACHE_DB", "SERP_CACHE_DB"):
+    os.environ[_name] = ""
+for _name in ("GEMINI_API_KEY", "OPENROUTER_API_KEY", "DATAFORSEO_LOGIN", "DATAFORSEO_PASSWORD"):
+    os.environ.setdefault(_name, "replay")
+
+import mentions_service
+import rescore_mentions
+from benchmark_replay import COMPANY, COMPANY_ANALYSIS, synthetic_trace
+from replay_harness import LatencyProfile, replaying
+
+INSTANT = LatencyProfile(p50_ms=1, p99_ms=2)
+
+
+def test_archive_rescore_round_trip():
+    request = mentions_service.MentionsCheckRequest(
+        companyName=COMPANY, companyAnalysis=COMPANY_ANALYSIS, numQueries=5,
+        mode="full", cache_policy="bypass", archive=True,
+    )
+    profiles = {service: INSTANT for service in ("gemini", "openrouter", "dataforseo")}
+    with replaying(synthetic_trace(), profiles, seed=0, time_scale=0.0):
+        original = asyncio.run(mentions_service.check_mentions(request))
+    assert original.archive_id
+
+    [rescored] = rescore_mentions.rescore_checks([original.archive_id], ARCHIVE_DIR, workers=1)
+    assert "error" not in rescored, rescored.get("error")
+    result = rescored["result"]
+    assert result["visibility"] == original.visibility
+    assert result["band"] == original.band
+    assert result["mentions"] == original.mentions
+    assert rescored["previous"]["visibility"] == original.visibility